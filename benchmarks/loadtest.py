@@ -0,0 +1,138 @@
+"""Load test a running toolbox server and report throughput and tail latency.
+
+Start a server, then run the load test against it:
+
+    python -m toolbox.server --port 8750
+    python benchmarks/loadtest.py --port 8750 --requests 20000 --concurrency 64
+
+Use --spawn to start a server for the duration of the test instead.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from math import ceil
+from typing import Dict, List, Tuple
+
+PAYLOADS = {
+    'attack': ('/attack', {'weapon': 'Longsword', 'level': 5, 'attack_stat': 18, 'bonus': 1,
+                           'extra_damage': '1d6 fire', 'target_acs': list(range(10, 21))}),
+    'split': ('/split', {'currency': '3pp, 12gp, 5ep, 40sp, 77cp', 'players': 5,
+                         'consolidate': False}),
+    'consolidate': ('/consolidate', {'currency': {'copper': 123456},
+                                     'currencies': ['pp', 'gp', 'sp']}),
+    'downtime': ('/downtime', {'kind': 'language', 'intelligence': 16, 'wisdom': 12,
+                               'charisma': 10}),
+}
+
+async def run_client(host: str, port: int, requests: List[Tuple[str, bytes]],
+                     latencies: List[float]) -> int:
+    """Send requests over one keep-alive connection and record each latency.
+
+    Returns:
+        int: The number of responses that were not 200 OK.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        for path, body in requests:
+            start = time.perf_counter()
+            writer.write(f'POST {path} HTTP/1.1\r\nHost: {host}\r\n'
+                         'Content-Type: application/json\r\n'
+                         f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b''):
+                    break
+                name, _, value = header.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            errors += status != 200
+    finally:
+        writer.close()
+    return errors
+
+async def load_test(host: str, port: int, total: int, concurrency: int,
+                    endpoints: List[str]) -> Dict[str, float]:
+    """Send requests from concurrent connections and summarize the latencies."""
+    bodies = itertools.cycle([(PAYLOADS[name][0], json.dumps(PAYLOADS[name][1]).encode())
+                              for name in endpoints])
+    requests = [next(bodies) for _ in range(total)]
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(run_client(host, port, requests[index::concurrency],
+                                               latencies)
+                                    for index in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    summary = {'requests': len(latencies), 'errors': sum(errors), 'seconds': elapsed,
+               'rps': len(latencies) / elapsed}
+    for percent in (50, 90, 99, 99.9):
+        rank = max(ceil(percent / 100 * len(latencies)), 1)
+        summary[f'p{percent:g}'] = latencies[rank - 1] * 1000
+    summary['max'] = latencies[-1] * 1000
+    return summary
+
+def wait_for_server(host: str, port: int, timeout: float = 10.0) -> None:
+    """Wait until a server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            asyncio.run(asyncio.wait_for(asyncio.open_connection(host, port), 1))
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+def main() -> int:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description='Load test a toolbox server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8750)
+    parser.add_argument('--requests', type=int, default=10000,
+                        help='the total number of requests (default 10000)')
+    parser.add_argument('--concurrency', type=int, default=32,
+                        help='the number of concurrent connections (default 32)')
+    parser.add_argument('--endpoint', choices=sorted(PAYLOADS) + ['mixed'], default='mixed',
+                        help='the endpoint to call, or mixed to cycle through all of them')
+    parser.add_argument('--spawn', action='store_true',
+                        help='start a server for the test')
+    parser.add_argument('--workers', type=int,
+                        help='worker processes of the spawned server (default: number of CPUs)')
+    args = parser.parse_args()
+    server = None
+    if args.spawn:
+        command = [sys.executable, '-m', 'toolbox.server', '--host', args.host, '--port',
+                   str(args.port)]
+        if args.workers is not None:
+            command += ['--workers', str(args.workers)]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = subprocess.Popen(command, cwd=root, stdout=subprocess.DEVNULL)
+        wait_for_server(args.host, args.port)
+    try:
+        endpoints = sorted(PAYLOADS) if args.endpoint == 'mixed' else [args.endpoint]
+        summary = asyncio.run(load_test(args.host, args.port, args.requests,
+                                        args.concurrency, endpoints))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(f"{summary['requests']} requests ({summary['errors']} errors) in "
+          f"{summary['seconds']:.2f} s: {summary['rps']:.0f} requests/s")
+    print(f"latency p50 {summary['p50']:.2f} ms, p90 {summary['p90']:.2f} ms, "
+          f"p99 {summary['p99']:.2f} ms, p99.9 {summary['p99.9']:.2f} ms, "
+          f"max {summary['max']:.2f} ms")
+    return 1 if summary['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Benchmark the hot paths of the combat.py module."""
+import pytest
+from toolbox.combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+
+pytest.importorskip('pytest_benchmark')
+
+EXTRA_DAMAGE = [Damage(1, Dice.D6, DamageType.FIRE), Damage(2, Dice.D8, DamageType.RADIANT)]
+
+@pytest.mark.benchmark(group='combat')
+def test_weapon_average_damage(benchmark):
+    weapon = Weapon(WeaponType.GREATSWORD, 1, EXTRA_DAMAGE)
+    assert benchmark(weapon.average_damage) == pytest.approx(20.5)
+
+@pytest.mark.benchmark(group='combat')
+@pytest.mark.parametrize('target_ac', [10, 16, 25])
+def test_weapon_attack_average_damage(benchmark, target_ac):
+    attack = WeaponAttack(Weapon(WeaponType.LONGSWORD, 1, EXTRA_DAMAGE), 5, 18)
+    benchmark(attack.average_damage, target_ac)
+
+@pytest.mark.benchmark(group='combat-enums')
+def test_weapon_type_display_name_round_trip(benchmark):
+    def round_trip():
+        for member in WeaponType:
+            WeaponType.convert_display_name(WeaponType.get_display_name(member))
+    benchmark(round_trip)
+
+@pytest.mark.benchmark(group='combat-enums')
+def test_damage_type_display_name_round_trip(benchmark):
+    def round_trip():
+        for member in DamageType:
+            DamageType.convert_display_name(DamageType.get_display_name(member))
+    benchmark(round_trip)
@@ -0,0 +1,27 @@
+"""Benchmark the hot paths of the common.py module."""
+import pytest
+from toolbox.common import Ability, Skill, Tool
+
+pytest.importorskip('pytest_benchmark')
+
+@pytest.mark.benchmark(group='common')
+def test_tool_skills(benchmark):
+    def all_skills():
+        for member in Tool:
+            member.skills()
+    benchmark(all_skills)
+
+@pytest.mark.benchmark(group='common')
+def test_skill_ability(benchmark):
+    def all_abilities():
+        for member in Skill:
+            member.ability()
+    benchmark(all_abilities)
+
+@pytest.mark.benchmark(group='common-enums')
+@pytest.mark.parametrize('enum', [Ability, Skill, Tool], ids=lambda enum: enum.__name__)
+def test_display_name_round_trip(benchmark, enum):
+    def round_trip():
+        for member in enum:
+            enum.convert_display_name(enum.get_display_name(member))
+    benchmark(round_trip)
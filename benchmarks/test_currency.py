@@ -0,0 +1,23 @@
+"""Benchmark the hot paths of the currency.py module."""
+import pytest
+from toolbox.currency import Currency, CurrencyOptions
+
+pytest.importorskip('pytest_benchmark')
+
+HOARDS = {
+    'small': Currency(3, 12, 5, 40, 77),
+    'large': Currency(3000000, 7000001, 5000003, 9999999, 12345677),
+}
+
+@pytest.mark.benchmark(group='currency-split')
+@pytest.mark.parametrize('consolidate', [True, False])
+@pytest.mark.parametrize('players', [2, 5, 20])
+@pytest.mark.parametrize('hoard', sorted(HOARDS))
+def test_split(benchmark, hoard, players, consolidate):
+    shares = benchmark(HOARDS[hoard].split, players, consolidate)
+    assert len(shares) == players
+
+@pytest.mark.benchmark(group='currency-consolidate')
+@pytest.mark.parametrize('currencies', [CurrencyOptions.COMMON, CurrencyOptions.ALL])
+def test_consolidate(benchmark, currencies):
+    benchmark(HOARDS['large'].consolidate, currencies)
@@ -0,0 +1,25 @@
+"""Benchmark parsing, compiling and sampling dice expressions."""
+import random
+import pytest
+from toolbox.dice import parse
+
+pytest.importorskip('pytest_benchmark')
+
+EXPRESSIONS = ['2d6+1d8+5', '4d6kh3', '2d6r2+4', '8d6']
+
+@pytest.mark.benchmark(group='dice-parse')
+def test_parse_memoized(benchmark):
+    parse('2d6+1d8+5')
+    benchmark(parse, '2d6+1d8+5')
+
+@pytest.mark.benchmark(group='dice-compile')
+@pytest.mark.parametrize('text', EXPRESSIONS)
+def test_compile(benchmark, text):
+    benchmark(lambda: parse.__wrapped__(text).distribution())
+
+@pytest.mark.benchmark(group='dice-sample')
+@pytest.mark.parametrize('text', EXPRESSIONS)
+def test_sample(benchmark, text):
+    expression = parse(text)
+    rolls = benchmark(expression.sample, 10000, random.Random(0))
+    assert len(rolls) == 10000
@@ -0,0 +1,39 @@
+"""Benchmark the binary serialization against pickle."""
+import pickle
+import pytest
+from toolbox.combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+from toolbox.currency import Currency
+from toolbox.serialization import iter_from_bytes, to_bytes
+
+pytest.importorskip('pytest_benchmark')
+
+VALUES = {
+    'attacks': [WeaponAttack(Weapon(WeaponType.LONGSWORD, index % 4,
+                                    [Damage(1, Dice.D6, DamageType.FIRE)]), index % 20 + 1, 16)
+                for index in range(1000)],
+    'currencies': [Currency(index, 2 * index, 3, 4 * index, 5) for index in range(1000)],
+}
+
+@pytest.mark.benchmark(group='serialize-dump')
+@pytest.mark.parametrize('kind', sorted(VALUES))
+def test_struct_dump(benchmark, kind):
+    benchmark(to_bytes, VALUES[kind])
+
+@pytest.mark.benchmark(group='serialize-dump')
+@pytest.mark.parametrize('kind', sorted(VALUES))
+def test_pickle_dump(benchmark, kind):
+    benchmark(pickle.dumps, VALUES[kind], pickle.HIGHEST_PROTOCOL)
+
+@pytest.mark.benchmark(group='serialize-load')
+@pytest.mark.parametrize('kind', sorted(VALUES))
+def test_struct_load(benchmark, kind):
+    data = to_bytes(VALUES[kind])
+    values = benchmark(lambda: list(iter_from_bytes(data)))
+    assert len(values) == len(VALUES[kind])
+
+@pytest.mark.benchmark(group='serialize-load')
+@pytest.mark.parametrize('kind', sorted(VALUES))
+def test_pickle_load(benchmark, kind):
+    data = pickle.dumps(VALUES[kind], pickle.HIGHEST_PROTOCOL)
+    values = benchmark(pickle.loads, data)
+    assert len(values) == len(VALUES[kind])
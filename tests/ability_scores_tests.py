@@ -0,0 +1,69 @@
+"""Test the implementation of the ability_scores.py module."""
+import random
+import unittest
+from fractions import Fraction
+from itertools import product
+from toolbox.ability_scores import (STANDARD_ARRAY, RolledScores, iter_ability_sets, modifier,
+                                    point_buy_arrays, point_buy_cost, sample_ability_scores)
+
+class RolledScoresTestCase(unittest.TestCase):
+    def setUp(self):
+        # Small dice keep the brute force over every set of six scores fast.
+        self.scores = RolledScores('1d4+8')
+        self.sets = list(product(range(9, 13), repeat=6))
+
+    def brute_force(self, statistic):
+        distribution = {}
+        for scores in self.sets:
+            value = statistic(scores)
+            distribution[value] = distribution.get(value, 0) + Fraction(1, len(self.sets))
+        return dict(sorted(distribution.items()))
+
+    def test_order_statistics(self):
+        self.assertEqual(self.scores.highest_distribution(), self.brute_force(max))
+        self.assertEqual(self.scores.lowest_distribution(), self.brute_force(min))
+        self.assertEqual(self.scores.order_statistic(3),
+                         self.brute_force(lambda scores: sorted(scores)[-3]))
+        self.assertRaises(ValueError, self.scores.order_statistic, 7)
+
+    def test_totals(self):
+        self.assertEqual(self.scores.total_distribution(), self.brute_force(sum))
+        self.assertEqual(self.scores.modifier_total_distribution(),
+                         self.brute_force(lambda scores: sum(map(modifier, scores))))
+
+    def test_probability_beats(self):
+        expected = sum(probability for total, probability
+                       in self.brute_force(lambda scores: sum(map(modifier, scores))).items()
+                       if total > 1)
+        self.assertEqual(self.scores.probability_beats([12, 10, 10, 10, 10, 10]), expected)
+        self.assertEqual(RolledScores('3d6').probability_beats([3] * 6), 1 - Fraction(1, 216) ** 6)
+
+    def test_four_d6_drop_lowest(self):
+        scores = RolledScores('4d6kh3')
+        self.assertEqual(sum(scores.score_distribution().values()), 1)
+        self.assertAlmostEqual(float(sum(total * probability for total, probability
+                                         in scores.total_distribution().items())), 73.4676, 4)
+
+class PointBuyTestCase(unittest.TestCase):
+    def test_point_buy_cost(self):
+        self.assertEqual(point_buy_cost(STANDARD_ARRAY), 27)
+        self.assertRaises(ValueError, point_buy_cost, [16, 8, 8, 8, 8, 8])
+
+    def test_point_buy_arrays(self):
+        arrays = point_buy_arrays()
+        self.assertIn(STANDARD_ARRAY, arrays)
+        self.assertIn((15, 15, 15, 8, 8, 8), arrays)
+        self.assertTrue(all(point_buy_cost(scores) == 27 for scores in arrays))
+        self.assertEqual(len(arrays), len(set(arrays)))
+        self.assertEqual(point_buy_arrays(0), [(8,) * 6])
+
+class SampleTestCase(unittest.TestCase):
+    def test_sample_ability_scores(self):
+        samples = sample_ability_scores('4d6kh3', 1000, random.Random(3))
+        self.assertEqual((samples.typecode, len(samples)), ('b', 6000))
+        self.assertTrue(all(3 <= score <= 18 for score in samples))
+        sets = list(iter_ability_sets(samples))
+        self.assertEqual(len(sets), 1000)
+        self.assertEqual(sets[1].strength, samples[6])
+        self.assertEqual(sets[1].charisma, samples[11])
+        self.assertRaises(ValueError, sample_ability_scores, '1d100+50', 1)
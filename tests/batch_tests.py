@@ -0,0 +1,143 @@
+"""Test the implementation of the batch.py module."""
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+from toolbox.batch import (evaluate, guess_format, main, parse_ac_range, parse_attack,
+                           parse_bool, parse_damage, parse_int, read_rows, write_report)
+from toolbox.cache import ResultCache
+from toolbox.combat import DamageType, Dice, WeaponType
+
+CSV_INPUT = '''name,weapon,level,attack_stat,proficient,bonus,damage_mod,extra_damage
+Ayla,Longsword (2 hands),5,18,true,1,0,1d6 fire
+Bron,greatsword,11,20,,,2,
+'''
+
+class ParseTestCase(TestCase):
+    def test_parse_damage(self):
+        damages = parse_damage('1d6 fire; 2D8 radiant')
+        self.assertEqual([(damage.num_dice, damage.die, damage.damage) for damage in damages],
+                         [(1, Dice.D6, DamageType.FIRE), (2, Dice.D8, DamageType.RADIANT)])
+        self.assertEqual(len(parse_damage(['1d4 cold'])), 1)
+        self.assertEqual(parse_damage(''), [])
+        self.assertRaises(ValueError, parse_damage, '1d7 fire')
+        self.assertRaises(ValueError, parse_damage, '1d6 sonic')
+        self.assertRaises(ValueError, parse_damage, 'fire')
+
+    def test_parse_attack(self):
+        name, attack = parse_attack({'name': 'Ayla', 'weapon': 'Longsword (2 Hands)', 'level': '5',
+                                     'attack_stat': '18', 'proficient': 'no', 'bonus': '1'})
+        self.assertEqual(name, 'Ayla')
+        self.assertEqual(attack.weapon.weapon_type, WeaponType.LONGSWORD2H)
+        self.assertEqual(attack.weapon.bonus, 1)
+        self.assertFalse(attack.proficient)
+        self.assertEqual(attack.damage_mod, 0)
+
+    def test_parse_attack_abilities(self):
+        row = {'name': 'Ayla', 'weapon': 'Rapier', 'level': '5', 'strength': '12',
+               'dexterity': '16'}
+        self.assertEqual(parse_attack(row)[1].attack_stat, 16)
+        self.assertEqual(parse_attack({**row, 'weapon': 'Mace'})[1].attack_stat, 12)
+        self.assertEqual(parse_attack({**row, 'attack_stat': '10'})[1].attack_stat, 10)
+        self.assertTrue(parse_attack({**row, 'weapon': 'Dagger', 'off_hand': 'yes'})[1].off_hand)
+
+    def test_parse_attack_invalid(self):
+        row = {'name': 'Ayla', 'weapon': 'longsword', 'level': '5', 'attack_stat': '18'}
+        self.assertRaises(ValueError, parse_attack, {**row, 'weapon': 'spork'})
+        self.assertRaises(ValueError, parse_attack, {**row, 'level': ''})
+        self.assertRaises(ValueError, parse_attack, {**row, 'level': 'five'})
+        self.assertRaises(ValueError, parse_attack, {**row, 'proficient': 'maybe'})
+        self.assertRaises(ValueError, parse_attack, {**row, 'attack_stat': ''})
+        self.assertRaises(ValueError, parse_attack, {**row, 'off_hand': 'true'})
+
+    def test_parse_ac_range(self):
+        self.assertEqual(parse_ac_range('10-13'), [10, 11, 12, 13])
+        self.assertEqual(parse_ac_range('12, 15,18-19'), [12, 15, 18, 19])
+        self.assertRaises(ValueError, parse_ac_range, '20-10')
+        self.assertRaises(ValueError, parse_ac_range, 'high')
+
+    def test_parse_fields(self):
+        row = {'level': ' 5', 'bonus': '', 'proficient': 'Yes', 'off_hand': False}
+        self.assertEqual(parse_int(row, 'level'), 5)
+        self.assertEqual(parse_int(row, 'bonus', 0), 0)
+        self.assertIsNone(parse_int(row, 'damage_mod'))
+        self.assertTrue(parse_bool(row, 'proficient', False))
+        self.assertFalse(parse_bool(row, 'off_hand', True))
+        self.assertTrue(parse_bool(row, 'missing', True))
+        self.assertRaises(ValueError, parse_int, {'level': '5.5'}, 'level')
+        self.assertRaises(ValueError, parse_bool, {'proficient': 'maybe'}, 'proficient', True)
+        self.assertEqual([guess_format(path) for path in ('a.JSONL', 'a.ndjson', 'a.csv', '-')],
+                         ['jsonl', 'jsonl', 'csv', 'csv'])
+
+class ReportTestCase(TestCase):
+    def test_evaluate_matches_average_damage(self):
+        results = list(evaluate(read_rows(io.StringIO(CSV_INPUT)), [10, 15, 30], chunk_size=1))
+        self.assertEqual([name for name, _, _ in results], ['Ayla', 'Bron'])
+        for _, attack, damages in results:
+            self.assertEqual(damages, [attack.average_damage(ac) for ac in (10, 15, 30)])
+
+    def test_evaluate_row_number(self):
+        rows = [{'name': 'A', 'weapon': 'club', 'level': 1, 'attack_stat': 10}, {'name': 'B'}]
+        with self.assertRaisesRegex(ValueError, 'Row 2'):
+            list(evaluate(rows, [10]))
+
+    def test_csv_report(self):
+        output = io.StringIO()
+        self.assertEqual(write_report(io.StringIO(CSV_INPUT), output, [12, 16]), 2)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], 'name,weapon,level,hit_bonus,hit_damage,ac_12,ac_16')
+        self.assertEqual(lines[1], 'Ayla,Longsword (2 Hands),5,8,14.0,12.35,9.55')
+
+    def test_cached_report(self):
+        expected = io.StringIO()
+        write_report(io.StringIO(CSV_INPUT), expected, [12, 16])
+        with ResultCache(':memory:') as cache:
+            for _ in range(2):
+                output = io.StringIO()
+                write_report(io.StringIO(CSV_INPUT), output, [12, 16], cache=cache)
+                self.assertEqual(output.getvalue(), expected.getvalue())
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_jsonl_report(self):
+        source = io.StringIO('{"name": "Bron", "weapon": "Greatsword", "level": 11, '
+                             '"attack_stat": 20, "damage_mod": 2}\n\n')
+        output = io.StringIO()
+        write_report(source, output, [15], 'jsonl', 'jsonl')
+        record = json.loads(output.getvalue())
+        self.assertEqual(record['name'], 'Bron')
+        self.assertEqual(record['ac_15'], 10.85)
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, write_report, io.StringIO(CSV_INPUT), io.StringIO(), [10],
+                          'xml')
+        self.assertRaises(ValueError, write_report, io.StringIO(CSV_INPUT), io.StringIO(), [10],
+                          'csv', 'xml')
+
+    def test_main_invalid_row(self):
+        source = io.StringIO('name,weapon,level,attack_stat\nAyla,spork,5,18\n')
+        output = io.StringIO()
+        errors = io.StringIO()
+        with patch('sys.stdin', source), redirect_stdout(output), redirect_stderr(errors):
+            self.assertEqual(main(['-']), 1)
+        self.assertIn("Row 1: Invalid weapon 'spork'.", errors.getvalue())
+        # The header is written before the invalid row is read.
+        self.assertEqual(output.getvalue().splitlines(),
+                         ['name,weapon,level,hit_bonus,hit_damage,'
+                          + ','.join(f'ac_{target_ac}' for target_ac in range(10, 21))])
+
+    def test_main_missing_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            missing = os.path.join(directory, 'missing.csv')
+            output = os.path.join(directory, 'missing', 'report.csv')
+            for argv, message in (([missing], 'cannot open input'),
+                                  (['-', '-o', output], 'cannot open output')):
+                errors = io.StringIO()
+                with patch('sys.stdin', io.StringIO(CSV_INPUT)), redirect_stderr(errors):
+                    with self.assertRaises(SystemExit) as context:
+                        main(argv)
+                self.assertEqual(context.exception.code, 2)
+                self.assertIn(message, errors.getvalue())
+                self.assertIn('No such file or directory', errors.getvalue())
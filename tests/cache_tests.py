@@ -0,0 +1,112 @@
+"""Test the implementation of the cache.py module."""
+import os
+import tempfile
+from unittest import TestCase
+from toolbox.cache import ResultCache, canonical, make_key, rules_fingerprint
+from toolbox.combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+from toolbox.currency import Currency, CurrencyOptions
+
+class KeyTestCase(TestCase):
+    def test_equal_inputs_equal_keys(self):
+        first = WeaponAttack(Weapon(WeaponType.MACE, 1, [Damage(1, Dice.D6, DamageType.FIRE)]), 5, 18)
+        second = WeaponAttack(Weapon(WeaponType.MACE, 1, [Damage(1, Dice.D6, DamageType.FIRE)]), 5, 18)
+        self.assertEqual(make_key('attack', first), make_key('attack', second))
+        second.weapon.extra_damage[0].num_dice = 2
+        self.assertNotEqual(make_key('attack', first), make_key('attack', second))
+
+    def test_namespace_and_options(self):
+        currency = Currency(1, 2, 3, 4, 5)
+        self.assertNotEqual(make_key('split', currency), make_key('consolidate', currency))
+        self.assertNotEqual(make_key('split', currency, CurrencyOptions.COMMON),
+                            make_key('split', currency, CurrencyOptions.ALL))
+
+    def test_canonical(self):
+        self.assertEqual(canonical(Currency(1, 2, 3, 4, 5)), ['Currency', [1, 2, 3, 4, 5]])
+        self.assertEqual(canonical((Dice.D6, [1, 'a'])), [['Dice', 'D6'], [1, 'a']])
+        self.assertRaises(TypeError, canonical, object())
+
+    def test_modifiers_change_key(self):
+        self.assertEqual(canonical(Weapon(WeaponType.MAUL)), ['Weapon', 'MAUL', 0, []])
+        self.assertNotEqual(make_key('attack', Weapon(WeaponType.MAUL)),
+                            make_key('attack', Weapon(WeaponType.MAUL, reroll=2)))
+        self.assertNotEqual(canonical(Damage(1, Dice.D6, DamageType.FIRE)),
+                            canonical(Damage(1, Dice.D6, DamageType.FIRE, minimum=2)))
+
+    def test_rules_change_key(self):
+        key = make_key('attack', Weapon(WeaponType.CLUB))
+        fingerprint = rules_fingerprint()
+        # The fingerprint is only calculated again when the rules change.
+        self.assertIs(rules_fingerprint(), fingerprint)
+        original = Weapon._weapon_map
+        rules = dict(original)
+        rules[WeaponType.CLUB] = Damage(1, Dice.D6, DamageType.BLUDGEONING)
+        Weapon.set_weapon_map(rules)
+        try:
+            self.assertNotEqual(rules_fingerprint(), fingerprint)
+            self.assertNotEqual(make_key('attack', Weapon(WeaponType.CLUB)), key)
+        finally:
+            Weapon.set_weapon_map(original)
+        self.assertEqual(make_key('attack', Weapon(WeaponType.CLUB)), key)
+
+class ResultCacheTestCase(TestCase):
+    def setUp(self):
+        self.cache = ResultCache(':memory:', max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_get_put(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', [1, 2.5])
+        self.assertEqual(self.cache.get('a'), [1, 2.5])
+        self.cache.put('a', 'b')
+        self.assertEqual(self.cache.get('a'), 'b')
+        self.assertEqual(len(self.cache), 1)
+
+    def test_lru_eviction(self):
+        for key in 'abc':
+            self.cache.put(key, key)
+        self.cache.get('a')
+        self.cache.put('d', 'd')
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'a')
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_stats(self):
+        calls = []
+        for _ in range(3):
+            self.cache.get_or_compute('double', [2], lambda value: calls.append(value) or value * 2)
+        self.assertEqual(calls, [2])
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    def test_average_damages(self):
+        attack = WeaponAttack(Weapon(WeaponType.LONGSWORD, 1), 5, 18)
+        expected = attack.average_damages([10, 15])
+        self.assertEqual(self.cache.average_damages(attack, [10, 15]), expected)
+        self.assertEqual(self.cache.average_damages(attack, [10, 15]), expected)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_currency(self):
+        currency = Currency(1, 2, 3, 4, 5)
+        self.assertEqual(self.cache.split(currency, 3), currency.split(3))
+        self.assertEqual(self.cache.split(currency, 3), currency.split(3))
+        self.assertEqual(self.cache.consolidate(currency, CurrencyOptions.ALL),
+                         currency.consolidate(CurrencyOptions.ALL))
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_persistent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.db')
+            with ResultCache(path) as cache:
+                cache.put('a', 1)
+            with ResultCache(path) as cache:
+                self.assertEqual(len(cache), 1)
+                self.assertEqual(cache.get('a'), 1)
+                cache.clear()
+                self.assertEqual(len(cache), 0)
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, ResultCache, ':memory:', 0)
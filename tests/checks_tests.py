@@ -0,0 +1,58 @@
+"""Test the implementation of the checks.py module."""
+import unittest
+from itertools import product
+from toolbox.checks import Character, RollMode, check_bonus, check_table, success_chance
+from toolbox.common import Ability, AbilitySet, Skill, Tool
+
+ROGUE = Character('Rogue', AbilitySet(10, 18, 12, 14, 13, 8), 3,
+                  frozenset({Skill.STEALTH, Skill.PERCEPTION, Tool.THIEVES}),
+                  frozenset({Skill.STEALTH}))
+CLERIC = Character('Cleric', AbilitySet(14, 10, 14, 10, 17, 12), 3, frozenset({Skill.INSIGHT}))
+
+class CheckBonusTestCase(unittest.TestCase):
+    def test_check_bonus(self):
+        self.assertEqual(check_bonus(ROGUE, Skill.STEALTH), 4 + 6)
+        self.assertEqual(check_bonus(ROGUE, Skill.PERCEPTION), 1 + 3)
+        self.assertEqual(check_bonus(ROGUE, Skill.ATHLETICS), 0)
+        self.assertEqual(check_bonus(CLERIC, Ability.WISDOM), 3)
+        # Thieves' tools use the best of history, investigation, perception and sleight of hand.
+        self.assertEqual(check_bonus(ROGUE, Tool.THIEVES), 4 + 3)
+        self.assertRaises(TypeError, check_bonus, ROGUE, 'stealth')
+
+class SuccessChanceTestCase(unittest.TestCase):
+    def brute_force(self, bonus, dc, mode, guidance):
+        rolls = []
+        for first, second, guide in product(range(1, 21), range(1, 21), range(1, 5)):
+            roll = {RollMode.NORMAL: first, RollMode.ADVANTAGE: max(first, second),
+                    RollMode.DISADVANTAGE: min(first, second)}[mode]
+            rolls.append(roll + bonus + (guide if guidance else 0) >= dc)
+        return sum(rolls) / len(rolls)
+
+    def test_matches_brute_force(self):
+        for mode, guidance in product(RollMode, (False, True)):
+            for bonus, dc in ((0, 11), (5, 20), (3, 1), (-1, 24), (2, 27), (10, 15)):
+                with self.subTest(mode=mode, guidance=guidance, bonus=bonus, dc=dc):
+                    self.assertAlmostEqual(success_chance(bonus, dc, mode, guidance),
+                                           self.brute_force(bonus, dc, mode, guidance))
+
+    def test_no_automatic_success(self):
+        self.assertEqual(success_chance(0, 21), 0)
+        self.assertEqual(success_chance(0, 1), 1)
+
+class CheckTableTestCase(unittest.TestCase):
+    def test_check_table(self):
+        checks = [Skill.STEALTH, Skill.INSIGHT, Tool.THIEVES]
+        table = check_table([ROGUE, CLERIC], checks, [10, 15, 20], RollMode.ADVANTAGE, True)
+        self.assertEqual(len(table.chances), 2)
+        self.assertEqual([len(row) for row in table.chances[0]], [3, 3, 3])
+        for character_index, character in enumerate((ROGUE, CLERIC)):
+            for check, dc in product(checks, (10, 15, 20)):
+                self.assertEqual(table.chance(character_index, check, dc),
+                                 success_chance(check_bonus(character, check), dc,
+                                                RollMode.ADVANTAGE, True))
+        self.assertRaises(ValueError, table.chance, 0, Skill.ARCANA, 10)
+
+    def test_rows_are_independent(self):
+        table = check_table([ROGUE, ROGUE], [Skill.ATHLETICS], [10])
+        table.chances[0][0][0] = 0
+        self.assertEqual(table.chances[1][0][0], 0.55)
@@ -1,6 +1,10 @@
 """Test the implementation of the combat.py module."""
 import unittest
-from toolbox.combat import Damage, WeaponType, Weapon, WeaponAttack, Dice, DamageType
+from itertools import product
+from toolbox.combat import (Damage, WeaponType, Weapon, WeaponAttack, Dice, DamageType,
+                            WeaponProperty, weapons_with)
+from toolbox.common import Ability, AbilitySet
+from toolbox.dice import parse
 
 class DamageTypeTestCase(unittest.TestCase):
     def test_get_values(self):
@@ -25,6 +29,24 @@ class DamageTestCase(unittest.TestCase):
         damage = Damage(1, Dice.D6, DamageType.PIERCING)
         self.assertAlmostEqual(damage.average(), 3.5)
 
+    def test_average_reroll(self):
+        damage = Damage(2, Dice.D6, DamageType.SLASHING, reroll=2)
+        self.assertAlmostEqual(damage.average(), 25 / 3)
+        self.assertAlmostEqual(damage.critical_average(), 50 / 3)
+
+    def test_average_minimum(self):
+        damage = Damage(1, Dice.D6, DamageType.FIRE, minimum=2)
+        self.assertAlmostEqual(damage.average(), 22 / 6)
+        both = Damage(1, Dice.D4, DamageType.FIRE, reroll=1, minimum=2)
+        self.assertAlmostEqual(both.average(), (2.75 + 2 + 3 + 4) / 4)
+
+    def test_average_best_of_two(self):
+        damage = Damage(2, Dice.D6, DamageType.SLASHING, best_of_two=True)
+        totals = [sum(roll) for roll in product(range(1, 7), repeat=2)]
+        expected = sum(max(first, second) for first in totals for second in totals) / 36 ** 2
+        self.assertAlmostEqual(damage.average(), expected)
+        self.assertGreater(damage.critical_average(), 2 * 7)
+
 class WeaponTypeTestCase(unittest.TestCase):
     def test_get_values(self):
         values = WeaponType.get_values()
@@ -51,7 +73,77 @@ class WeaponTestCase(unittest.TestCase):
         weapon = Weapon(WeaponType.MACE, bonus=1, extra_damage=[Damage(1, Dice.D6, DamageType.BLUDGEONING),])
         self.assertAlmostEqual(weapon.average_damage(), 8)
 
-class AttackTestCase(unittest.TestCase):    
+    def test_average_damage_great_weapon_fighting(self):
+        two_handed = [WeaponType.GREATSWORD, WeaponType.MAUL, WeaponType.GREATAXE] + [
+            weapon_type for weapon_type in WeaponType if weapon_type.name.endswith('2H')]
+        for weapon_type in two_handed:
+            weapon = Weapon(weapon_type, 1, [Damage(1, Dice.D4, DamageType.FIRE)], reroll=2)
+            base = weapon.base_damage
+            expression = parse(f'{base.num_dice}d{int(base.die)}r2')
+            with self.subTest(weapon_type=weapon_type):
+                self.assertAlmostEqual(weapon.average_damage(), float(expression.mean()) + 3.5)
+                self.assertAlmostEqual(weapon.average_critical_damage(),
+                                       2 * float(expression.mean()) + 6)
+
+    def test_average_damage_savage_attacker(self):
+        weapon = Weapon(WeaponType.GREATAXE, best_of_two=True)
+        self.assertAlmostEqual(weapon.average_damage(), float(parse('2d12kh1').mean()))
+        self.assertEqual(Weapon(WeaponType.GREATAXE).base_damage.best_of_two, False)
+
+class WeaponPropertyTestCase(unittest.TestCase):
+    def test_properties(self):
+        self.assertEqual(Weapon(WeaponType.RAPIER).properties, WeaponProperty.FINESSE)
+        self.assertTrue(Weapon(WeaponType.LONGBOW).properties & WeaponProperty.HEAVY)
+        self.assertTrue(Weapon(WeaponType.LONGSWORD2H).properties & WeaponProperty.TWO_HANDED)
+        self.assertFalse(Weapon(WeaponType.LONGSWORD).properties & WeaponProperty.TWO_HANDED)
+
+    def test_hand_crossbow(self):
+        weapon = Weapon(WeaponType.HAND_CROSSBOW)
+        self.assertEqual((weapon.base_damage_die, weapon.base_damage_type),
+                         (Dice.D6, DamageType.PIERCING))
+        self.assertEqual(Weapon(WeaponType.LIGHT_CROSSBOW).base_damage_die, Dice.D8)
+        self.assertTrue(weapon.properties & WeaponProperty.LIGHT)
+
+    def test_weapons_with(self):
+        self.assertEqual(weapons_with(WeaponProperty.FINESSE | WeaponProperty.LIGHT),
+                         [WeaponType.DAGGER, WeaponType.SCIMITAR, WeaponType.SHORTSWORD])
+        self.assertEqual(weapons_with(WeaponProperty.REACH, WeaponProperty.HEAVY),
+                         [WeaponType.LANCE, WeaponType.WHIP])
+        self.assertEqual(len(weapons_with(WeaponProperty.NONE)), len(WeaponType))
+
+    def test_best_attack_ability(self):
+        abilities = AbilitySet(strength=12, dexterity=16)
+        self.assertEqual(Weapon(WeaponType.RAPIER).best_attack_ability(abilities),
+                         Ability.DEXTERITY)
+        self.assertEqual(Weapon(WeaponType.JAVELIN).best_attack_ability(abilities),
+                         Ability.STRENGTH)
+        self.assertEqual(Weapon(WeaponType.LONGBOW).best_attack_ability(AbilitySet(strength=20)),
+                         Ability.DEXTERITY)
+        self.assertEqual(Weapon(WeaponType.DAGGER).best_attack_ability(AbilitySet()),
+                         Ability.STRENGTH)
+        self.assertEqual(Weapon(WeaponType.DART).attack_abilities,
+                         (Ability.STRENGTH, Ability.DEXTERITY))
+
+class AttackTestCase(unittest.TestCase):
+    def test_from_abilities(self):
+        abilities = AbilitySet(strength=8, dexterity=18)
+        self.assertEqual(WeaponAttack.from_abilities(Weapon(WeaponType.SCIMITAR), 5,
+                                                     abilities).attack_stat, 18)
+        self.assertEqual(WeaponAttack.from_abilities(Weapon(WeaponType.GREATSWORD), 5,
+                                                     abilities).attack_stat, 8)
+
+    def test_off_hand(self):
+        weapon = Weapon(WeaponType.SHORTSWORD)
+        main_hand = WeaponAttack(weapon, 5, 18)
+        off_hand = WeaponAttack(weapon, 5, 18, off_hand=True)
+        self.assertEqual(off_hand.hit_chance(15), main_hand.hit_chance(15))
+        self.assertAlmostEqual(off_hand.average_hit_damage(), 3.5)
+        self.assertAlmostEqual(off_hand.critical_hit_damage(), 7.0)
+        # A negative modifier still applies to off-hand damage.
+        self.assertAlmostEqual(WeaponAttack(weapon, 5, 8, off_hand=True).average_hit_damage(), 2.5)
+        self.assertRaises(ValueError, WeaponAttack, Weapon(WeaponType.LONGSWORD), 5, 18,
+                          off_hand=True)
+    
     def test_hit_chance(self):
         weapon = Weapon(WeaponType.WARHAMMER)
         weapon_attack = WeaponAttack(weapon, 5, 18)
@@ -102,6 +194,13 @@ class AttackTestCase(unittest.TestCase):
         weapon_attack = WeaponAttack(weapon, 5, 18)
         self.assertAlmostEqual(weapon_attack.average_damage(11), 11.15)
     
+    def test_average_damages(self):
+        weapon = Weapon(WeaponType.MACE, bonus=1, extra_damage=[Damage(1, Dice.D6, DamageType.BLUDGEONING),])
+        weapon_attack = WeaponAttack(weapon, 5, 18)
+        target_acs = [5, 12, 15, 30]
+        self.assertEqual(weapon_attack.average_damages(target_acs),
+                         [weapon_attack.average_damage(ac) for ac in target_acs])
+    
     def test_critical_hit_damage(self):
         weapon = Weapon(WeaponType.WARHAMMER)
         weapon_attack = WeaponAttack(weapon, 5, 18)
@@ -1,6 +1,7 @@
 """Test the implementation of the currency.py module."""
 from unittest import TestCase, main
-from toolbox.currency import Currency, CurrencyOptions
+from toolbox.currency import (Currency, CurrencyBatch, CurrencyOptions, FrozenCurrency,
+                              cached_split, clear_currency_cache, currency_cache_info)
 
 class CurrencyTestCase(TestCase):
     def test_equal(self):
@@ -45,6 +46,19 @@ class CurrencyTestCase(TestCase):
         cur = Currency(0, 0, 0, 0, 0)
         self.assertEqual(str(cur), '0cp')
 
+    def test_parse(self):
+        self.assertEqual(Currency.parse('3pp, 12gp, 5cp'), Currency(3, 12, 0, 0, 5))
+    
+    def test_parse_round_trip(self):
+        cur = Currency(1, 2, 3, 4, 5)
+        self.assertEqual(Currency.parse(str(cur)), cur)
+        self.assertEqual(Currency.parse('0cp'), Currency())
+    
+    def test_parse_invalid(self):
+        self.assertRaises(ValueError, Currency.parse, '3xp')
+        self.assertRaises(ValueError, Currency.parse, '')
+        self.assertRaises(ValueError, Currency.parse, 'gp')
+
     def test_add(self):
         cur1 = Currency(1, 2, 3, 4, 5)
         cur2 = Currency(6, 7, 8, 9, 10)
@@ -129,4 +143,101 @@ class CurrencyTestCase(TestCase):
         currencies = Currency(3, 2, 5, 5, 5).split(3, False)
         self.assertEqual(currencies[0], Currency(1, 1, 1, 2, 0))
         self.assertEqual(currencies[1], Currency(1, 1, 1, 2, 0))
-        self.assertEqual(currencies[2], Currency(1, 0, 3, 1, 5))
\ No newline at end of file
+        self.assertEqual(currencies[2], Currency(1, 0, 3, 1, 5))
+
+    def test_fair_split_lumpy(self):
+        currencies = Currency(1, 10, 0, 0, 0).fair_split(2)
+        self.assertEqual(currencies[0], Currency(platinum=1))
+        self.assertEqual(currencies[1], Currency(gold=10))
+    
+    def test_fair_split_keeps_coins(self):
+        cur = Currency(3000000, 7000001, 5000003, 9999999, 12345677)
+        currencies = cur.fair_split(20)
+        total = Currency()
+        for currency in currencies:
+            total += currency
+        self.assertEqual(total, cur)
+        self.assertLessEqual(max(currencies).to_copper() - min(currencies).to_copper(), 1)
+    
+    def test_weighted_split(self):
+        currencies = Currency(gold=100, copper=7).weighted_split([2, 1, 1, 0.5, 0.5])
+        self.assertEqual(currencies[0], Currency(gold=40, copper=3))
+        self.assertEqual(currencies[1], Currency(gold=20, copper=1))
+        self.assertEqual(currencies[4], Currency(gold=10, copper=1))
+    
+    def test_weighted_split_keeps_value(self):
+        currencies = Currency(gold=1, copper=1).weighted_split([1, 1, 1])
+        self.assertEqual(sum(currency.to_copper() for currency in currencies), 101)
+        self.assertEqual(currencies[1], Currency(silver=3, copper=4))
+        self.assertEqual(currencies[2], Currency(silver=3, copper=3))
+    
+    def test_weighted_split_groups(self):
+        groups = Currency(gold=100, copper=7).weighted_split_groups([2, 1, 1, 0.5, 0.5])
+        self.assertEqual(len(groups), 3)
+        self.assertEqual(groups[1][1], 2)
+        self.assertEqual(groups[1][2], Currency(gold=20, copper=1))
+    
+    def test_weighted_fair_split(self):
+        cur = Currency(3, 2, 5, 5, 5)
+        self.assertEqual(cur.weighted_fair_split([1, 1, 1]), cur.split(3, False))
+        self.assertEqual(Currency(gold=10).weighted_fair_split([3, 1]),
+                         [Currency(gold=8), Currency(gold=2)])
+        self.assertEqual(Currency(gold=10).weighted_fair_split([0, 1]),
+                         [Currency(), Currency(gold=10)])
+
+    def test_weighted_fair_split_keeps_coins(self):
+        cur = Currency(3000000, 7000001, 5000003, 9999999, 12345677)
+        currencies = cur.weighted_fair_split([2, 1, 1, 0.5, 0.5] * 4)
+        total = Currency()
+        for currency in currencies:
+            total += currency
+        self.assertEqual(total, cur)
+        self.assertEqual(currencies, cur.weighted_fair_split([2, 1, 1, 0.5, 0.5] * 4))
+        self.assertLessEqual(abs(currencies[0].to_copper() - 2 * currencies[1].to_copper()), 1000)
+
+    def test_weighted_split_groups_noconsolidate(self):
+        groups = Currency(gold=10).weighted_split_groups(['2', '1', '1'], consolidate=False)
+        self.assertEqual(groups, [(2, 1, Currency(gold=5)), (1, 1, Currency(gold=3)),
+                                  (1, 1, Currency(gold=2))])
+
+    def test_weighted_split_invalid(self):
+        self.assertRaises(ValueError, Currency(gold=1).weighted_split, [0, 0])
+        self.assertRaises(ValueError, Currency(gold=1).weighted_split, [1, -1])
+
+    def test_hash(self):
+        cur1 = Currency(1, 2, 3, 4, 5)
+        cur2 = Currency(1, 2, 3, 4, 5)
+        self.assertEqual(hash(cur1), hash(cur2))
+        self.assertEqual(len({cur1, cur2, Currency(copper=1)}), 2)
+    
+    def test_freeze(self):
+        cur = Currency(1, 2, 3, 4, 5).freeze()
+        self.assertIsInstance(cur, FrozenCurrency)
+        self.assertEqual(cur, Currency(1, 2, 3, 4, 5))
+        with self.assertRaises(AttributeError):
+            cur.gold = 3
+    
+    def test_cached_split(self):
+        clear_currency_cache()
+        cur = Currency(100, 100, 100, 100, 101)
+        currencies = cached_split(cur, 2)
+        self.assertEqual(list(currencies), cur.split(2))
+        cur.copper = 0
+        self.assertIs(cached_split(Currency(100, 100, 100, 100, 101), 2), currencies)
+        self.assertEqual(currency_cache_info()['split'].hits, 1)
+
+
+class CurrencyBatchTestCase(TestCase):
+    def test_from_strings(self):
+        batch = CurrencyBatch.from_strings(['3pp, 12gp, 5cp\n', '1ep', '0cp'])
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch[0], Currency(3, 12, 0, 0, 5))
+        self.assertEqual(list(batch.to_strings()), ['3pp, 12gp, 5cp', '1ep', '0cp'])
+    
+    def test_to_copper(self):
+        batch = CurrencyBatch.from_currencies([Currency(1, 2, 3, 4, 5), Currency(gold=1)])
+        self.assertEqual(list(batch.to_copper()), [1395, 100])
+    
+    def test_total(self):
+        batch = CurrencyBatch.from_currencies([Currency(1, 2, 3, 4, 5), Currency(gold=1)])
+        self.assertEqual(batch.total(), Currency(1, 3, 3, 4, 5))
@@ -0,0 +1,81 @@
+"""Test the implementation of the dice.py module."""
+import random
+import time
+import unittest
+from fractions import Fraction
+from itertools import product
+from toolbox.combat import Dice
+from toolbox.dice import DiceTerm, parse
+
+class ParseTestCase(unittest.TestCase):
+    def test_terms(self):
+        expression = parse('2d6 + d8 - 1d4kh1 + 5 - 2')
+        self.assertEqual(expression.terms, (DiceTerm(2, Dice.D6), DiceTerm(1, Dice.D8),
+                                            DiceTerm(1, Dice.D4, 1, True, 0, -1)))
+        self.assertEqual(expression.constant, 3)
+        self.assertEqual(str(expression), '2d6+1d8-1d4kh1+3')
+
+    def test_modifiers(self):
+        self.assertEqual(parse('4d6k3').terms[0], DiceTerm(4, Dice.D6, 3))
+        self.assertEqual(parse('2D20KL1').terms[0], DiceTerm(2, Dice.D20, 1, False))
+        self.assertEqual(parse('2d6r2').terms[0], DiceTerm(2, Dice.D6, reroll=2))
+        self.assertEqual(parse('d%').terms[0], DiceTerm(1, Dice.D100))
+
+    def test_memoized(self):
+        self.assertIs(parse('1d20+7'), parse('1d20+7'))
+
+    def test_invalid(self):
+        for text in ('', '+', '2d6+', '2d7', '0d6', 'd0', '1d6x', '4d6kh5', '4d6kh0', '1d6r6',
+                     '2d6kh1kl1', '2d6r1r2', '101d6', '50d6+51d4'):
+            with self.subTest(text=text):
+                self.assertRaises(ValueError, parse, text)
+
+    def test_too_large(self):
+        for text in ('100d20kh50', '100d4kh50', '100d100r99', '100d100+100d100'):
+            with self.subTest(text=text):
+                self.assertRaises(ValueError, parse, text)
+
+    def test_largest_expressions_compile_quickly(self):
+        # Near MAX_COST for rolls without and with kept dice.
+        for text in ('100d100', '20d20kh10'):
+            with self.subTest(text=text):
+                start = time.perf_counter()
+                expression = parse(text)
+                expression.mean()
+                self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(parse('100d100').mean(), Fraction(10100, 2))
+
+class DiceExpressionTestCase(unittest.TestCase):
+    def test_sum(self):
+        expression = parse('2d6+1d8+5')
+        self.assertEqual(expression.mean(), Fraction(33, 2))
+        self.assertEqual((expression.minimum(), expression.maximum()), (8, 25))
+        self.assertEqual(expression.distribution()[8], Fraction(1, 288))
+        self.assertEqual(sum(expression.distribution().values()), 1)
+
+    def test_negative(self):
+        expression = parse('-1d4')
+        self.assertEqual(list(expression.distribution()), [-4, -3, -2, -1])
+        self.assertEqual(parse('3').distribution(), {3: 1})
+
+    def test_keep(self):
+        rolls = list(product(range(1, 7), repeat=4))
+        expected = Fraction(sum(sum(sorted(roll)[1:]) for roll in rolls), len(rolls))
+        self.assertEqual(parse('4d6kh3').mean(), expected)
+        self.assertEqual(parse('2d20kl1').distribution()[1], Fraction(39, 400))
+        self.assertEqual(parse('2d20kh1').distribution()[20], Fraction(39, 400))
+
+    def test_reroll(self):
+        # Great Weapon Fighting rerolls a 1 or 2 once: (2 * 3.5 + 3 + 4 + 5 + 6) / 6.
+        self.assertEqual(parse('1d6r2').mean(), Fraction(25, 6))
+        self.assertEqual(parse('1d6r2').distribution()[1], Fraction(1, 18))
+
+    def test_sample(self):
+        expression = parse('4d6kh3')
+        rolls = expression.sample(20000, random.Random(5))
+        self.assertEqual(len(rolls), 20000)
+        self.assertTrue(all(3 <= roll <= 18 for roll in rolls))
+        self.assertAlmostEqual(sum(rolls) / len(rolls), float(expression.mean()), delta=0.1)
+        self.assertEqual(parse('7').roll(), 7)
+        self.assertEqual(expression.sample(10, random.Random(1)),
+                         expression.sample(10, random.Random(1)))
@@ -0,0 +1,50 @@
+"""Test the implementation of the downtime.py module."""
+from unittest import TestCase
+from toolbox.downtime import (ABILITY_SCORES, language_days_curve, language_training_days,
+                              proficiency_days_curve, proficiency_training_days,
+                              skill_days_curve, skill_training_days, tool_check_bonus,
+                              tool_days_curve, tool_training_days)
+
+class DowntimeTestCase(TestCase):
+    def test_language_training_days(self):
+        self.assertEqual(language_training_days(16, 12, 10), 32)
+        self.assertEqual(language_training_days(8, 9, 10), 250)
+
+    def test_proficiency_training_days(self):
+        self.assertEqual(proficiency_training_days(15), 17)
+        self.assertEqual(proficiency_training_days(0), 250)
+
+    def test_skill_training_days(self):
+        self.assertEqual(skill_training_days(14), (18, 36))
+
+    def test_tool_check_bonus(self):
+        self.assertEqual(tool_check_bonus(14, 3, True, 1), 6)
+        self.assertEqual(tool_check_bonus(9, 3, False), -1)
+
+    def test_tool_training_days(self):
+        self.assertEqual(tool_training_days([5, 0]), (20, 40))
+        self.assertEqual(tool_training_days([-20]), (250, 500))
+        self.assertRaises(ValueError, tool_training_days, [])
+
+class DowntimeCurveTestCase(TestCase):
+    def test_proficiency_and_skill_curves(self):
+        self.assertEqual(proficiency_days_curve(),
+                         tuple(proficiency_training_days(score) for score in ABILITY_SCORES))
+        self.assertEqual(tuple(zip(*skill_days_curve())),
+                         tuple(skill_training_days(score) for score in ABILITY_SCORES))
+
+    def test_language_days_curve(self):
+        for wisdom, charisma in [(10, 10), (14, 8), (30, 30), (1, 17)]:
+            self.assertEqual(language_days_curve([wisdom, charisma]),
+                             tuple(language_training_days(score, wisdom, charisma)
+                                   for score in ABILITY_SCORES))
+        self.assertRaises(ValueError, language_days_curve, [31, 10])
+
+    def test_tool_days_curve(self):
+        # Thieves' tools with dexterity varied: sleight of hand uses dexterity, proficient at +3.
+        fixed = [tool_check_bonus(14, 3, False), tool_check_bonus(14, 3, True),
+                 tool_check_bonus(12, 3, True, 3)]
+        expected = tuple(tool_training_days(fixed + [tool_check_bonus(score, 3, True)])
+                         for score in ABILITY_SCORES)
+        self.assertEqual(tuple(zip(*tool_days_curve(fixed, [3]))), expected)
+        self.assertRaises(ValueError, tool_days_curve, [], [])
@@ -0,0 +1,108 @@
+"""Test the implementation of the encounter.py module."""
+import time
+import unittest
+from itertools import permutations
+from toolbox.combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+from toolbox.encounter import DamageMatrix, Monster, PartyMember, plan_focus_fire, _simulate
+
+class MonsterTestCase(unittest.TestCase):
+    def test_damage_multiplier(self):
+        monster = Monster('Golem', 17, 178, resistances=frozenset({DamageType.FIRE}),
+                          immunities=frozenset({DamageType.POISON}),
+                          vulnerabilities=frozenset({DamageType.FIRE, DamageType.COLD}))
+        self.assertEqual(monster.damage_multiplier(DamageType.POISON), 0)
+        self.assertEqual(monster.damage_multiplier(DamageType.FIRE), 1)
+        self.assertEqual(monster.damage_multiplier(DamageType.COLD), 2)
+        self.assertEqual(monster.damage_multiplier(DamageType.SLASHING), 1)
+
+class DamageMatrixTestCase(unittest.TestCase):
+    def setUp(self):
+        self.sword = WeaponAttack(Weapon(WeaponType.LONGSWORD, 1), 5, 18)
+        self.bow = WeaponAttack(Weapon(WeaponType.LONGBOW, 0, [Damage(1, Dice.D6,
+                                                                      DamageType.FIRE)]), 3, 16)
+        self.party = [PartyMember('Fighter', self.sword, 2), PartyMember('Ranger', self.bow)]
+
+    def test_matches_average_damage(self):
+        matrix = DamageMatrix(self.party, [Monster('Orc', 13, 15), Monster('Ogre', 11, 59)])
+        for member, attack in enumerate((self.sword, self.bow)):
+            for monster, armor_class in enumerate((13, 11)):
+                self.assertAlmostEqual(matrix.attack_damage[member][monster],
+                                       attack.average_damage(armor_class))
+        self.assertAlmostEqual(matrix.damage_per_round(0, 1), 2 * self.sword.average_damage(11))
+        self.assertAlmostEqual(matrix.party_damage_per_round(0),
+                               2 * self.sword.average_damage(13) + self.bow.average_damage(13))
+        self.assertAlmostEqual(matrix.rounds_to_kill(1, 1), 59 / self.bow.average_damage(11))
+
+    def test_damage_modifiers(self):
+        matrix = DamageMatrix(self.party, [
+            Monster('Imp', 13, 10, resistances=frozenset({DamageType.PIERCING}),
+                    immunities=frozenset({DamageType.FIRE})),
+            Monster('Mummy', 11, 58, immunities=frozenset({DamageType.SLASHING})),
+        ])
+        # The longbow hits for 4.5 piercing + 3 modifier (halved) and 3.5 fire (ignored).
+        self.assertAlmostEqual(matrix.attack_damage[1][0], 12 / 20 * 3.75 + 1 / 20 * 6)
+        self.assertEqual(matrix.attack_damage[0][1], 0)
+        self.assertEqual(matrix.rounds_to_kill(0, 1), float('inf'))
+
+    def test_empty(self):
+        self.assertRaises(ValueError, DamageMatrix, [], [Monster('Orc', 13, 15)])
+        self.assertRaises(ValueError, DamageMatrix, self.party, [])
+
+class PlanFocusFireTestCase(unittest.TestCase):
+    def setUp(self):
+        attack = WeaponAttack(Weapon(WeaponType.GREATAXE), 5, 18)
+        self.party = [PartyMember('Barbarian', attack, 2), PartyMember('Paladin', attack, 2)]
+
+    def test_kills_weakest_first(self):
+        matrix = DamageMatrix(self.party, [Monster('Ogre', 11, 59), Monster('Goblin', 15, 7)])
+        plan = plan_focus_fire(matrix)
+        self.assertEqual(plan.order, (1, 0))
+        self.assertEqual(plan.kill_rounds[1], 1)
+        self.assertEqual(plan.rounds, max(plan.kill_rounds))
+        self.assertEqual(len(plan.targets), plan.rounds)
+        self.assertEqual(plan.targets[0][0][0], 1)
+
+    def test_heuristic_matches_exhaustive(self):
+        monsters = [Monster('Goblin', 15, 7), Monster('Ogre', 11, 59), Monster('Orc', 13, 15),
+                    Monster('Wolf', 13, 11)]
+        matrix = DamageMatrix(self.party, monsters)
+        exhaustive = plan_focus_fire(matrix)
+        heuristic = plan_focus_fire(matrix, max_exhaustive=0)
+        self.assertEqual((heuristic.rounds, sum(heuristic.kill_rounds)),
+                         (exhaustive.rounds, sum(exhaustive.kill_rounds)))
+
+    def test_skips_immune_monsters(self):
+        bow = WeaponAttack(Weapon(WeaponType.LONGBOW), 5, 18)
+        matrix = DamageMatrix([PartyMember('Ranger', bow), self.party[0]], [
+            Monster('Ghost', 11, 10, immunities=frozenset({DamageType.PIERCING})),
+            Monster('Orc', 13, 15),
+        ])
+        plan = plan_focus_fire(matrix)
+        self.assertEqual(plan.order[0], 0)
+        self.assertEqual(plan.targets[0][0], (1,))
+
+    def test_matches_every_order(self):
+        bow = WeaponAttack(Weapon(WeaponType.LONGBOW), 5, 18)
+        matrix = DamageMatrix([PartyMember('Ranger', bow, 2), self.party[0]], [
+            Monster('Ghost', 11, 30, immunities=frozenset({DamageType.PIERCING})),
+            Monster('Orc', 13, 15), Monster('Orc', 13, 15), Monster('Ogre', 11, 59),
+            Monster('Wolf', 13, 11)])
+        plans = [_simulate(matrix, order, True) for order in permutations(range(5))]
+        best = min(plans, key=lambda plan: (plan.rounds, sum(plan.kill_rounds)))
+        self.assertEqual(plan_focus_fire(matrix), best)
+
+    def test_long_fight(self):
+        dagger = WeaponAttack(Weapon(WeaponType.DAGGER), 1, 8)
+        matrix = DamageMatrix([PartyMember('Commoner', dagger)],
+                              [Monster(f'Giant {index}', 18, 1000 + index) for index in range(7)])
+        start = time.perf_counter()
+        plan = plan_focus_fire(matrix)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(plan.order, tuple(range(7)))
+        self.assertEqual(len(plan.targets), plan.rounds)
+        self.assertGreater(plan.rounds, 15000)
+
+    def test_invulnerable_monster(self):
+        matrix = DamageMatrix(self.party, [
+            Monster('Golem', 17, 178, immunities=frozenset({DamageType.SLASHING}))])
+        self.assertRaises(ValueError, plan_focus_fire, matrix)
@@ -0,0 +1,61 @@
+"""Test the implementation of the group_checks.py module."""
+import unittest
+from itertools import product
+from toolbox.checks import Character, RollMode
+from toolbox.common import AbilitySet, Skill
+from toolbox.group_checks import (best_passive_score, party_check, passive_score,
+                                  success_count_distribution)
+
+ROGUE = Character('Rogue', AbilitySet(10, 18, 12, 14, 13, 8), 3,
+                  frozenset({Skill.STEALTH, Skill.PERCEPTION}), frozenset({Skill.STEALTH}))
+CLERIC = Character('Cleric', AbilitySet(14, 10, 14, 10, 17, 12), 3, frozenset({Skill.INSIGHT}))
+FIGHTER = Character('Fighter', AbilitySet(16, 12, 15, 8, 10, 10), 2)
+
+class SuccessCountTestCase(unittest.TestCase):
+    def test_matches_brute_force(self):
+        chances = [0.1, 0.5, 0.75, 0.3, 1.0]
+        expected = [0.0] * (len(chances) + 1)
+        for outcome in product((False, True), repeat=len(chances)):
+            probability = 1.0
+            for success, chance in zip(outcome, chances):
+                probability *= chance if success else 1 - chance
+            expected[sum(outcome)] += probability
+        for actual, brute in zip(success_count_distribution(chances), expected):
+            self.assertAlmostEqual(actual, brute)
+
+    def test_invalid_chance(self):
+        self.assertEqual(success_count_distribution([]), [1.0])
+        self.assertRaises(ValueError, success_count_distribution, [0.5, 1.5])
+
+class PartyCheckTestCase(unittest.TestCase):
+    def test_party_check(self):
+        # Perception +4 and +3 at DC 15 pass on 11+ and 12+.
+        result = party_check([ROGUE, CLERIC], Skill.PERCEPTION, 15)
+        self.assertEqual(result.chances, (0.5, 0.45))
+        self.assertAlmostEqual(result.any_chance(), 1 - 0.5 * 0.55)
+        self.assertAlmostEqual(result.all_chance(), 0.5 * 0.45)
+        # Half of a party of 2 is 1 character.
+        self.assertAlmostEqual(result.group_chance(), result.any_chance())
+        self.assertAlmostEqual(sum(result.success_counts), 1.0)
+
+    def test_group_chance_rounds_up(self):
+        result = party_check([ROGUE, CLERIC, FIGHTER], Skill.PERCEPTION, 15, RollMode.ADVANTAGE)
+        self.assertAlmostEqual(result.group_chance(), result.at_least(2))
+        self.assertEqual(result.at_least(0), 1.0)
+        self.assertRaises(ValueError, party_check, [], Skill.PERCEPTION, 15)
+
+class PassiveScoreTestCase(unittest.TestCase):
+    def test_passive_score(self):
+        self.assertEqual(passive_score(ROGUE, Skill.PERCEPTION), 14)
+        self.assertEqual(passive_score(ROGUE, Skill.PERCEPTION, RollMode.ADVANTAGE), 19)
+        self.assertEqual(passive_score(ROGUE, Skill.PERCEPTION, RollMode.DISADVANTAGE), 9)
+
+    def test_best_passive_score(self):
+        self.assertEqual(best_passive_score([FIGHTER, CLERIC, ROGUE], Skill.INSIGHT),
+                         (CLERIC, 16))
+        self.assertEqual(best_passive_score([FIGHTER, CLERIC, ROGUE], Skill.PERCEPTION),
+                         (ROGUE, 14))
+        self.assertRaises(ValueError, best_passive_score, [], Skill.PERCEPTION)
+
+if __name__ == '__main__':
+    unittest.main()
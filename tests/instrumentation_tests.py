@@ -0,0 +1,45 @@
+"""Test the implementation of the instrumentation.py module."""
+import io
+from unittest import TestCase
+from toolbox.combat import Weapon, WeaponAttack, WeaponType
+from toolbox.common import Skill
+from toolbox.currency import Currency
+from toolbox.instrumentation import Instrumentation, profile
+
+class InstrumentationTestCase(TestCase):
+    def test_records_calls(self):
+        attack = WeaponAttack(Weapon(WeaponType.WARHAMMER), 5, 18)
+        with profile() as stats:
+            attack.average_damage(11)
+            attack.average_damage(12)
+            Skill.ACROBATICS.ability()
+        counters = stats.as_dict()
+        self.assertEqual(counters['WeaponAttack.average_damage']['calls'], 2)
+        self.assertEqual(counters['WeaponAttack.hit_bonus']['calls'], 2)
+        self.assertEqual(counters['Skill.ability']['calls'], 1)
+        self.assertGreaterEqual(counters['Weapon.average_damage']['seconds'], 0)
+
+    def test_disable_restores_methods(self):
+        original = Currency.split
+        instrumentation = Instrumentation()
+        instrumentation.enable()
+        self.assertIsNot(Currency.split, original)
+        instrumentation.disable()
+        self.assertIs(Currency.split, original)
+        Currency(gold=1).split(2)
+        self.assertEqual(instrumentation.as_dict(), {})
+
+    def test_results_unchanged(self):
+        attack = WeaponAttack(Weapon(WeaponType.WARHAMMER), 5, 18)
+        with profile():
+            self.assertAlmostEqual(attack.average_damage(11), 7.45)
+            self.assertEqual(Currency(1, 2, 3, 4, 5) + Currency(), Currency(1, 2, 3, 4, 5))
+
+    def test_exports(self):
+        with profile([Currency]) as stats:
+            Currency(gold=1).consolidate()
+        output = io.StringIO()
+        stats.to_csv(output)
+        self.assertTrue(output.getvalue().startswith('method,calls,seconds,allocations'))
+        self.assertIn('toolbox_calls_total{method="Currency.consolidate"} 1',
+                      stats.to_prometheus())
@@ -0,0 +1,59 @@
+"""Test the implementation of the jobs.py module."""
+import queue
+import threading
+from unittest import TestCase
+from toolbox.currency import Currency
+from toolbox.jobs import JOB_DONE_EVENT, JobRunner
+
+class JobRunnerTestCase(TestCase):
+    def setUp(self):
+        self.posted = queue.Queue()
+        self.jobs = JobRunner(lambda event, value: self.posted.put((event, value)))
+
+    def tearDown(self):
+        self.jobs.shutdown()
+
+    def test_result_posted(self):
+        generation = self.jobs.submit('-split-', Currency(0, 1, 0, 0, 0).split, 2)
+        event, result = self.posted.get(timeout=5)
+        self.assertEqual(event, JOB_DONE_EVENT)
+        self.assertEqual(result.key, '-split-')
+        self.assertEqual(result.generation, generation)
+        self.assertEqual(result.value, [Currency(0, 0, 0, 5, 0)] * 2)
+        self.assertIsNone(result.exception)
+        self.assertTrue(self.jobs.is_current(result))
+
+    def test_exception_captured(self):
+        self.jobs.submit('-split-', Currency(0, 1, 0, 0, 0).split, 0)
+        _, result = self.posted.get(timeout=5)
+        self.assertIsNone(result.value)
+        self.assertIsInstance(result.exception, ZeroDivisionError)
+
+    def test_superseded_result_dropped(self):
+        release = threading.Event()
+        self.jobs.submit('-slow-', lambda: release.wait(5) and 'old')
+        generation = self.jobs.submit('-slow-', lambda: 'new')
+        _, result = self.posted.get(timeout=5)
+        release.set()
+        self.assertEqual(result.value, 'new')
+        self.assertEqual(result.generation, generation)
+        self.jobs.shutdown(wait=True)
+        self.assertTrue(self.posted.empty())
+
+    def test_is_current(self):
+        self.jobs.submit('-a-', lambda: 1)
+        _, first = self.posted.get(timeout=5)
+        self.jobs.submit('-a-', lambda: 2)
+        _, second = self.posted.get(timeout=5)
+        self.assertFalse(self.jobs.is_current(first))
+        self.assertTrue(self.jobs.is_current(second))
+
+    def test_keys_independent(self):
+        self.jobs.submit('-a-', lambda: 1)
+        self.jobs.submit('-b-', lambda: 2)
+        results = {}
+        for _ in range(2):
+            _, result = self.posted.get(timeout=5)
+            results[result.key] = result
+        self.assertTrue(self.jobs.is_current(results['-a-']))
+        self.assertTrue(self.jobs.is_current(results['-b-']))
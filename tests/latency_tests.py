@@ -0,0 +1,43 @@
+"""Test the implementation of the latency.py module."""
+import os
+import tempfile
+from unittest import TestCase
+from toolbox.latency import LatencyRecorder
+
+class LatencyRecorderTestCase(TestCase):
+    def test_ring_buffer(self):
+        recorder = LatencyRecorder(capacity=3)
+        for index in range(5):
+            recorder.record(f'-event-{index}-', index)
+        self.assertEqual(len(recorder), 3)
+        self.assertEqual(recorder.samples[0].event, '-event-2-')
+
+    def test_percentile(self):
+        recorder = LatencyRecorder()
+        for index in range(1, 101):
+            recorder.record('-event-', index / 1000, 0.001)
+        self.assertAlmostEqual(recorder.percentile(50), 0.051)
+        self.assertAlmostEqual(recorder.percentile(99, 'handler'), 0.099)
+        self.assertEqual(recorder.summary(), 'p50 51.0 ms / p99 100.0 ms')
+
+    def test_empty(self):
+        recorder = LatencyRecorder()
+        self.assertIsNone(recorder.percentile(50))
+        self.assertEqual(recorder.summary(), 'p50 - / p99 -')
+
+    def test_slowest(self):
+        recorder = LatencyRecorder()
+        recorder.record('-fast-', 0.001)
+        recorder.record('-slow-', 0.5)
+        self.assertEqual(next(recorder.slowest(1)).event, '-slow-')
+
+    def test_dump(self):
+        recorder = LatencyRecorder()
+        recorder.record('-event-', 0.25, 0.5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'latency.csv')
+            recorder.dump(path)
+            with open(path) as file:
+                lines = file.read().splitlines()
+        self.assertEqual(lines, ['event,handler_seconds,update_seconds,total_seconds',
+                                 '-event-,0.25,0.5,0.75'])
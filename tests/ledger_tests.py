@@ -0,0 +1,48 @@
+"""Test the implementation of the ledger.py module."""
+import os
+import tempfile
+from unittest import TestCase
+from toolbox.currency import Currency, CurrencyOptions
+from toolbox.ledger import Ledger, LedgerEntry
+
+class LedgerTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ledger.bin')
+        self.ledger = Ledger(self.path)
+        self.ledger.append(Currency(gold=5), party=1, timestamp=10)
+        self.ledger.append(Currency(silver=-3), party=2, timestamp=11)
+        self.ledger.append(Currency(1, 2, 3, 4, 5), party=1, timestamp=12)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_len(self):
+        self.assertEqual(len(self.ledger), 3)
+
+    def test_getitem(self):
+        self.assertEqual(self.ledger[-1], LedgerEntry(Currency(1, 2, 3, 4, 5), 12, 1))
+
+    def test_balance(self):
+        self.assertEqual(self.ledger.balance(1), Currency(1, 7, 3, 4, 5))
+        self.assertEqual(self.ledger.balance(), Currency(1, 7, 3, 1, 5))
+
+    def test_balance_reopened(self):
+        ledger = Ledger(self.path)
+        ledger.extend([LedgerEntry(Currency(copper=5), 13, 2)])
+        self.assertEqual(ledger.balance(2), Currency(silver=-3, copper=5))
+        self.assertEqual(ledger.parties(), [1, 2])
+
+    def test_running_balance(self):
+        balances = list(self.ledger.running_balance(1))
+        self.assertEqual(balances, [(10, Currency(gold=5)), (12, Currency(1, 7, 3, 4, 5))])
+
+    def test_consolidated_balances(self):
+        balances = self.ledger.consolidated_balances(CurrencyOptions.ALL)
+        self.assertEqual(balances[1], Currency(1, 8, 1, 4, 5))
+
+    def test_not_a_ledger(self):
+        path = os.path.join(self.directory.name, 'other.bin')
+        with open(path, 'wb') as file:
+            file.write(b'not a ledger')
+        self.assertRaises(ValueError, Ledger, path)
@@ -0,0 +1,108 @@
+"""Test the implementation of the roster.py module."""
+import csv
+import importlib.util
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from toolbox.downtime import (language_training_days, proficiency_training_days,
+                              skill_training_days, tool_check_bonus, tool_training_days)
+from toolbox.roster import (ROSTER_FIELDS, evaluate_roster, main, training_options,
+                            write_roster)
+
+CSV_INPUT = '''name,strength,dexterity,constitution,intelligence,wisdom,charisma,proficiency_bonus,\
+sleight_of_hand_proficient,history_bonus
+Ayla,8,16,12,14,12,10,3,true,2
+Bron,18,10,16,8,10,12,,,
+'''
+
+class TrainingOptionsTestCase(TestCase):
+    def test_training_options(self):
+        row = next(csv.DictReader(io.StringIO(CSV_INPUT)))
+        options = dict(zip(ROSTER_FIELDS, training_options(row)))
+        self.assertEqual(options['name'], 'Ayla')
+        self.assertEqual(options['language'], language_training_days(14, 12, 10))
+        self.assertEqual((options['stealth'], options['stealth_expertise']),
+                         skill_training_days(16))
+        # Thieves' tools use history, investigation, perception, and sleight of hand.
+        self.assertEqual((options['thieves'], options['thieves_expertise']),
+                         tool_training_days([tool_check_bonus(14, 3, False, 2),
+                                             tool_check_bonus(14, 3, False),
+                                             tool_check_bonus(12, 3, False),
+                                             tool_check_bonus(16, 3, True)]))
+        self.assertEqual(options['weapon_strength'], proficiency_training_days(8))
+        self.assertEqual(options['light_armor'], proficiency_training_days(16))
+        self.assertEqual(options['heavy_armor'], proficiency_training_days(8))
+
+    def test_invalid_rows(self):
+        self.assertRaises(ValueError, training_options, {'strength': '10'})
+        self.assertRaises(ValueError, training_options, {'name': 'Ayla', 'strength': 'x'})
+        rows = [{'name': 'Ayla'}, {'name': 'Bron', 'stealth_proficient': 'maybe'}]
+        with self.assertRaisesRegex(ValueError, '^Row 2: '):
+            list(evaluate_roster(rows, chunk_size=1, workers=0))
+
+class RosterTestCase(TestCase):
+    def test_workers_match_serial(self):
+        rows = [{'name': f'Character {index}', 'intelligence': 8 + index % 10,
+                 'dexterity': 20 - index % 7} for index in range(50)]
+        serial = list(evaluate_roster(rows, chunk_size=7, workers=0))
+        self.assertEqual(list(evaluate_roster(rows, chunk_size=7, workers=2)), serial)
+        self.assertEqual([record[0] for record in serial], [row['name'] for row in rows])
+
+    def test_csv_output(self):
+        output = io.StringIO()
+        stats = write_roster(io.StringIO(CSV_INPUT), output, chunk_size=1, workers=0)
+        self.assertEqual(stats.rows, 2)
+        self.assertGreaterEqual(stats.rows_per_second(), 0)
+        lines = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(lines[0], ROSTER_FIELDS)
+        self.assertEqual(lines[2][:2], ['Bron', '125'])
+
+    def test_jsonl_output(self):
+        output = io.StringIO()
+        write_roster(io.StringIO('{"name": "Bron", "strength": 18}\n'), output, 'jsonl', 'jsonl',
+                     workers=0)
+        record = json.loads(output.getvalue())
+        self.assertEqual(record['weapon_strength'], 14)
+        self.assertEqual(len(record), len(ROSTER_FIELDS))
+
+    @skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_parquet_output(self):
+        import pyarrow.parquet
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'roster.parquet')
+            with open(path, 'wb') as output:
+                write_roster(io.StringIO(CSV_INPUT), output, output_format='parquet',
+                             chunk_size=1, workers=0)
+            table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.column_names, ROSTER_FIELDS)
+        self.assertEqual(table.column('name').to_pylist(), ['Ayla', 'Bron'])
+
+    @skipUnless(importlib.util.find_spec('pyarrow') is None, 'pyarrow is installed')
+    def test_parquet_needs_pyarrow(self):
+        self.assertRaises(ValueError, write_roster, io.StringIO(CSV_INPUT), io.BytesIO(),
+                          output_format='parquet', workers=0)
+
+    def test_main_invalid_row(self):
+        source = io.StringIO('name,wisdom\nAyla,wise\n')
+        errors = io.StringIO()
+        with patch('sys.stdin', source), redirect_stderr(errors), redirect_stdout(io.StringIO()):
+            self.assertEqual(main(['-', '--workers', '0']), 1)
+        self.assertIn("Row 1: Invalid wisdom 'wise'.", errors.getvalue())
+
+    def test_main_missing_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            missing = os.path.join(directory, 'missing.csv')
+            output = os.path.join(directory, 'missing', 'days.csv')
+            for argv, message in (([missing], 'cannot open input'),
+                                  (['-', '-o', output], 'cannot open output')):
+                errors = io.StringIO()
+                with patch('sys.stdin', io.StringIO(CSV_INPUT)), redirect_stderr(errors):
+                    with self.assertRaises(SystemExit) as context:
+                        main(argv + ['--workers', '0'])
+                self.assertEqual(context.exception.code, 2)
+                self.assertIn(message, errors.getvalue())
+                self.assertIn('No such file or directory', errors.getvalue())
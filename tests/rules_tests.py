@@ -0,0 +1,168 @@
+"""Test the implementation of the rules.py module."""
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from toolbox import downtime
+from toolbox.cache import rules_fingerprint
+from toolbox.combat import Damage, DamageType, Dice, Weapon, WeaponType
+from toolbox.common import Ability, Skill, Tool, set_rule_tables
+from toolbox.roster import ROSTER_FIELDS, evaluate_roster
+from toolbox.rules import (apply_rule_pack, compile_rule_pack, current_rule_pack,
+                           default_rule_pack, load_rule_pack, save_rule_pack, use_rule_pack)
+from toolbox.server import ToolboxServer, run_batch
+
+HOUSE_RULES = {
+    'name': 'House rules',
+    'downtime': {'base_days': 200},
+    'skills': {'Intimidation': 'strength'},
+    'tools': {'smith': {'name': 'Forge Tools', 'skills': ['arcana', 'athletics']}},
+    'weapons': {'LONGSWORD': {'damage': '1d10', 'type': 'slashing'}},
+}
+
+HOUSE_RULES_TOML = '''name = "House rules"
+
+[downtime]
+base_days = 200
+
+[skills]
+intimidation = "strength"
+
+[tools.smith]
+name = "Forge Tools"
+skills = ["arcana", "athletics"]
+
+[weapons.longsword]
+damage = "1d10"
+type = "slashing"
+'''
+
+class RulePackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'house.json')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(HOUSE_RULES, file)
+
+    def tearDown(self):
+        apply_rule_pack(default_rule_pack())
+        self.directory.cleanup()
+
+    def test_apply_rule_pack(self):
+        fingerprint = rules_fingerprint()
+        pack = use_rule_pack(self.path)
+        self.assertEqual(pack.name, 'House rules')
+        self.assertEqual(downtime.BASE_DOWNTIME_DAYS, 200)
+        self.assertEqual(downtime.skill_training_days(10), (20, 40))
+        self.assertEqual(Skill.INTIMIDATION.ability(), Ability.STRENGTH)
+        self.assertEqual(Tool.SMITH.skills(), [Skill.ARCANA, Skill.ATHLETICS])
+        self.assertEqual(Tool.get_display_name(Tool.SMITH), 'Forge Tools')
+        self.assertEqual(Weapon(WeaponType.LONGSWORD).base_damage_die, Dice.D10)
+        # Rules that the pack does not set keep their built-in values.
+        self.assertEqual(Skill.STEALTH.ability(), Ability.DEXTERITY)
+        self.assertEqual(Weapon(WeaponType.DAGGER).base_damage_die, Dice.D4)
+        # Cached results of the old rules no longer match.
+        self.assertNotEqual(rules_fingerprint(), fingerprint)
+        self.assertEqual(current_rule_pack(), pack)
+        apply_rule_pack(default_rule_pack())
+        self.assertEqual(downtime.BASE_DOWNTIME_DAYS, 250)
+        self.assertEqual(Weapon(WeaponType.LONGSWORD).base_damage_die, Dice.D8)
+        self.assertEqual(current_rule_pack(), default_rule_pack())
+
+    def test_cache(self):
+        pack = load_rule_pack(self.path)
+        cache_path = self.path + '.cache.json'
+        self.assertTrue(os.path.exists(cache_path))
+        # A current cache is used without parsing the pack.
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        stat = os.stat(self.path)
+        with open(self.path, 'wb') as file:
+            file.write(b'x' * len(data))
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(load_rule_pack(self.path), pack)
+        self.assertRaises(ValueError, load_rule_pack, self.path, use_cache=False)
+        # A changed pack is compiled again.
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump({'name': 'Changed rules'}, file)
+        self.assertEqual(load_rule_pack(self.path).name, 'Changed rules')
+        with open(cache_path, 'w', encoding='utf-8') as file:
+            file.write('not json')
+        self.assertEqual(load_rule_pack(self.path).name, 'Changed rules')
+        # A cache with the right signature but invalid tables is compiled again.
+        with open(cache_path, encoding='utf-8') as file:
+            cached = json.load(file)
+        cached['pack']['skill_abilities'][0] = 99
+        with open(cache_path, 'w', encoding='utf-8') as file:
+            json.dump(cached, file)
+        self.assertEqual(load_rule_pack(self.path).skill_abilities,
+                         default_rule_pack().skill_abilities)
+
+    @unittest.skipUnless(importlib.util.find_spec('tomllib') or importlib.util.find_spec('tomli'),
+                         'TOML is not supported')
+    def test_toml(self):
+        path = os.path.join(self.directory.name, 'house.toml')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(HOUSE_RULES_TOML)
+        self.assertEqual(load_rule_pack(path, use_cache=False), load_rule_pack(self.path))
+
+    def test_save_rule_pack(self):
+        path = os.path.join(self.directory.name, 'srd.json')
+        save_rule_pack(default_rule_pack(), path)
+        self.assertEqual(load_rule_pack(path, use_cache=False), default_rule_pack())
+        house_path = os.path.join(self.directory.name, 'saved.json')
+        save_rule_pack(load_rule_pack(self.path), house_path)
+        self.assertEqual(load_rule_pack(house_path), load_rule_pack(self.path))
+
+    def test_invalid_packs(self):
+        invalid = [[], {'spells': {}}, {'downtime': {'base_days': 0}}, {'skills': []},
+                   {'skills': {'juggling': 'dexterity'}}, {'skills': {'stealth': 'luck'}},
+                   {'tools': {'smith': {'skills': []}}}, {'tools': {'smith': {'dice': 1}}},
+                   {'weapons': {'dagger': {'damage': '1d7', 'type': 'piercing'}}},
+                   {'weapons': {'dagger': {'damage': 'd4', 'type': 'piercing'}}},
+                   {'weapons': {'dagger': {'damage': '1d4', 'type': 'sharp'}}},
+                   {'weapons': {'dagger': {'damage': '1d4'}}}]
+        for data in invalid:
+            with self.subTest(data=data):
+                self.assertRaises(ValueError, compile_rule_pack, data)
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('{')
+        self.assertRaises(ValueError, load_rule_pack, self.path)
+        self.assertRaises(OSError, load_rule_pack, self.path + '.missing')
+
+    def test_roster_workers_use_active_rules(self):
+        use_rule_pack(self.path)
+        rows = [{'name': 'Bron', 'strength': 20, 'intelligence': 10}]
+        serial = list(evaluate_roster(rows, workers=0))
+        self.assertEqual(list(evaluate_roster(rows, workers=1)), serial)
+        options = dict(zip(ROSTER_FIELDS, serial[0]))
+        self.assertEqual(options['intimidation'], 200 // 20)
+        self.assertEqual(options['language'], 200)
+
+    def test_server_workers_use_active_rules(self):
+        use_rule_pack(self.path)
+        server = ToolboxServer(workers=1)
+        try:
+            days = server.executor.submit(run_batch, [('/downtime', {'kind': 'weapon',
+                                                                     'ability_score': 10})])
+            self.assertEqual(days.result(), [(200, {'days': 200 // 10})])
+        finally:
+            server.executor.shutdown()
+
+class SetRuleTablesTestCase(unittest.TestCase):
+    def test_incomplete_tables(self):
+        skills = {skill: skill.ability() for skill in Skill}
+        tools = {tool: tool.skills() for tool in Tool}
+        names = {tool: Tool.get_display_name(tool) for tool in Tool}
+        del skills[Skill.STEALTH]
+        self.assertRaises(ValueError, set_rule_tables, skills, tools, names)
+        self.assertEqual(Skill.STEALTH.ability(), Ability.DEXTERITY)
+
+    def test_invalid_weapon_map(self):
+        self.assertRaises(TypeError, Weapon.set_weapon_map, {'dagger': Damage(1, Dice.D4,
+                                                                             DamageType.PIERCING)})
+        self.assertRaises(TypeError, Weapon.set_weapon_map, {WeaponType.DAGGER: (1, 4)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Test the implementation of the serialization.py module."""
+import json
+import struct
+from unittest import TestCase
+from toolbox.combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+from toolbox.common import AbilitySet
+from toolbox.currency import Currency
+from toolbox.serialization import (from_bytes, from_dict, from_json, iter_from_bytes, to_bytes,
+                                   to_dict, to_json)
+
+def make_attack():
+    weapon = Weapon(WeaponType.LONGSWORD2H, 2, [Damage(1, Dice.D6, DamageType.FIRE),
+                                                 Damage(2, Dice.D8, DamageType.RADIANT)])
+    return WeaponAttack(weapon, 11, 18, False, -1)
+
+class SerializationTestCase(TestCase):
+    def assertAttackEqual(self, attack, expected):
+        self.assertEqual(to_dict(attack), to_dict(expected))
+        self.assertIsInstance(attack.weapon.extra_damage[0].die, Dice)
+        self.assertIs(attack.weapon.weapon_type, expected.weapon.weapon_type)
+
+    def test_currency(self):
+        currency = Currency(1, -2, 3, 4, 10 ** 12)
+        self.assertEqual(from_bytes(to_bytes(currency)), currency)
+        self.assertEqual(from_json(to_json(currency)), currency)
+        self.assertEqual(len(to_bytes(currency)), 41)
+
+    def test_weapon_attack(self):
+        attack = make_attack()
+        self.assertAttackEqual(from_bytes(to_bytes(attack)), attack)
+        self.assertAttackEqual(from_json(to_json(attack)), attack)
+        self.assertEqual(from_bytes(to_bytes(attack)).average_damage(15),
+                         attack.average_damage(15))
+
+    def test_off_hand_attack(self):
+        weapon = Weapon(WeaponType.SHORTSWORD, 0, [Damage(1, Dice.D4, DamageType.COLD)])
+        attack = WeaponAttack(weapon, 3, 16, off_hand=True)
+        self.assertAttackEqual(from_bytes(to_bytes(attack)), attack)
+        self.assertAttackEqual(from_json(to_json(attack)), attack)
+        self.assertTrue(from_bytes(to_bytes(attack)).off_hand)
+        # Data written before off-hand attacks existed still reads the same.
+        data = to_dict(make_attack())
+        del data['off_hand']
+        self.assertFalse(from_dict(data).off_hand)
+
+    def test_damage_and_weapon(self):
+        damage = Damage(3, Dice.D4, DamageType.COLD)
+        for value in (from_bytes(to_bytes(damage)), from_json(to_json(damage))):
+            self.assertEqual((value.num_dice, value.die, value.damage), (3, Dice.D4, DamageType.COLD))
+        weapon = Weapon(WeaponType.NET)
+        for value in (from_bytes(to_bytes(weapon)), from_json(to_json(weapon))):
+            self.assertEqual((value.weapon_type, value.bonus, value.extra_damage),
+                             (WeaponType.NET, 0, []))
+
+    def test_modifiers(self):
+        weapon = Weapon(WeaponType.MAUL, 1, [Damage(1, Dice.D8, DamageType.FIRE, 0, 2)], 2, 0,
+                        True)
+        for value in (from_bytes(to_bytes(weapon)), from_json(to_json(weapon))):
+            self.assertEqual(to_dict(value), to_dict(weapon))
+            self.assertAlmostEqual(value.average_damage(), weapon.average_damage())
+        self.assertNotIn('reroll', to_dict(Weapon(WeaponType.MAUL)))
+
+    def test_old_layout(self):
+        # Records written before the dice modifiers existed have upper case tags.
+        fire = struct.pack('<HBB', 1, 6, DamageType.FIRE.value)
+        radiant = struct.pack('<HBB', 2, 8, DamageType.RADIANT.value)
+        weapon = struct.pack('<BhB', WeaponType.LONGSWORD2H.value, 2, 2) + fire + radiant
+        attack = b'A' + struct.pack('<hh?h', 11, 18, False, -1) + weapon
+        self.assertAttackEqual(from_bytes(attack), make_attack())
+        self.assertEqual(to_dict(from_bytes(b'D' + fire)),
+                         to_dict(Damage(1, Dice.D6, DamageType.FIRE)))
+        values = list(iter_from_bytes(b'W' + weapon + attack + to_bytes(make_attack())))
+        self.assertEqual(to_dict(values[0]), to_dict(make_attack().weapon))
+        self.assertAttackEqual(values[1], make_attack())
+        self.assertAttackEqual(values[2], make_attack())
+
+    def test_ability_set(self):
+        abilities = AbilitySet(8, 14, 12, 17, 10, 3)
+        for value in (from_bytes(to_bytes(abilities)), from_json(to_json(abilities))):
+            self.assertEqual(vars(value), vars(abilities))
+        self.assertEqual(len(to_bytes(abilities)), 13)
+
+    def test_json_readable(self):
+        data = json.loads(to_json(make_attack()))
+        self.assertEqual(data['weapon']['weapon_type'], 'LONGSWORD2H')
+        self.assertEqual(data['weapon']['extra_damage'][1]['die'], 'D8')
+
+    def test_concatenated(self):
+        values = [Currency(1, 2, 3, 4, 5), make_attack(), AbilitySet()]
+        unpacked = list(iter_from_bytes(to_bytes(values)))
+        self.assertEqual(unpacked[0], values[0])
+        self.assertAttackEqual(unpacked[1], values[1])
+        self.assertEqual(vars(unpacked[2]), vars(values[2]))
+        self.assertRaises(ValueError, from_bytes, to_bytes(values))
+
+    def test_invalid(self):
+        self.assertRaises(TypeError, to_bytes, 5)
+        self.assertRaises(TypeError, to_bytes, 'C')
+        self.assertRaises(TypeError, to_dict, object())
+        self.assertRaises(ValueError, to_bytes, Damage(70000, Dice.D6, DamageType.FIRE))
+        self.assertRaises(ValueError, from_bytes, b'X')
+        self.assertRaises(ValueError, from_bytes, to_bytes(make_attack())[:-1])
+        self.assertRaises(ValueError, from_json, '[]')
+        self.assertRaises(ValueError, from_json, '{"type": "Damage", "num_dice": 1}')
+        self.assertRaises(ValueError, from_json, '{"type": "Spell"}')
@@ -0,0 +1,139 @@
+"""Test the implementation of the server.py module."""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from toolbox.server import RequestBatcher, ToolboxServer, run_batch
+
+async def request(port, method, path, body=b''):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n'
+                 'Connection: close\r\n\r\n'.encode() + body)
+    data = await reader.read()
+    writer.close()
+    head, _, payload = data.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+async def serve_requests(requests):
+    server = ToolboxServer(port=0, workers=0)
+    _, port = await server.start()
+    try:
+        return await asyncio.gather(*(request(port, *arguments) for arguments in requests))
+    finally:
+        await server.close()
+
+class RunBatchTestCase(TestCase):
+    def test_endpoints(self):
+        responses = run_batch([
+            ('/attack', {'weapon': 'Greatsword', 'level': 11, 'attack_stat': 20,
+                         'damage_mod': 2, 'target_acs': [15]}),
+            ('/split', {'currency': '1pp, 3gp', 'players': 3}),
+            ('/consolidate', {'currency': {'copper': 1234}, 'currencies': ['gp', 'sp']}),
+            ('/downtime', {'kind': 'skill', 'ability_score': 14}),
+            ('/downtime', {'kind': 'tool', 'proficiency_bonus': 3,
+                           'skills': [{'ability_score': 14, 'proficient': True},
+                                      {'ability_score': 10}]}),
+        ])
+        self.assertEqual([status for status, _ in responses], [200] * 5)
+        self.assertEqual(responses[0][1]['hit_bonus'], 9)
+        self.assertAlmostEqual(responses[0][1]['average_damage']['15'], 10.85)
+        self.assertEqual(responses[1][1]['shares'], ['4gp, 3sp, 4cp', '4gp, 3sp, 3cp',
+                                                     '4gp, 3sp, 3cp'])
+        self.assertEqual(responses[2][1]['currency'], '12gp, 3sp, 4cp')
+        self.assertEqual(responses[3][1], {'days': 18, 'expertise_days': 36})
+        self.assertEqual(responses[4][1], {'days': 20, 'expertise_days': 40})
+
+    def test_errors(self):
+        responses = run_batch([
+            ('/split', {'currency': '1gp', 'players': 0}),
+            ('/split', {'players': 2}),
+            ('/split', {'currency': '1gp', 'players': 3000000}),
+            ('/downtime', {'kind': 'tool', 'proficiency_bonus': 2, 'skills': [1]}),
+            ('/attack', {'weapon': 'spork', 'level': 1, 'attack_stat': 10}),
+            ('/missing', {}),
+            ('/consolidate', {'currency': '1gp'}),
+        ])
+        self.assertEqual([status for status, _ in responses], [400, 400, 400, 400, 400, 404, 200])
+        self.assertEqual(responses[1][1]['error'], "Missing field 'currency'.")
+        self.assertEqual(responses[2][1]['error'], 'players must be at most 20.')
+
+class ServerTestCase(TestCase):
+    def test_http(self):
+        responses = asyncio.run(serve_requests([
+            ('GET', '/health'),
+            ('POST', '/downtime', b'{"kind": "weapon", "ability_score": 15}'),
+            ('POST', '/downtime', b'not json'),
+            ('POST', '/downtime', b'[1]'),
+            ('GET', '/split'),
+            ('POST', '/nothing', b'{}'),
+        ]))
+        self.assertEqual(responses[0], (200, {'status': 'ok'}))
+        self.assertEqual(responses[1], (200, {'days': 17}))
+        self.assertEqual([status for status, _ in responses[2:]], [400, 400, 405, 404])
+
+    def test_keep_alive(self):
+        async def run():
+            server = ToolboxServer(port=0, workers=0)
+            _, port = await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            body = b'{"kind": "armor", "ability_score": 10}'
+            statuses = []
+            for _ in range(3):
+                writer.write(b'POST /downtime HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s'
+                             % (len(body), body))
+                statuses.append(int((await reader.readline()).split()[1]))
+                while (await reader.readline()) != b'\r\n':
+                    pass
+                await reader.readexactly(len(b'{"days": 25}'))
+            # The connection is still open and idle, which must not stop the server closing.
+            await asyncio.wait_for(server.close(), 3)
+            self.assertEqual(await reader.read(), b'')
+            writer.close()
+            return statuses
+        self.assertEqual(asyncio.run(run()), [200, 200, 200])
+
+    def test_idle_timeout(self):
+        async def run():
+            server = ToolboxServer(port=0, workers=0, idle_timeout=0.05)
+            _, port = await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            data = await asyncio.wait_for(reader.read(), 3)
+            writer.close()
+            await server.close()
+            return data
+        self.assertEqual(asyncio.run(run()), b'')
+
+    def test_cancelled_connection(self):
+        async def run():
+            server = ToolboxServer(port=0, workers=0)
+            _, port = await server.start()
+            connected = asyncio.Event()
+            handle_connection = server._handle_connection
+            tasks = []
+            async def handler(reader, writer):
+                tasks.append(asyncio.current_task())
+                connected.set()
+                await handle_connection(reader, writer)
+            server._server.close()
+            server._server = await asyncio.start_server(handler, '127.0.0.1', port)
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await asyncio.wait_for(connected.wait(), 3)
+            tasks[0].cancel()
+            await asyncio.gather(tasks[0], return_exceptions=True)
+            data = await asyncio.wait_for(reader.read(), 3)
+            writer.close()
+            await server.close()
+            return tasks[0].cancelled(), data
+        self.assertEqual(asyncio.run(run()), (True, b''))
+
+class RequestBatcherTestCase(TestCase):
+    def test_batches_concurrent_requests(self):
+        async def run(batcher):
+            payload = {'kind': 'armor', 'ability_score': 10}
+            return await asyncio.gather(*(batcher.submit('/downtime', payload)
+                                          for _ in range(10)))
+        with ThreadPoolExecutor(1) as executor:
+            batcher = RequestBatcher(executor, max_batch=4, max_delay=0.01)
+            responses = asyncio.run(run(batcher))
+        self.assertEqual(responses, [(200, {'days': 25})] * 10)
+        self.assertEqual((batcher.requests, batcher.batches), (10, 3))
@@ -0,0 +1,63 @@
+"""Test the implementation of the session.py module."""
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from toolbox.rules import apply_rule_pack, compile_rule_pack, default_rule_pack
+from toolbox.session import Session, load_session, save_session, session_fingerprint
+
+class SessionTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        session = Session({'-level-': '5', '-proficient-1': True, '-list-': ['a', 1]},
+                          {'-result-': '2x 1gp\n1x 9sp'}, {'screen': 1, 'damage_panels': [2, 0]})
+        save_session(self.path, session)
+        self.assertEqual(load_session(self.path), session)
+
+    def test_skips_unserializable_values(self):
+        save_session(self.path, Session({'-a-': object(), 0: 'menu', '-b-': 3}, {}, {}))
+        self.assertEqual(load_session(self.path).values, {'-b-': 3})
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(load_session(self.path))
+        with open(self.path, 'w') as file:
+            file.write('{not json')
+        self.assertIsNone(load_session(self.path))
+        with open(self.path, 'w') as file:
+            json.dump({'version': 0, 'values': {}, 'outputs': {}, 'layout': {}}, file)
+        self.assertIsNone(load_session(self.path))
+
+    def test_stale_outputs_dropped(self):
+        save_session(self.path, Session({'-a-': '1'}, {'-result-': '3 days.'}, {}))
+        with patch('toolbox.session.session_fingerprint', return_value='other'):
+            session = load_session(self.path)
+        self.assertEqual(session.values, {'-a-': '1'})
+        self.assertEqual(session.outputs, {})
+
+    def test_fingerprint_covers_rule_packs(self):
+        fingerprint = session_fingerprint()
+        try:
+            for data in ({'downtime': {'base_days': 100}}, {'skills': {'stealth': 'wisdom'}},
+                         {'tools': {'smith': {'name': 'Forge Tools'}}},
+                         {'weapons': {'dagger': {'damage': '1d6', 'type': 'piercing'}}}):
+                with self.subTest(data=data):
+                    apply_rule_pack(compile_rule_pack(data))
+                    self.assertNotEqual(session_fingerprint(), fingerprint)
+            apply_rule_pack(compile_rule_pack({'name': 'Renamed rules'}))
+            self.assertEqual(session_fingerprint(), fingerprint)
+        finally:
+            apply_rule_pack(default_rule_pack())
+
+    def test_failed_save_keeps_old_session(self):
+        save_session(self.path, Session({'-a-': '1'}, {}, {}))
+        with self.assertRaises(TypeError):
+            save_session(self.path, Session({}, {}, {'bad': object()}))
+        self.assertEqual(load_session(self.path).values, {'-a-': '1'})
+        self.assertEqual(os.listdir(self.directory.name), ['session.json'])
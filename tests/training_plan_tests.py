@@ -0,0 +1,104 @@
+"""Test the implementation of the training_plan.py module."""
+import time
+import unittest
+from itertools import permutations
+from unittest.mock import patch
+from toolbox.checks import Character
+from toolbox.common import Ability, AbilitySet, Skill, Tool
+from toolbox.downtime import tool_check_bonus, tool_training_days
+from toolbox.training_plan import GoalType, TrainingGoal, goal_days, plan_training
+
+SAGE = Character('Sage', AbilitySet(8, 12, 12, 18, 14, 10), 3, frozenset({Skill.ARCANA}))
+ARCANA_EXPERTISE = TrainingGoal(GoalType.SKILL, Skill.ARCANA, True)
+HISTORY = TrainingGoal(GoalType.SKILL, Skill.HISTORY)
+INVESTIGATION = TrainingGoal(GoalType.SKILL, Skill.INVESTIGATION)
+SMITH = TrainingGoal(GoalType.TOOL, Tool.SMITH)
+SMITH_EXPERTISE = TrainingGoal(GoalType.TOOL, Tool.SMITH, True)
+ELVISH = TrainingGoal(GoalType.LANGUAGE, name='Elvish')
+LONGSWORD = TrainingGoal(GoalType.WEAPON, Ability.STRENGTH, name='Longsword')
+
+class GoalDaysTestCase(unittest.TestCase):
+    def test_goal_days(self):
+        self.assertEqual(goal_days(SAGE, ELVISH), 250 // 12 + 1)
+        self.assertEqual(goal_days(SAGE, LONGSWORD), 250 // 8 + 1)
+        self.assertEqual(goal_days(SAGE, HISTORY), 14)
+        self.assertEqual(goal_days(SAGE, ARCANA_EXPERTISE), 28)
+        self.assertRaises(ValueError, goal_days, SAGE, TrainingGoal(GoalType.SKILL, Tool.SMITH))
+        self.assertRaises(ValueError, goal_days, SAGE, TrainingGoal(GoalType.LANGUAGE,
+                                                                    expertise=True))
+
+    def test_trained_skills_make_tools_cheaper(self):
+        # Smith's tools use arcana, history, and investigation, all with intelligence +4.
+        untrained = tool_training_days([tool_check_bonus(18, 3, True),
+                                        tool_check_bonus(18, 3, False),
+                                        tool_check_bonus(18, 3, False)])[0]
+        self.assertEqual(goal_days(SAGE, SMITH), untrained)
+        trained = goal_days(SAGE, SMITH, [HISTORY, INVESTIGATION, ARCANA_EXPERTISE])
+        self.assertEqual(trained, tool_training_days([4 + 6, 4 + 3, 4 + 3])[0])
+        self.assertLess(trained, untrained)
+
+class PlanTrainingTestCase(unittest.TestCase):
+    def brute_force(self, character, goals):
+        best = None
+        for order in permutations(goals):
+            if SMITH_EXPERTISE in order and order.index(SMITH_EXPERTISE) < order.index(SMITH):
+                continue
+            days = sum(goal_days(character, goal, order[:index])
+                       for index, goal in enumerate(order))
+            best = days if best is None else min(best, days)
+        return best
+
+    def test_matches_brute_force(self):
+        goals = [SMITH_EXPERTISE, SMITH, ELVISH, HISTORY, ARCANA_EXPERTISE, INVESTIGATION]
+        plan = plan_training(SAGE, goals)
+        self.assertEqual(plan.days, self.brute_force(SAGE, goals))
+        order = [step.goal for step in plan.steps]
+        self.assertCountEqual(order, goals)
+        self.assertLess(order.index(SMITH), order.index(SMITH_EXPERTISE))
+        # Elvish does not interact with the other goals, so it is trained last.
+        self.assertEqual(order[-1], ELVISH)
+        self.assertEqual([step.start_day for step in plan.steps],
+                         [sum(step.days for step in plan.steps[:index])
+                          for index in range(len(goals))])
+
+    def test_many_goals(self):
+        goals = [TrainingGoal(GoalType.TOOL, tool) for tool in list(Tool)[:6]]
+        goals += [TrainingGoal(GoalType.SKILL, skill) for skill in (Skill.HISTORY,
+                  Skill.INVESTIGATION, Skill.PERCEPTION, Skill.NATURE, Skill.MEDICINE,
+                  Skill.SURVIVAL)]
+        start = time.perf_counter()
+        plan = plan_training(SAGE, goals)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        # Skills never get more expensive, so training every skill first is optimal.
+        skills_first = goals[6:] + goals[:6]
+        self.assertEqual(plan.days, sum(goal_days(SAGE, goal, skills_first[:index])
+                                        for index, goal in enumerate(skills_first)))
+
+    def test_every_skill_and_tool(self):
+        skills = [TrainingGoal(GoalType.SKILL, skill) for skill in Skill
+                  if skill not in SAGE.proficiencies]
+        goals = [TrainingGoal(GoalType.TOOL, tool) for tool in Tool] + skills
+        start = time.perf_counter()
+        plan = plan_training(SAGE, goals)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        skills_first = skills + goals[:len(Tool)]
+        self.assertEqual(plan.days, sum(goal_days(SAGE, goal, skills_first[:index])
+                                        for index, goal in enumerate(skills_first)))
+
+    def test_dependency_order_matches_search(self):
+        goals = [SMITH_EXPERTISE, SMITH, ELVISH, HISTORY, ARCANA_EXPERTISE, INVESTIGATION]
+        with patch('toolbox.training_plan.MAX_EXACT_GOALS', 1):
+            plan = plan_training(SAGE, goals)
+        self.assertEqual(plan.days, plan_training(SAGE, goals).days)
+        order = [step.goal for step in plan.steps]
+        self.assertLess(order.index(SMITH), order.index(SMITH_EXPERTISE))
+
+    def test_invalid_plans(self):
+        self.assertRaises(ValueError, plan_training, SAGE, [SMITH_EXPERTISE])
+        self.assertRaises(ValueError, plan_training, SAGE, [HISTORY, HISTORY])
+        self.assertRaises(ValueError, plan_training, SAGE,
+                          [TrainingGoal(GoalType.SKILL, Skill.ARCANA)])
+        self.assertEqual(plan_training(SAGE, []).days, 0)
+
+if __name__ == '__main__':
+    unittest.main()
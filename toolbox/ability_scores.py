@@ -0,0 +1,258 @@
+"""Compare methods of generating ability scores in Dungeons & Dragons 5th edition.
+
+Rolled methods roll each of the six scores with the same dice expression, such as "4d6kh3" for
+4d6 drop lowest. Their statistics are exact fractions calculated from the distribution of one
+score, so no ability sets are enumerated or sampled. Point buy and the standard array are fixed
+sets of scores to compare the rolled methods against.
+
+Classes:
+    RolledScores: Exact statistics of six ability scores rolled with a dice expression.
+
+Functions:
+    modifier: Return the ability modifier of a score.
+    point_buy_cost: Return the point buy cost of a set of scores.
+    point_buy_arrays: Return every set of scores that spends a point buy budget.
+    sample_ability_scores: Roll many sets of ability scores into a flat array.
+    iter_ability_sets: Iterate over the sampled sets of ability scores as AbilitySet objects.
+"""
+from __future__ import annotations, absolute_import
+import random
+from array import array
+from fractions import Fraction
+from math import factorial, floor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+try:
+    from .common import AbilitySet
+    from .dice import parse
+except ImportError:
+    from common import AbilitySet
+    from dice import parse
+
+ABILITY_COUNT = 6
+ROLLED_METHODS = {
+    '4d6 drop lowest': '4d6kh3',
+    '3d6': '3d6',
+    '4d6 drop lowest, reroll 1s': '4d6r1kh3',
+}
+STANDARD_ARRAY = (15, 14, 13, 12, 10, 8)
+POINT_BUY_BUDGET = 27
+POINT_BUY_COSTS = {8: 0, 9: 1, 10: 2, 11: 3, 12: 4, 13: 5, 14: 7, 15: 9}
+
+class RolledScores():
+    """Represents exact statistics of six ability scores rolled with a dice expression.
+
+    Every distribution is a dict of value to probability in increasing order of value.
+
+    Attributes:
+        expression: The dice expression rolled for each score.
+
+    Methods:
+        score_distribution: Return the distribution of a single score.
+        order_statistic: Return the distribution of the score with a given rank.
+        highest_distribution: Return the distribution of the highest score.
+        lowest_distribution: Return the distribution of the lowest score.
+        total_distribution: Return the distribution of the sum of the scores.
+        modifier_total_distribution: Return the distribution of the sum of the modifiers.
+        probability_beats: Return the chance that the modifiers sum to more than a fixed set's.
+    """
+    def __init__(self, expression: str) -> None:
+        """Initializes the RolledScores.
+
+        Args:
+            expression (str): The dice expression rolled for each score, such as "4d6kh3".
+
+        Raises:
+            ValueError: The expression is invalid.
+        """
+        self.expression = expression
+        self._score = parse(expression).distribution()
+        self._totals = None
+        self._modifier_totals = None
+
+    def score_distribution(self) -> Dict[int, Fraction]:
+        """Return the distribution of a single score.
+
+        Returns:
+            Dict[int, Fraction]: The probability of each score.
+        """
+        return dict(self._score)
+
+    def order_statistic(self, rank: int) -> Dict[int, Fraction]:
+        """Return the distribution of the score with a given rank.
+
+        Args:
+            rank (int): The rank of the score, from 1 for the highest to 6 for the lowest.
+
+        Raises:
+            ValueError: The rank is not between 1 and 6.
+
+        Returns:
+            Dict[int, Fraction]: The probability of each value of the ranked score.
+        """
+        if not 1 <= rank <= ABILITY_COUNT:
+            raise ValueError(f'Rank must be between 1 and {ABILITY_COUNT}.')
+        distribution = {}
+        below = Fraction(0)
+        previous = Fraction(0)
+        for score, probability in self._score.items():
+            below += probability
+            # The ranked score is at most this score if fewer than rank scores are above it.
+            at_most = sum(_binomial(ABILITY_COUNT, above) * (1 - below) ** above
+                          * below ** (ABILITY_COUNT - above) for above in range(rank))
+            distribution[score] = at_most - previous
+            previous = at_most
+        return distribution
+
+    def highest_distribution(self) -> Dict[int, Fraction]:
+        """Return the distribution of the highest score.
+
+        Returns:
+            Dict[int, Fraction]: The probability of each value of the highest score.
+        """
+        return self.order_statistic(1)
+
+    def lowest_distribution(self) -> Dict[int, Fraction]:
+        """Return the distribution of the lowest score.
+
+        Returns:
+            Dict[int, Fraction]: The probability of each value of the lowest score.
+        """
+        return self.order_statistic(ABILITY_COUNT)
+
+    def total_distribution(self) -> Dict[int, Fraction]:
+        """Return the distribution of the sum of the six scores.
+
+        Returns:
+            Dict[int, Fraction]: The probability of each total.
+        """
+        if self._totals is None:
+            self._totals = _sum_distribution(self._score, ABILITY_COUNT)
+        return dict(self._totals)
+
+    def modifier_total_distribution(self) -> Dict[int, Fraction]:
+        """Return the distribution of the sum of the six ability modifiers.
+
+        Returns:
+            Dict[int, Fraction]: The probability of each total modifier.
+        """
+        if self._modifier_totals is None:
+            modifiers = {}
+            for score, probability in self._score.items():
+                modifiers[modifier(score)] = modifiers.get(modifier(score), 0) + probability
+            self._modifier_totals = _sum_distribution(modifiers, ABILITY_COUNT)
+        return dict(self._modifier_totals)
+
+    def probability_beats(self, scores: Iterable[int]) -> Fraction:
+        """Return the chance that the rolled modifiers sum to more than those of fixed scores.
+
+        Args:
+            scores (Iterable[int]): The fixed scores, such as STANDARD_ARRAY or a point buy.
+
+        Returns:
+            Fraction: The probability that the rolled total modifier is higher.
+        """
+        target = sum(modifier(score) for score in scores)
+        return sum((probability for total, probability
+                    in self.modifier_total_distribution().items() if total > target), Fraction(0))
+
+def modifier(score: int) -> int:
+    """Return the ability modifier of a score.
+
+    Args:
+        score (int): The ability score.
+
+    Returns:
+        int: floor((score - 10) / 2).
+    """
+    return floor((score - 10) / 2)
+
+def point_buy_cost(scores: Iterable[int]) -> int:
+    """Return the point buy cost of a set of scores.
+
+    Args:
+        scores (Iterable[int]): The ability scores, before racial bonuses.
+
+    Raises:
+        ValueError: A score is not between 8 and 15.
+
+    Returns:
+        int: The points spent on the scores.
+    """
+    try:
+        return sum(POINT_BUY_COSTS[score] for score in scores)
+    except KeyError as error:
+        raise ValueError(f'Point buy scores must be between 8 and 15, not {error}.') from None
+
+def point_buy_arrays(budget: int = POINT_BUY_BUDGET) -> List[Tuple[int, ...]]:
+    """Return every set of scores that spends a point buy budget exactly.
+
+    Args:
+        budget (int, optional): The number of points. Defaults to POINT_BUY_BUDGET.
+
+    Returns:
+        List[Tuple[int, ...]]: Each set of scores in decreasing order, from the highest set.
+    """
+    arrays = []
+    def add_scores(scores: Tuple[int, ...], remaining: int) -> None:
+        if len(scores) == ABILITY_COUNT:
+            if remaining == 0:
+                arrays.append(scores)
+            return
+        for score in sorted(POINT_BUY_COSTS, reverse=True):
+            if score <= (scores[-1] if scores else score) and POINT_BUY_COSTS[score] <= remaining:
+                add_scores(scores + (score,), remaining - POINT_BUY_COSTS[score])
+    add_scores((), budget)
+    return arrays
+
+def sample_ability_scores(expression: str, count: int,
+                          rng: Optional[random.Random] = None) -> array:
+    """Roll many sets of ability scores into a flat array.
+
+    The scores are drawn from the compiled distribution of the expression and stored as signed
+    bytes, so millions of sets take 6 bytes each and no Python object per set.
+
+    Args:
+        expression (str): The dice expression rolled for each score, such as "4d6kh3".
+        count (int): The number of sets of scores.
+        rng (Optional[random.Random], optional): The random number generator to use. Defaults
+            to the random module.
+
+    Raises:
+        ValueError: The expression is invalid or can roll a score outside -128 to 127.
+
+    Returns:
+        array: The scores as a row-major (count, 6) table: set i is at [6 * i:6 * i + 6], in
+        the order of the AbilitySet arguments.
+    """
+    dice = parse(expression)
+    if dice.minimum() < -128 or dice.maximum() > 127:
+        raise ValueError(f"Scores rolled with '{expression}' do not fit in a byte.")
+    return array('b', dice.sample(count * ABILITY_COUNT, rng))
+
+def iter_ability_sets(samples: array) -> Iterator[AbilitySet]:
+    """Iterate over the sampled sets of ability scores as AbilitySet objects.
+
+    Args:
+        samples (array): Scores as returned by sample_ability_scores().
+
+    Yields:
+        AbilitySet: Each set of scores in order.
+    """
+    for start in range(0, len(samples) - ABILITY_COUNT + 1, ABILITY_COUNT):
+        yield AbilitySet(*samples[start:start + ABILITY_COUNT])
+
+def _sum_distribution(distribution: Dict[int, Fraction], count: int) -> Dict[int, Fraction]:
+    """Return the distribution of the sum of independent values with the same distribution."""
+    totals = {0: Fraction(1)}
+    for _ in range(count):
+        next_totals = {}
+        for total, total_probability in totals.items():
+            for value, probability in distribution.items():
+                next_totals[total + value] = (next_totals.get(total + value, 0)
+                                              + total_probability * probability)
+        totals = next_totals
+    return dict(sorted(totals.items()))
+
+def _binomial(total: int, chosen: int) -> int:
+    """Return the number of ways to choose items from a total."""
+    return factorial(total) // (factorial(chosen) * factorial(total - chosen))
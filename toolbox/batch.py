@@ -0,0 +1,410 @@
+"""Calculate damage per round reports for many characters at once.
+
+Character and weapon definitions are streamed from a CSV or JSON Lines file, parsed and evaluated
+in fixed-size chunks, and written to the report as each chunk finishes, so memory use does not
+grow with the size of the input.
+
+Each input row describes one attack with the fields:
+    name: The name of the character. Required.
+    weapon: The weapon type, e.g. "Longsword" or "Longsword (2 hands)". Required.
+    level: The level of the character. Required.
+    attack_stat: The ability score used for the attack. Required, unless strength or dexterity
+        is given.
+    strength, dexterity: The ability scores to pick the best attack ability of the weapon from
+        when attack_stat is empty. Each defaults to 10.
+    proficient: If the character is proficient with the weapon. Defaults to true.
+    off_hand: If the attack is the off-hand attack of two-weapon fighting, with a light weapon.
+        Defaults to false.
+    bonus: The magical bonus of the weapon. Defaults to 0.
+    damage_mod: An additional bonus to damage. Defaults to 0.
+    extra_damage: Extra damage dice separated by semicolons, e.g. "1d6 fire; 2d8 radiant".
+        Defaults to none.
+
+Functions:
+    parse_damage: Parse extra damage dice.
+    parse_attack: Create a WeaponAttack from an input row.
+    parse_ac_range: Parse a range of ACs.
+    parse_int: Parse an integer field of an input row.
+    parse_bool: Parse a boolean field of an input row.
+    guess_format: Return the format of a file from its extension.
+    read_rows: Iterate over the rows of an input file.
+    evaluate: Iterate over the average damage of each row against several ACs.
+    write_report: Write a damage per round report.
+    main: Run the batch report from the command line.
+"""
+from __future__ import annotations, absolute_import
+import argparse
+import csv
+import json
+import re
+import sys
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+try:
+    from .cache import ResultCache
+    from .combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+    from .common import AbilitySet
+    from .rules import use_rule_pack
+except ImportError:
+    from cache import ResultCache
+    from combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+    from common import AbilitySet
+    from rules import use_rule_pack
+
+DEFAULT_CHUNK_SIZE = 256
+
+_DAMAGE_PATTERN = re.compile(r'^(\d+)\s*d\s*(\d+)\s+([a-z]+)$', re.IGNORECASE)
+_TRUE_VALUES = ('1', 'true', 'yes', 'y')
+_FALSE_VALUES = ('0', 'false', 'no', 'n')
+
+def parse_damage(text: Any) -> List[Damage]:
+    """Parse extra damage dice.
+
+    Args:
+        text (Any): Damage dice like "2d6 fire", separated by semicolons, or a list of them.
+            An empty value or None means no extra damage.
+
+    Raises:
+        ValueError: The dice, die type, or damage type is invalid.
+
+    Returns:
+        List[Damage]: A Damage object for each entry.
+    """
+    if not text:
+        return []
+    entries = text if isinstance(text, list) else str(text).split(';')
+    damages = []
+    for entry in entries:
+        entry = str(entry).strip()
+        if not entry:
+            continue
+        match = _DAMAGE_PATTERN.match(entry)
+        if match is None:
+            raise ValueError(f"Invalid damage '{entry}'.")
+        num_dice, die, damage_type = match.groups()
+        if int(die) not in Dice.__members__.values():
+            raise ValueError(f"Invalid die 'd{die}'.")
+        if damage_type.upper() not in DamageType.__members__:
+            raise ValueError(f"Invalid damage type '{damage_type}'.")
+        damages.append(Damage(int(num_dice), Dice(int(die)), DamageType[damage_type.upper()]))
+    return damages
+
+def parse_attack(row: Dict[str, Any]) -> Tuple[str, WeaponAttack]:
+    """Create a WeaponAttack from an input row.
+
+    Args:
+        row (Dict[str, Any]): The fields of the row, as described in the module documentation.
+
+    Raises:
+        ValueError: A required field is missing or a field is invalid.
+
+    Returns:
+        Tuple[str, WeaponAttack]: The name of the character and their attack.
+    """
+    for field in ('name', 'weapon', 'level'):
+        if row.get(field) in (None, ''):
+            raise ValueError(f"Missing field '{field}'.")
+    if all(row.get(field) in (None, '') for field in ('attack_stat', 'strength', 'dexterity')):
+        raise ValueError("Missing field 'attack_stat'.")
+    weapon_name = str(row['weapon']).strip()
+    member = weapon_name.upper().replace(' (2 HANDS)', '2H').replace(' ', '_')
+    if member not in WeaponType.__members__:
+        raise ValueError(f"Invalid weapon '{weapon_name}'.")
+    weapon = Weapon(WeaponType[member], parse_int(row, 'bonus', 0),
+                    parse_damage(row.get('extra_damage')))
+    level = parse_int(row, 'level')
+    proficient = parse_bool(row, 'proficient', True)
+    damage_mod = parse_int(row, 'damage_mod', 0)
+    off_hand = parse_bool(row, 'off_hand', False)
+    if row.get('attack_stat') in (None, ''):
+        abilities = AbilitySet(strength=parse_int(row, 'strength', 10),
+                               dexterity=parse_int(row, 'dexterity', 10))
+        attack = WeaponAttack.from_abilities(weapon, level, abilities, proficient, damage_mod,
+                                             off_hand)
+    else:
+        attack = WeaponAttack(weapon, level, parse_int(row, 'attack_stat'), proficient,
+                              damage_mod, off_hand)
+    return str(row['name']), attack
+
+def parse_ac_range(text: str) -> List[int]:
+    """Parse a range of ACs.
+
+    Args:
+        text (str): Comma separated ACs or inclusive ranges, e.g. "10-20" or "12,15,18-20".
+
+    Raises:
+        ValueError: The text is not a valid range.
+
+    Returns:
+        List[int]: The ACs in the order given.
+    """
+    target_acs = []
+    for part in text.split(','):
+        first, _, last = part.strip().partition('-')
+        try:
+            start = int(first)
+            stop = int(last) if last else start
+        except ValueError:
+            raise ValueError(f"Invalid AC range '{text}'.") from None
+        if stop < start:
+            raise ValueError(f"Invalid AC range '{text}'.")
+        target_acs.extend(range(start, stop + 1))
+    return target_acs
+
+def parse_int(row: Dict[str, Any], field: str, default: Optional[int] = None) -> int:
+    """Parse an integer field of an input row.
+
+    Args:
+        row (Dict[str, Any]): The fields of the row.
+        field (str): The name of the field.
+        default (Optional[int], optional): The value of a missing or empty field. Defaults to
+            None.
+
+    Raises:
+        ValueError: The field is not an integer.
+
+    Returns:
+        int: The value of the field.
+    """
+    value = row.get(field)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field} '{value}'.") from None
+
+def parse_bool(row: Dict[str, Any], field: str, default: bool) -> bool:
+    """Parse a boolean field of an input row, such as "true", "no" or "1".
+
+    Args:
+        row (Dict[str, Any]): The fields of the row.
+        field (str): The name of the field.
+        default (bool): The value of a missing or empty field.
+
+    Raises:
+        ValueError: The field is not a boolean.
+
+    Returns:
+        bool: The value of the field.
+    """
+    value = row.get(field)
+    if value in (None, ''):
+        return default
+    if isinstance(value, bool):
+        return value
+    if str(value).strip().lower() in _TRUE_VALUES:
+        return True
+    if str(value).strip().lower() in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid {field} '{value}'.")
+
+def guess_format(path: str) -> str:
+    """Return the format of a file from its extension.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        str: 'jsonl' for a .jsonl, .json or .ndjson file, otherwise 'csv'.
+    """
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.json', '.ndjson')) else 'csv'
+
+def read_rows(file: TextIO, file_format: str = 'csv') -> Iterator[Dict[str, Any]]:
+    """Iterate over the rows of an input file without reading the whole file.
+
+    Args:
+        file (TextIO): The file to read.
+        file_format (str, optional): 'csv' for a CSV file with a header row, or 'jsonl' for a
+            JSON object on each line. Defaults to 'csv'.
+
+    Raises:
+        ValueError: The format is unknown, or a line of a JSON Lines file is not an object.
+
+    Yields:
+        Dict[str, Any]: The fields of each row.
+    """
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+    elif file_format == 'jsonl':
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(f'Line {line_number} is not a JSON object.')
+            yield row
+    else:
+        raise ValueError(f"Unknown format '{file_format}'.")
+
+def evaluate(rows: Iterable[Dict[str, Any]], target_acs: List[int],
+             chunk_size: int = DEFAULT_CHUNK_SIZE, cache: Optional[ResultCache] = None
+             ) -> Iterator[Tuple[str, WeaponAttack, List[float]]]:
+    """Iterate over the average damage of each row against several ACs.
+
+    Rows are parsed and evaluated a chunk at a time.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): The input rows.
+        target_acs (List[int]): The ACs to evaluate against.
+        chunk_size (int, optional): The number of rows in each chunk. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        cache (Optional[ResultCache], optional): If given, results are read from and stored
+            in the cache. Defaults to None.
+
+    Raises:
+        ValueError: A row is invalid. The message includes the number of the row.
+
+    Yields:
+        Tuple[str, WeaponAttack, List[float]]: The name, attack, and average damage against each
+        AC of each row.
+    """
+    rows = iter(rows)
+    row_number = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        attacks = []
+        for row in chunk:
+            row_number += 1
+            try:
+                attacks.append(parse_attack(row))
+            except ValueError as error:
+                raise ValueError(f'Row {row_number}: {error}') from None
+        if cache is None:
+            yield from [(name, attack, attack.average_damages(target_acs))
+                        for name, attack in attacks]
+        else:
+            yield from [(name, attack, cache.average_damages(attack, target_acs))
+                        for name, attack in attacks]
+
+def write_report(source: TextIO, destination: TextIO, target_acs: List[int],
+                 input_format: str = 'csv', output_format: str = 'csv',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, cache: Optional[ResultCache] = None
+                 ) -> int:
+    """Write a damage per round report in a single pass over the input.
+
+    Args:
+        source (TextIO): The input file.
+        destination (TextIO): The file to write the report to.
+        target_acs (List[int]): The ACs to evaluate against.
+        input_format (str, optional): The format of the input, 'csv' or 'jsonl'. Defaults to
+            'csv'.
+        output_format (str, optional): The format of the report, 'csv' or 'jsonl'. Defaults to
+            'csv'.
+        chunk_size (int, optional): The number of rows evaluated at a time. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        cache (Optional[ResultCache], optional): If given, results are read from and stored
+            in the cache. Defaults to None.
+
+    Raises:
+        ValueError: A format is unknown or a row is invalid.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if output_format not in ('csv', 'jsonl'):
+        raise ValueError(f"Unknown format '{output_format}'.")
+    fields = (['name', 'weapon', 'level', 'hit_bonus', 'hit_damage']
+              + [f'ac_{target_ac}' for target_ac in target_acs])
+    writer = None
+    if output_format == 'csv':
+        writer = csv.writer(destination)
+        writer.writerow(fields)
+    count = 0
+    results = evaluate(read_rows(source, input_format), target_acs, chunk_size, cache)
+    while True:
+        chunk = list(islice(results, chunk_size))
+        if not chunk:
+            return count
+        records = [[name, WeaponType.get_display_name(attack.weapon.weapon_type), attack.level,
+                    attack.hit_bonus, round(attack.average_hit_damage(), 3)]
+                   + [round(damage, 3) for damage in damages]
+                   for name, attack, damages in chunk]
+        if writer is not None:
+            writer.writerows(records)
+        else:
+            destination.writelines(json.dumps(dict(zip(fields, record))) + '\n'
+                                   for record in records)
+        count += len(records)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the batch report from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments. Defaults to
+            sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description='Write a damage per round report for the '
+                                     'characters in a CSV or JSON Lines file.')
+    parser.add_argument('input', help='the input file, or - for standard input')
+    parser.add_argument('-o', '--output', default='-',
+                        help='the report file, or - for standard output (default)')
+    parser.add_argument('--ac', default='10-20', help='the target ACs (default 10-20)')
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'],
+                        help='the input format (default: from the file extension)')
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'],
+                        help='the report format (default: from the file extension)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'rows evaluated at a time (default {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--cache', metavar='FILE',
+                        help='reuse results stored in this cache database between runs')
+    parser.add_argument('--cache-size', type=int, default=10000,
+                        help='the number of results kept in the cache (default 10000)')
+    parser.add_argument('--rules', metavar='FILE',
+                        help='use the weapons of a JSON or TOML rule pack')
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if args.cache_size < 1:
+        parser.error('--cache-size must be at least 1')
+    try:
+        target_acs = parse_ac_range(args.ac)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.rules:
+        try:
+            use_rule_pack(args.rules)
+        except (OSError, ValueError) as error:
+            parser.error(f'cannot use rule pack: {error}')
+    input_format = args.input_format or guess_format(args.input)
+    output_format = args.output_format or guess_format(args.output)
+    try:
+        source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    except OSError as error:
+        parser.error(f'cannot open input: {error}')
+    cache = ResultCache(args.cache, args.cache_size) if args.cache else None
+    try:
+        try:
+            destination = (sys.stdout if args.output == '-'
+                           else open(args.output, 'w', newline=''))
+        except OSError as error:
+            parser.error(f'cannot open output: {error}')
+        try:
+            count = write_report(source, destination, target_acs, input_format, output_format,
+                                 args.chunk_size, cache)
+        finally:
+            if destination is not sys.stdout:
+                destination.close()
+    except ValueError as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if cache is not None:
+            cache.close()
+    print(f'Wrote {count} rows.', file=sys.stderr)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions.",
+              file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
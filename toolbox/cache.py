@@ -0,0 +1,299 @@
+"""Store the results of combat and currency calculations in an on-disk cache.
+
+Results are stored in an SQLite database, keyed on a hash of a canonical form of the inputs. The
+canonical form of every key includes a fingerprint of the weapon rules in Weapon._weapon_map, so
+cached results are not reused after the rules change. The cache is opt-in: nothing is cached
+unless a ResultCache is created and passed to the code doing the calculation.
+
+Classes:
+    ResultCache: A size-capped, least recently used cache of calculation results.
+
+Functions:
+    canonical: Return a canonical form of a calculation input.
+    make_key: Return the cache key of a calculation.
+    rules_fingerprint: Return a fingerprint of the weapon rules.
+"""
+from __future__ import annotations, absolute_import
+import hashlib
+import json
+import sqlite3
+from enum import Enum
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List
+try:
+    from .combat import Damage, Weapon, WeaponAttack
+    from .currency import Currency, CurrencyOptions
+except ImportError:
+    from combat import Damage, Weapon, WeaponAttack
+    from currency import Currency, CurrencyOptions
+
+_SCHEMA_VERSION = 1
+_MISSING = object()
+
+def canonical(value: Any) -> Any:
+    """Return a canonical form of a calculation input.
+
+    Equal inputs have equal canonical forms, and the canonical form can be serialized as JSON.
+
+    Args:
+        value (Any): A Currency, CurrencyOptions, Damage, Weapon, WeaponAttack, enum member,
+            number, string, None, or a list or tuple of them.
+
+    Raises:
+        TypeError: The value has no canonical form.
+
+    Returns:
+        Any: The canonical form.
+    """
+    if isinstance(value, Currency):
+        return ['Currency', list(value.key())]
+    if isinstance(value, CurrencyOptions):
+        return ['CurrencyOptions', value.value]
+    if isinstance(value, Damage):
+        return (['Damage', value.num_dice, int(value.die), value.damage.name]
+                + _canonical_modifiers(value))
+    if isinstance(value, Weapon):
+        return (['Weapon', value.weapon_type.name, value.bonus,
+                 [canonical(damage) for damage in value.extra_damage]]
+                + _canonical_modifiers(value))
+    if isinstance(value, WeaponAttack):
+        return ['WeaponAttack', canonical(value.weapon), value.level, value.attack_stat,
+                bool(value.proficient), value.damage_mod, bool(value.off_hand)]
+    if isinstance(value, Enum):
+        return [type(value).__name__, value.name]
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f'Cannot cache values of type {type(value).__name__}.')
+
+def rules_fingerprint() -> str:
+    """Return a fingerprint of the weapon rules.
+
+    The fingerprint is calculated once and kept until Weapon.set_weapon_map() replaces the rules.
+
+    Returns:
+        str: A hash of the base damage of every weapon type in Weapon._weapon_map.
+    """
+    # pylint: disable=protected-access
+    if Weapon._weapon_map_fingerprint is None:
+        rules = sorted([weapon_type.name, canonical(damage)]
+                       for weapon_type, damage in Weapon._weapon_map.items())
+        Weapon._weapon_map_fingerprint = hashlib.sha256(json.dumps(rules).encode()).hexdigest()
+    return Weapon._weapon_map_fingerprint
+
+def make_key(namespace: str, *inputs: Any) -> str:
+    """Return the cache key of a calculation.
+
+    Args:
+        namespace (str): The name of the calculation.
+        *inputs (Any): The inputs of the calculation. See canonical() for the supported types.
+
+    Returns:
+        str: A hash of the namespace, inputs, and weapon rules.
+    """
+    text = json.dumps([_SCHEMA_VERSION, rules_fingerprint(), namespace, canonical(list(inputs))],
+                      separators=(',', ':'))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+class ResultCache():
+    """Represents a size-capped, least recently used cache of calculation results on disk.
+
+    Values are stored as JSON. The cache can be shared between threads.
+
+    Methods:
+        get: Return a cached value.
+        put: Store a value.
+        get_or_compute: Return a cached value, calculating and storing it if needed.
+        average_damages: Return the average damage of an attack against several ACs.
+        split: Return a split of a Currency.
+        consolidate: Return a consolidated copy of a Currency.
+        stats: Return the hit statistics of the cache.
+        clear: Remove every value from the cache.
+        close: Close the database.
+    """
+    def __init__(self, path: str, max_entries: int = 10000) -> None:
+        """Initializes the ResultCache, creating the database if it does not exist.
+
+        Args:
+            path (str): The path of the database file, or ':memory:' for a temporary cache.
+            max_entries (int, optional): The number of values kept. When the cache is full, the
+                least recently used value is removed. Defaults to 10000.
+
+        Raises:
+            ValueError: max_entries is less than 1.
+        """
+        if max_entries < 1:
+            raise ValueError('Cache must hold at least 1 entry.')
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS results '
+                                     '(key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                                     'used INTEGER NOT NULL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+        self._entries, last_used = self._connection.execute(
+            'SELECT COUNT(*), COALESCE(MAX(used), 0) FROM results').fetchone()
+        self._clock = last_used
+
+    def __enter__(self) -> ResultCache:
+        """Return the ResultCache for use in a with block."""
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Close the database at the end of a with block."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of cached values."""
+        return self._entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a cached value and mark it as recently used.
+
+        Args:
+            key (str): The key of the value, as returned by make_key().
+            default (Any, optional): Returned if the key is not cached. Defaults to None.
+
+        Returns:
+            Any: The cached value, or the default.
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT value FROM results WHERE key = ?',
+                                           (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._clock += 1
+            with self._connection:
+                self._connection.execute('UPDATE results SET used = ? WHERE key = ?',
+                                         (self._clock, key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, removing the least recently used values if the cache is full.
+
+        Args:
+            key (str): The key of the value, as returned by make_key().
+            value (Any): The value. Must be serializable as JSON.
+        """
+        text = json.dumps(value)
+        with self._lock, self._connection:
+            self._clock += 1
+            cursor = self._connection.execute('UPDATE results SET value = ?, used = ? '
+                                              'WHERE key = ?', (text, self._clock, key))
+            if cursor.rowcount:
+                return
+            self._connection.execute('INSERT INTO results (key, value, used) VALUES (?, ?, ?)',
+                                     (key, text, self._clock))
+            self._entries += 1
+            excess = self._entries - self.max_entries
+            if excess > 0:
+                self._connection.execute('DELETE FROM results WHERE key IN (SELECT key FROM '
+                                         'results ORDER BY used LIMIT ?)', (excess,))
+                self._entries -= excess
+                self.evictions += excess
+
+    def get_or_compute(self, namespace: str, inputs: Iterable[Any],
+                       function: Callable[..., Any]) -> Any:
+        """Return a cached value, calculating and storing it if needed.
+
+        Args:
+            namespace (str): The name of the calculation.
+            inputs (Iterable[Any]): The inputs of the calculation, passed to the function.
+            function (Callable[..., Any]): Calculates the value. Must return a value that can be
+                serialized as JSON.
+
+        Returns:
+            Any: The value, as decoded from JSON.
+        """
+        inputs = list(inputs)
+        key = make_key(namespace, *inputs)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = json.loads(json.dumps(function(*inputs)))
+            self.put(key, value)
+        return value
+
+    def average_damages(self, attack: WeaponAttack, target_acs: Iterable[int]) -> List[float]:
+        """Return the average damage of an attack against several ACs.
+
+        Args:
+            attack (WeaponAttack): The attack.
+            target_acs (Iterable[int]): The ACs of the targets.
+
+        Returns:
+            List[float]: The results of the WeaponAttack.average_damages() method.
+        """
+        return self.get_or_compute('WeaponAttack.average_damages', (attack, list(target_acs)),
+                                   WeaponAttack.average_damages)
+
+    def split(self, currency: Currency, players: int, consolidate: bool = True,
+              consolidate_currencies: CurrencyOptions = CurrencyOptions.COMMON
+              ) -> List[Currency]:
+        """Return a split of a Currency.
+
+        Args:
+            currency (Currency): The Currency to split.
+            players (int): The number of players to split the Currency among.
+            consolidate (bool, optional): If True, the shares are consolidated. Defaults to True.
+            consolidate_currencies (CurrencyOptions, optional): The coins to use when
+                consolidating. Defaults to CurrencyOptions.COMMON.
+
+        Returns:
+            List[Currency]: The shares, as with the Currency.split() method.
+        """
+        keys = self.get_or_compute(
+            'Currency.split', (currency, players, consolidate, consolidate_currencies),
+            lambda currency, *options: [share.key() for share in currency.split(*options)])
+        return [Currency(*key) for key in keys]
+
+    def consolidate(self, currency: Currency,
+                    currencies: CurrencyOptions = CurrencyOptions.COMMON) -> Currency:
+        """Return a consolidated copy of a Currency.
+
+        Args:
+            currency (Currency): The Currency to consolidate.
+            currencies (CurrencyOptions, optional): The coins to use when consolidating.
+                Defaults to CurrencyOptions.COMMON.
+
+        Returns:
+            Currency: The result of the Currency.consolidate() method.
+        """
+        key = self.get_or_compute('Currency.consolidate', (currency, currencies),
+                                  lambda currency, options: currency.consolidate(options).key())
+        return Currency(*key)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the hit statistics of the cache since it was opened.
+
+        Returns:
+            Dict[str, float]: The hits, misses, hit_rate, evictions, and entries of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions, 'entries': self._entries}
+
+    def clear(self) -> None:
+        """Remove every value from the cache."""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM results')
+            self._entries = 0
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+def _canonical_modifiers(value: Any) -> List[Any]:
+    """Return the dice modifiers of a Damage or Weapon, or nothing if it has none."""
+    if not (value.reroll or value.minimum or value.best_of_two):
+        return []
+    return [['modifiers', value.reroll, value.minimum, bool(value.best_of_two)]]
@@ -0,0 +1,200 @@
+"""Calculate the chances of passing ability checks in Dungeons & Dragons 5th edition.
+
+A check succeeds if a d20 plus the check bonus meets or beats the DC. Natural 1s and 20s have no
+special effect on ability checks. Success chances are looked up in d20 tables calculated once
+for each RollMode, with and without guidance (+1d4), so a table for a whole party costs one
+lookup per character, check, and DC.
+
+Tool checks use the best ability of the skills related to the tool, and the proficiency bonus
+if the character is proficient with the tool.
+
+Classes:
+    RollMode: Enumeration of the ways to roll the d20.
+    Character: A character's ability scores and proficiencies.
+    CheckTable: The chance of each character passing each check at each DC.
+
+Functions:
+    check_bonus: Return a character's bonus to a check.
+    success_chance: Return the chance of passing a check.
+    check_table: Calculate the chance of each character passing each check at each DC.
+"""
+from __future__ import annotations, absolute_import
+from enum import Enum, auto
+from fractions import Fraction
+from typing import Dict, FrozenSet, List, NamedTuple, Sequence, Tuple, Union
+try:
+    from .ability_scores import modifier
+    from .combat import Dice
+    from .common import Ability, AbilitySet, Skill, Tool
+except ImportError:
+    from ability_scores import modifier
+    from combat import Dice
+    from common import Ability, AbilitySet, Skill, Tool
+
+Check = Union[Ability, Skill, Tool]
+
+# Rolls needing the lowest value or less always succeed, and rolls needing the highest always fail.
+_LOWEST_NEED = 1
+_HIGHEST_NEED = Dice.D20 + Dice.D4 + 1
+
+class RollMode(Enum):
+    """Defines an enumeration of the ways to roll the d20.
+
+    Members:
+        NORMAL
+        ADVANTAGE
+        DISADVANTAGE
+    """
+    NORMAL = auto()
+    ADVANTAGE = auto()
+    DISADVANTAGE = auto()
+
+class Character(NamedTuple):
+    """Represents a character's ability scores and proficiencies.
+
+    Attributes:
+        name: The name of the character.
+        abilities: The AbilitySet of the character.
+        proficiency_bonus: The proficiency bonus of the character.
+        proficiencies: The Skills and Tools the character is proficient in.
+        expertise: The Skills and Tools the character doubles the proficiency bonus for.
+    """
+    name: str
+    abilities: AbilitySet
+    proficiency_bonus: int = 2
+    proficiencies: FrozenSet[Union[Skill, Tool]] = frozenset()
+    expertise: FrozenSet[Union[Skill, Tool]] = frozenset()
+
+class CheckTable(NamedTuple):
+    """Represents the chance of each character passing each check at each DC.
+
+    Attributes:
+        characters: The characters, in the order of the first index.
+        checks: The checks, in the order of the second index.
+        dcs: The DCs, in the order of the third index.
+        chances: The chances indexed by [character][check][dc].
+    """
+    characters: Tuple[Character, ...]
+    checks: Tuple[Check, ...]
+    dcs: Tuple[int, ...]
+    chances: List[List[List[float]]]
+
+    def chance(self, character: int, check: Check, dc: int) -> float:
+        """Return the chance of a character passing a check at a DC.
+
+        Args:
+            character (int): The index of the character.
+            check (Check): One of the checks of the table.
+            dc (int): One of the DCs of the table.
+
+        Raises:
+            ValueError: The check or DC is not in the table.
+
+        Returns:
+            float: The chance of success.
+        """
+        return self.chances[character][self.checks.index(check)][self.dcs.index(dc)]
+
+def check_bonus(character: Character, check: Check) -> int:
+    """Return a character's bonus to a check.
+
+    Args:
+        character (Character): The character making the check.
+        check (Check): The Ability, Skill, or Tool of the check.
+
+    Raises:
+        TypeError: The check is not an Ability, Skill, or Tool.
+
+    Returns:
+        int: The ability modifier, plus the proficiency bonus if proficient, doubled with
+        expertise.
+    """
+    if isinstance(check, Ability):
+        return modifier(character.abilities[check])
+    if isinstance(check, Skill):
+        bonus = modifier(character.abilities[check.ability()])
+    elif isinstance(check, Tool):
+        bonus = max(modifier(character.abilities[skill.ability()]) for skill in check.skills())
+    else:
+        raise TypeError('Check is not a valid Ability, Skill, or Tool object.')
+    if check in character.expertise:
+        return bonus + 2 * character.proficiency_bonus
+    if check in character.proficiencies:
+        return bonus + character.proficiency_bonus
+    return bonus
+
+def success_chance(bonus: int, dc: int, mode: RollMode = RollMode.NORMAL,
+                   guidance: bool = False) -> float:
+    """Return the chance of passing a check.
+
+    Args:
+        bonus (int): The bonus to the check.
+        dc (int): The DC of the check.
+        mode (RollMode, optional): How the d20 is rolled. Defaults to RollMode.NORMAL.
+        guidance (bool, optional): If 1d4 is added to the roll. Defaults to False.
+
+    Returns:
+        float: The chance that the roll plus the bonus is at least the DC.
+    """
+    table = _SUCCESS_TABLES[mode, guidance]
+    return table[min(max(dc - bonus - _LOWEST_NEED, 0), len(table) - 1)]
+
+def check_table(characters: Sequence[Character], checks: Sequence[Check], dcs: Sequence[int],
+                mode: RollMode = RollMode.NORMAL, guidance: bool = False) -> CheckTable:
+    """Calculate the chance of each character passing each check at each DC.
+
+    Checks with the same bonus reuse one row of chances, so the cost is one bonus per character
+    and check plus one lookup per distinct bonus and DC.
+
+    Args:
+        characters (Sequence[Character]): The characters making the checks.
+        checks (Sequence[Check]): The Abilities, Skills, and Tools to check.
+        dcs (Sequence[int]): The DCs to check against.
+        mode (RollMode, optional): How the d20 is rolled. Defaults to RollMode.NORMAL.
+        guidance (bool, optional): If 1d4 is added to every roll. Defaults to False.
+
+    Returns:
+        CheckTable: The chances indexed by [character][check][dc].
+    """
+    table = _SUCCESS_TABLES[mode, guidance]
+    highest = len(table) - 1
+    dcs = tuple(dcs)
+    rows = {}
+    chances = []
+    for character in characters:
+        character_chances = []
+        for check in checks:
+            bonus = check_bonus(character, check)
+            if bonus not in rows:
+                rows[bonus] = [table[min(max(dc - bonus - _LOWEST_NEED, 0), highest)]
+                               for dc in dcs]
+            character_chances.append(list(rows[bonus]))
+        chances.append(character_chances)
+    return CheckTable(tuple(characters), tuple(checks), dcs, chances)
+
+def _success_table(mode: RollMode, guidance: bool) -> Tuple[float, ...]:
+    """Return the chance of rolling at least each need from _LOWEST_NEED to _HIGHEST_NEED."""
+    # The exact chance of each d20 result, taking the higher or lower of two with a RollMode.
+    if mode == RollMode.NORMAL:
+        rolls = {face: Fraction(1, Dice.D20) for face in range(1, Dice.D20 + 1)}
+    elif mode == RollMode.ADVANTAGE:
+        rolls = {face: Fraction(2 * face - 1, Dice.D20 ** 2) for face in range(1, Dice.D20 + 1)}
+    else:
+        rolls = {face: Fraction(2 * (Dice.D20 - face) + 1, Dice.D20 ** 2)
+                 for face in range(1, Dice.D20 + 1)}
+    if guidance:
+        rolls = _add_die(rolls, Dice.D4)
+    return tuple(float(sum((chance for total, chance in rolls.items() if total >= need),
+                           Fraction(0)))
+                 for need in range(_LOWEST_NEED, _HIGHEST_NEED + 1))
+
+def _add_die(rolls: Dict[int, Fraction], die: Dice) -> Dict[int, Fraction]:
+    """Return the distribution of a roll plus one die."""
+    totals = {}
+    for total, chance in rolls.items():
+        for face in range(1, die + 1):
+            totals[total + face] = totals.get(total + face, 0) + chance / die
+    return totals
+
+_SUCCESS_TABLES = {(mode, guidance): _success_table(mode, guidance)
+                   for mode in RollMode for guidance in (False, True)}
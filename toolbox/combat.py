@@ -6,13 +6,23 @@ Classes:
     Dice: Enumeration of different dice types.
     Damage: Represents a damage calculation.
     WeaponType: Enumeration of different weapon types.
+    WeaponProperty: Flags of the properties of weapons.
     Weapon: Represents a weapon used to make an attack.
     WeaponAttack: Represents an attack made by a weapon.
+
+Functions:
+    weapons_with: Return the weapon types that have all of some properties.
 """
 from __future__ import division, absolute_import
-from enum import Enum, auto, IntEnum
-from typing import List
+from enum import Enum, auto, IntEnum, IntFlag
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 from math import floor
+try:
+    from .common import Ability, AbilitySet
+except ImportError:
+    from common import Ability, AbilitySet
 
 class DamageType(Enum):
     """Defines an enumeration of damage types.
@@ -189,26 +199,44 @@ class Dice(IntEnum):
 
 class Damage:
     """Represents damage dealt from a dice roll.
+
+    Features such as Great Weapon Fighting, Elemental Adept, and Savage Attacker change how the
+    dice are rolled. Their averages are exact, and are calculated once for each combination of
+    dice and modifiers.
     
     Attributes:
         num_dice: The number of dice rolled.
         die: The type of dice rolled.
         damage: The type of damage.
+        reroll: Dice showing this value or lower are rerolled once, and the new roll is used.
+        minimum: Dice showing less than this value count as this value.
+        best_of_two: If all the dice are rolled twice and the higher total is used.
     
     Methods:
         average: Returns the average damage for the dice type.
+        critical_average: Returns the average damage for the dice type on a critical hit.
     """
-    def __init__(self, num_dice: int, die: Dice, damage: DamageType) -> None:
+    def __init__(self, num_dice: int, die: Dice, damage: DamageType, reroll: int = 0,
+                 minimum: int = 0, best_of_two: bool = False) -> None:
         """Initializes Damage.
         
         Args:
             num_dice: The number of dice rolled.
             die: The type of dice rolled.
             damage: The type of damage.
+            reroll: Dice showing this value or lower are rerolled once, such as 2 for Great
+                Weapon Fighting. Defaults to 0.
+            minimum: Dice showing less than this value count as this value, such as 2 for
+                Elemental Adept. Defaults to 0.
+            best_of_two: If all the dice are rolled twice and the higher total is used, such as
+                for Savage Attacker. Defaults to False.
         """
         self.num_dice = num_dice
         self.die = die
         self.damage = damage
+        self.reroll = reroll
+        self.minimum = minimum
+        self.best_of_two = best_of_two
     
     def average(self) -> float:
         """Calculates the average damage value.
@@ -216,7 +244,16 @@ class Damage:
         Returns:
             The average value of the dice.
         """
-        return self.num_dice * (self.die + 1) / 2
+        return _dice_average(self.num_dice, self.die, self.reroll, self.minimum, self.best_of_two)
+
+    def critical_average(self) -> float:
+        """Calculates the average damage value on a critical hit, when the dice are doubled.
+
+        Returns:
+            The average value of twice as many dice.
+        """
+        return _dice_average(2 * self.num_dice, self.die, self.reroll, self.minimum,
+                             self.best_of_two)
 
 class WeaponType(Enum):
     """Defines an enumeration of weapon types.
@@ -371,6 +408,106 @@ class WeaponType(Enum):
             value = WeaponType.CLUB
         return value
 
+class WeaponProperty(IntFlag):
+    """Defines flags of the properties of weapons.
+
+    RANGED marks ranged weapons, which attack with dexterity unless they are also finesse
+    weapons. The '2H' members of WeaponType are versatile weapons wielded with two hands, and
+    have both VERSATILE and TWO_HANDED.
+
+    Members:
+        NONE
+        FINESSE
+        LIGHT
+        HEAVY
+        TWO_HANDED
+        VERSATILE
+        REACH
+        THROWN
+        AMMUNITION
+        LOADING
+        RANGED
+        SPECIAL
+    """
+    NONE = 0
+    FINESSE = 1
+    LIGHT = 2
+    HEAVY = 4
+    TWO_HANDED = 8
+    VERSATILE = 16
+    REACH = 32
+    THROWN = 64
+    AMMUNITION = 128
+    LOADING = 256
+    RANGED = 512
+    SPECIAL = 1024
+
+_STRENGTH_BIT = 1
+_DEXTERITY_BIT = 2
+# The abilities that can be used for each combination of ability bits, strength first so that it
+# wins ties.
+_ATTACK_ABILITY_CHOICES = ((), (Ability.STRENGTH,), (Ability.DEXTERITY,),
+                           (Ability.STRENGTH, Ability.DEXTERITY))
+_WEAPON_PROPERTY_MAP = {
+    WeaponType.CLUB: WeaponProperty.LIGHT,
+    WeaponType.DAGGER: WeaponProperty.FINESSE | WeaponProperty.LIGHT | WeaponProperty.THROWN,
+    WeaponType.GREATCLUB: WeaponProperty.TWO_HANDED,
+    WeaponType.HANDAXE: WeaponProperty.LIGHT | WeaponProperty.THROWN,
+    WeaponType.JAVELIN: WeaponProperty.THROWN,
+    WeaponType.LIGHT_HAMMER: WeaponProperty.LIGHT | WeaponProperty.THROWN,
+    WeaponType.MACE: WeaponProperty.NONE,
+    WeaponType.QUARTERSTAFF: WeaponProperty.VERSATILE,
+    WeaponType.QUARTERSTAFF2H: WeaponProperty.VERSATILE | WeaponProperty.TWO_HANDED,
+    WeaponType.SICKLE: WeaponProperty.LIGHT,
+    WeaponType.SPEAR: WeaponProperty.THROWN | WeaponProperty.VERSATILE,
+    WeaponType.LIGHT_CROSSBOW: (WeaponProperty.RANGED | WeaponProperty.AMMUNITION
+                                | WeaponProperty.LOADING | WeaponProperty.TWO_HANDED),
+    WeaponType.DART: WeaponProperty.RANGED | WeaponProperty.FINESSE | WeaponProperty.THROWN,
+    WeaponType.SHORTBOW: (WeaponProperty.RANGED | WeaponProperty.AMMUNITION
+                          | WeaponProperty.TWO_HANDED),
+    WeaponType.SLING: WeaponProperty.RANGED | WeaponProperty.AMMUNITION,
+    WeaponType.BATTLEAXE: WeaponProperty.VERSATILE,
+    WeaponType.BATTLEAXE2H: WeaponProperty.VERSATILE | WeaponProperty.TWO_HANDED,
+    WeaponType.FLAIL: WeaponProperty.NONE,
+    WeaponType.GLAIVE: WeaponProperty.HEAVY | WeaponProperty.REACH | WeaponProperty.TWO_HANDED,
+    WeaponType.GREATAXE: WeaponProperty.HEAVY | WeaponProperty.TWO_HANDED,
+    WeaponType.GREATSWORD: WeaponProperty.HEAVY | WeaponProperty.TWO_HANDED,
+    WeaponType.HALBERD: WeaponProperty.HEAVY | WeaponProperty.REACH | WeaponProperty.TWO_HANDED,
+    WeaponType.LANCE: WeaponProperty.REACH | WeaponProperty.SPECIAL,
+    WeaponType.LONGSWORD: WeaponProperty.VERSATILE,
+    WeaponType.LONGSWORD2H: WeaponProperty.VERSATILE | WeaponProperty.TWO_HANDED,
+    WeaponType.MAUL: WeaponProperty.HEAVY | WeaponProperty.TWO_HANDED,
+    WeaponType.MORNINGSTAR: WeaponProperty.NONE,
+    WeaponType.PIKE: WeaponProperty.HEAVY | WeaponProperty.REACH | WeaponProperty.TWO_HANDED,
+    WeaponType.RAPIER: WeaponProperty.FINESSE,
+    WeaponType.SCIMITAR: WeaponProperty.FINESSE | WeaponProperty.LIGHT,
+    WeaponType.SHORTSWORD: WeaponProperty.FINESSE | WeaponProperty.LIGHT,
+    WeaponType.TRIDENT: WeaponProperty.THROWN | WeaponProperty.VERSATILE,
+    WeaponType.TRIDENT2H: (WeaponProperty.THROWN | WeaponProperty.VERSATILE
+                           | WeaponProperty.TWO_HANDED),
+    WeaponType.WAR_PICK: WeaponProperty.NONE,
+    WeaponType.WARHAMMER: WeaponProperty.VERSATILE,
+    WeaponType.WARHAMMER2H: WeaponProperty.VERSATILE | WeaponProperty.TWO_HANDED,
+    WeaponType.WHIP: WeaponProperty.FINESSE | WeaponProperty.REACH,
+    WeaponType.BLOWGUN: WeaponProperty.RANGED | WeaponProperty.AMMUNITION | WeaponProperty.LOADING,
+    WeaponType.HAND_CROSSBOW: (WeaponProperty.RANGED | WeaponProperty.AMMUNITION
+                               | WeaponProperty.LIGHT | WeaponProperty.LOADING),
+    WeaponType.HEAVY_CROSSBOW: (WeaponProperty.RANGED | WeaponProperty.AMMUNITION
+                                | WeaponProperty.HEAVY | WeaponProperty.LOADING
+                                | WeaponProperty.TWO_HANDED),
+    WeaponType.LONGBOW: (WeaponProperty.RANGED | WeaponProperty.AMMUNITION | WeaponProperty.HEAVY
+                         | WeaponProperty.TWO_HANDED),
+    WeaponType.NET: WeaponProperty.RANGED | WeaponProperty.THROWN | WeaponProperty.SPECIAL,
+}
+# Indexed by WeaponType value - 1, and built once since the properties are fixed by the rules.
+_WEAPON_PROPERTIES = tuple(int(_WEAPON_PROPERTY_MAP[weapon_type]) for weapon_type in WeaponType)
+# Melee weapons attack with strength and ranged weapons with dexterity, and finesse weapons with
+# either.
+_ATTACK_ABILITY_BITS = tuple((_DEXTERITY_BIT if flags & WeaponProperty.RANGED else _STRENGTH_BIT)
+                             | (_STRENGTH_BIT | _DEXTERITY_BIT
+                                if flags & WeaponProperty.FINESSE else 0)
+                             for flags in _WEAPON_PROPERTIES)
+
 class Weapon:
     """Represents a weapon that deals damage.
     
@@ -378,17 +515,25 @@ class Weapon:
         weapon_type: The WeaponType of weapon.
         bonus: A bonus to the weapon's hit and attack.
         extra_damage: A list of Damage objects that are added to the weapon's damage.
+        reroll: The weapon's dice showing this value or lower are rerolled once.
+        minimum: The weapon's dice showing less than this value count as this value.
+        best_of_two: If the weapon's dice are rolled twice and the higher total is used.
     
     Properties
+        base_damage: Return the Damage of the weapon_type attribute with the weapon's modifiers.
         base_damage_die: Return the Dice member used by the weapon_type attribute.
         base_damage_type: Return the DamageType member used by the weapon_type attribute.
+        properties: Return the WeaponProperty flags of the weapon_type attribute.
+        attack_abilities: Return the Abilities the weapon can attack with.
     
     Methods:
         average_damage: Return the average damage of the weapon.
         average_critical_damage: Return the average damage of the weapon when a
             critical hit is made.
+        best_attack_ability: Return the Ability with the highest score the weapon can attack with.
+        set_weapon_map: Replace the base Damage of the WeaponTypes.
     """
-    _weapon_map = {
+    _weapon_map = MappingProxyType({
         WeaponType.CLUB: Damage(1, Dice.D4, DamageType.BLUDGEONING),
         WeaponType.DAGGER: Damage(1, Dice.D4, DamageType.PIERCING),
         WeaponType.GREATCLUB: Damage(1, Dice.D8, DamageType.BLUDGEONING),
@@ -427,24 +572,43 @@ class Weapon:
         WeaponType.WARHAMMER2H: Damage(1, Dice.D10, DamageType.BLUDGEONING),
         WeaponType.WHIP: Damage(1, Dice.D4, DamageType.SLASHING),
         WeaponType.BLOWGUN: Damage(1, Dice.D1, DamageType.PIERCING),
-        WeaponType.LIGHT_CROSSBOW: Damage(1, Dice.D6, DamageType.PIERCING),
+        WeaponType.HAND_CROSSBOW: Damage(1, Dice.D6, DamageType.PIERCING),
         WeaponType.HEAVY_CROSSBOW: Damage(1, Dice.D10, DamageType.PIERCING),
         WeaponType.LONGBOW: Damage(1, Dice.D8, DamageType.PIERCING),
         WeaponType.NET: Damage(1, Dice.D0, DamageType.SLASHING),
-    }
-    def __init__(self, weapon_type: WeaponType, bonus: int = 0, extra_damage: List[Damage] = None):
+    })
+    # The fingerprint of _weapon_map computed by cache.rules_fingerprint(), or None until then.
+    _weapon_map_fingerprint: Optional[str] = None
+
+    def __init__(self, weapon_type: WeaponType, bonus: int = 0, extra_damage: List[Damage] = None,
+                 reroll: int = 0, minimum: int = 0, best_of_two: bool = False):
         """Initializes the Weapon.
         
         Parameters:
             weapon_type: The WeaponType of weapon.
             bonus: A bonus to the weapon's hit and attack.
             extra_damage: A list of Damage objects that are added to the weapon's damage.
+            reroll: The weapon's dice showing this value or lower are rerolled once, such as 2
+                for Great Weapon Fighting.
+            minimum: The weapon's dice showing less than this value count as this value.
+            best_of_two: If the weapon's dice are rolled twice and the higher total is used,
+                such as for Savage Attacker.
         """
         if extra_damage is None:
             extra_damage = []
         self.weapon_type = weapon_type
         self.bonus = bonus
         self.extra_damage = extra_damage
+        self.reroll = reroll
+        self.minimum = minimum
+        self.best_of_two = best_of_two
+
+    @property
+    def base_damage(self) -> Damage:
+        """Return the Damage of the weapon_type attribute with the weapon's modifiers."""
+        damage = self._weapon_map[self.weapon_type]
+        return Damage(damage.num_dice, damage.die, damage.damage, self.reroll, self.minimum,
+                      self.best_of_two)
 
     @property
     def base_damage_die(self) -> Dice:
@@ -455,10 +619,26 @@ class Weapon:
     def base_damage_type(self):
         """Return the DamageType member used by the weapon_type attribute."""
         return self._weapon_map[self.weapon_type].damage
+
+    @property
+    def properties(self) -> WeaponProperty:
+        """Return the WeaponProperty flags of the weapon_type attribute."""
+        return WeaponProperty(_WEAPON_PROPERTIES[self.weapon_type.value - 1])
+
+    @property
+    def attack_abilities(self) -> Tuple[Ability, ...]:
+        """Return the Abilities the weapon can attack with.
+
+        Melee weapons attack with strength, ranged weapons with dexterity, and finesse weapons
+        with either.
+        """
+        return _ATTACK_ABILITY_CHOICES[_ATTACK_ABILITY_BITS[self.weapon_type.value - 1]]
     
     def average_damage(self):
         """Return the average damage of the weapon."""
-        average = self._weapon_map[self.weapon_type].average()
+        damage = self._weapon_map[self.weapon_type]
+        average = _dice_average(damage.num_dice, damage.die, self.reroll, self.minimum,
+                                self.best_of_two)
         average += self.bonus
         for damage in self.extra_damage:
             average += damage.average()
@@ -466,12 +646,42 @@ class Weapon:
     
     def average_critical_damage(self):
         """Return the average damage of the weapon when a critical hit is made."""
-        average = 2 * self._weapon_map[self.weapon_type].average()
+        damage = self._weapon_map[self.weapon_type]
+        average = _dice_average(2 * damage.num_dice, damage.die, self.reroll, self.minimum,
+                                self.best_of_two)
         average += self.bonus
         for damage in self.extra_damage:
-            average += 2 * damage.average()
+            average += damage.critical_average()
         return average
 
+    def best_attack_ability(self, abilities: AbilitySet) -> Ability:
+        """Return the Ability with the highest score the weapon can attack with.
+
+        Args:
+            abilities (AbilitySet): The ability scores of the attacker.
+
+        Returns:
+            Ability: The best attack ability. Strength wins ties.
+        """
+        return max(_ATTACK_ABILITY_CHOICES[_ATTACK_ABILITY_BITS[self.weapon_type.value - 1]],
+                   key=abilities.__getitem__)
+
+    @classmethod
+    def set_weapon_map(cls, weapon_map: Mapping[WeaponType, Damage]) -> None:
+        """Replace the base Damage of the WeaponTypes, such as from a rule pack.
+
+        Args:
+            weapon_map (Mapping[WeaponType, Damage]): The base Damage of each WeaponType.
+
+        Raises:
+            TypeError: A key is not a WeaponType or a value is not a Damage.
+        """
+        for weapon_type, damage in weapon_map.items():
+            if not isinstance(weapon_type, WeaponType) or not isinstance(damage, Damage):
+                raise TypeError('The weapon map must map WeaponType members to Damage objects.')
+        cls._weapon_map = MappingProxyType(dict(weapon_map))
+        cls._weapon_map_fingerprint = None
+
 class WeaponAttack:
     """Represents an attack made by a weapon.
     
@@ -483,20 +693,25 @@ class WeaponAttack:
         attack_stat: The player character's primary attack ability score.
         proficient: If the player character is proficient with the Weapon.
         damage_mod: An additional bonus to damage.
+        off_hand: If the attack is the bonus action attack of two-weapon fighting, which does not
+            add a positive attack_mod to damage.
     
     Properties:
         proficiency_bonus: The player character's proficiency bonus.
         attack_mod: The modifier calculated from attack_stat.
+        damage_ability_mod: The part of attack_mod added to damage.
         hit_bonus: The total bonus to hit an enemy.
 
     Methods:
+        from_abilities: Create a WeaponAttack with the best attack ability of an AbilitySet.
         hit_chance: Calculate the chance to hit a given target AC.
         average_hit_damage: Calculate the average damage done on a hit.
         average_damage: Calculate the average damage done to a given target AC.
+        average_damages: Calculate the average damage done to each of several target ACs.
         critical_hit_damage: Calculate the damage done by a critical hit.
     """
     def __init__(self, weapon: Weapon, level: int, attack_stat: int, proficient: bool = True,
-                 damage_mod: int = 0):
+                 damage_mod: int = 0, off_hand: bool = False):
         """Initializes the WeaponAttack.
         
         Parameters:
@@ -505,12 +720,44 @@ class WeaponAttack:
             attack_stat: The player character's primary attack ability score.
             proficient: If the player character is proficient with the Weapon.
             damage_mod: An additional bonus to damage.
+            off_hand: If the attack is the bonus action attack of two-weapon fighting.
+
+        Raises:
+            ValueError: off_hand is true and the Weapon is not light.
         """
+        if off_hand and not _WEAPON_PROPERTIES[weapon.weapon_type.value - 1] & WeaponProperty.LIGHT:
+            raise ValueError('Only light weapons can make off-hand attacks.')
         self.weapon = weapon
         self.level = level
         self.attack_stat = attack_stat
         self.proficient = proficient
         self.damage_mod = damage_mod
+        self.off_hand = off_hand
+
+    @classmethod
+    def from_abilities(cls, weapon: Weapon, level: int, abilities: AbilitySet,
+                       proficient: bool = True, damage_mod: int = 0,
+                       off_hand: bool = False) -> 'WeaponAttack':
+        """Create a WeaponAttack with the best attack ability of an AbilitySet.
+
+        Args:
+            weapon (Weapon): The Weapon used in the attack.
+            level (int): The level of the player character.
+            abilities (AbilitySet): The ability scores of the player character.
+            proficient (bool, optional): If the player character is proficient with the Weapon.
+                Defaults to True.
+            damage_mod (int, optional): An additional bonus to damage. Defaults to 0.
+            off_hand (bool, optional): If the attack is the bonus action attack of two-weapon
+                fighting. Defaults to False.
+
+        Raises:
+            ValueError: off_hand is true and the Weapon is not light.
+
+        Returns:
+            WeaponAttack: The attack, with attack_stat set to the best score the Weapon can use.
+        """
+        return cls(weapon, level, abilities[weapon.best_attack_ability(abilities)], proficient,
+                   damage_mod, off_hand)
     
     @property
     def proficiency_bonus(self) -> int:
@@ -538,6 +785,14 @@ class WeaponAttack:
         Modifier is calculated as floor((attack_stat - 20) / 2)
         """
         return floor((self.attack_stat - 10) / 2)
+
+    @property
+    def damage_ability_mod(self) -> int:
+        """The part of attack_mod added to damage.
+
+        Off-hand attacks only add attack_mod to damage if it is negative.
+        """
+        return min(self.attack_mod, 0) if self.off_hand else self.attack_mod
     
     @property
     def hit_bonus(self) -> int:
@@ -565,7 +820,7 @@ class WeaponAttack:
         Returns:
             The calculated average damage.
         """
-        return self.weapon.average_damage() + self.attack_mod + self.damage_mod
+        return self.weapon.average_damage() + self.damage_ability_mod + self.damage_mod
     
     def average_damage(self, target_ac: int) -> float:
         """Calculate the average damage done to a given target AC.
@@ -580,6 +835,23 @@ class WeaponAttack:
         """
         return (max((self.hit_chance(target_ac) - 1), 1) / Dice.D20 * self.average_hit_damage() +
                 1 / Dice.D20 * self.critical_hit_damage())
+
+    def average_damages(self, target_acs: Iterable[int]) -> List[float]:
+        """Calculate the average damage done to each of several target ACs.
+
+        Equivalent to calling average_damage for each AC, but the hit and critical hit damage are
+        only calculated once.
+
+        Parameters:
+            target_acs: The ACs of the targets of the attack.
+
+        Returns:
+            The calculated average damage against each AC, in order.
+        """
+        hit_damage = self.average_hit_damage()
+        critical_damage = 1 / Dice.D20 * self.critical_hit_damage()
+        return [max((self.hit_chance(target_ac) - 1), 1) / Dice.D20 * hit_damage + critical_damage
+                for target_ac in target_acs]
     
     def critical_hit_damage(self) -> float:
         """
@@ -590,4 +862,62 @@ class WeaponAttack:
         Returns:
             The calculated average damage of a critical hit.
         """
-        return self.weapon.average_critical_damage() + self.attack_mod + self.damage_mod
\ No newline at end of file
+        return self.weapon.average_critical_damage() + self.damage_ability_mod + self.damage_mod
+
+def weapons_with(properties: WeaponProperty,
+                 excluded: WeaponProperty = WeaponProperty.NONE) -> List[WeaponType]:
+    """Return the weapon types that have all of some properties, such as all finesse light weapons.
+
+    Args:
+        properties (WeaponProperty): The properties every weapon type must have.
+        excluded (WeaponProperty, optional): Properties no weapon type may have. Defaults to
+            WeaponProperty.NONE.
+
+    Returns:
+        List[WeaponType]: The matching weapon types, in member order.
+    """
+    required = int(properties)
+    mask = required | int(excluded)
+    return [weapon_type for weapon_type, flags in zip(WeaponType, _WEAPON_PROPERTIES)
+            if flags & mask == required]
+
+def _dice_average(num_dice: int, die: Dice, reroll: int, minimum: int,
+                  best_of_two: bool) -> float:
+    """Return the average total of dice rolled with modifiers."""
+    if die < 1 or not (reroll or minimum or best_of_two):
+        return num_dice * (die + 1) / 2
+    return _modified_dice_average(num_dice, int(die), min(reroll, int(die)), minimum,
+                                  bool(best_of_two))
+
+@lru_cache(maxsize=1024)
+def _modified_dice_average(num_dice: int, sides: int, reroll: int, minimum: int,
+                           best_of_two: bool) -> float:
+    """Return the exact average total of dice rolled with modifiers."""
+    face_weights = _face_weights(sides, reroll, minimum)
+    face_total = sides * sides
+    if not best_of_two:
+        return num_dice * sum(value * weight for value, weight in face_weights.items()) / face_total
+    weights = {0: 1}
+    for _ in range(num_dice):
+        next_weights = {}
+        for total, weight in weights.items():
+            for value, face_weight in face_weights.items():
+                next_weights[total + value] = (next_weights.get(total + value, 0)
+                                               + weight * face_weight)
+        weights = next_weights
+    # The higher of two totals is at most a value with the square of the cumulative weight.
+    expected = cumulative = 0
+    for total in sorted(weights):
+        previous, cumulative = cumulative, cumulative + weights[total]
+        expected += total * (cumulative * cumulative - previous * previous)
+    return expected / (face_total ** num_dice) ** 2
+
+@lru_cache(maxsize=None)
+def _face_weights(sides: int, reroll: int, minimum: int) -> Dict[int, int]:
+    """Return the integer weight of each value of one die with modifiers, out of sides squared."""
+    face_weights = {}
+    for face in range(1, sides + 1):
+        # A face at or below the reroll value is replaced by a second, uniform roll.
+        value = max(face, minimum)
+        face_weights[value] = face_weights.get(value, 0) + (sides if face > reroll else 0) + reroll
+    return face_weights
@@ -6,9 +6,14 @@ Classes:
     Skill: Enumeration of ability based skills.
     Tool: Enumeration of skill based tools.
     AbilitySet: A collection of ability scores used by a player character.
+
+Functions:
+    set_rule_tables: Replace the Abilities of Skills and the Skills and names of Tools.
 """
 from __future__ import absolute_import
 from enum import Enum, auto
+from types import MappingProxyType
+from typing import Mapping, Sequence
 
 class Ability(Enum):
     """Defines annumeration of basic abilities.
@@ -139,27 +144,7 @@ class Skill(Enum):
         Returns:
             The associated Ability.
         """
-        mapping = {
-            self.ACROBATICS: Ability.DEXTERITY,
-            self.ANIMAL_HANDLING: Ability.WISDOM,
-            self.ARCANA: Ability.INTELLIGENCE,
-            self.ATHLETICS: Ability.STRENGTH,
-            self.DECEPTION: Ability.CHARISMA,
-            self.HISTORY: Ability.INTELLIGENCE,
-            self.INSIGHT: Ability.WISDOM,
-            self.INTIMIDATION: Ability.CHARISMA,
-            self.INVESTIGATION: Ability.INTELLIGENCE,
-            self.MEDICINE: Ability.WISDOM,
-            self.NATURE: Ability.INTELLIGENCE,
-            self.PERCEPTION: Ability.WISDOM,
-            self.PERFORMANCE: Ability.CHARISMA,
-            self.PERSUASION: Ability.CHARISMA,
-            self.RELIGION: Ability.INTELLIGENCE,
-            self.SLEIGHT_OF_HAND: Ability.DEXTERITY,
-            self.STEALTH: Ability.DEXTERITY,
-            self.SURVIVAL: Ability.WISDOM
-        }
-        return mapping[self]
+        return _SKILL_ABILITY_MAP[self]
     
     @classmethod
     def get_values(cls):
@@ -284,35 +269,7 @@ class Tool(Enum):
         Returns:
             A list containing all Skills associated with the Tool.
         """
-        mapping = {
-            self.ALCHEMIST: [Skill.ARCANA, Skill.INVESTIGATION],
-            self.BREWER: [Skill.HISTORY, Skill.MEDICINE, Skill.PERSUASION],
-            self.CALLIGRAPHER: [Skill.ARCANA, Skill.HISTORY],
-            self.CARPENTER: [Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION, Skill.STEALTH],
-            self.CARTOGRAPHER: [Skill.ARCANA, Skill.HISTORY, Skill.RELIGION, Skill.NATURE, Skill.SURVIVAL],
-            self.COBBLER: [Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION],
-            self.COOK: [Skill.HISTORY, Skill.MEDICINE, Skill.SURVIVAL],
-            self.DISGUISE: [Skill.DECEPTION, Skill.INTIMIDATION, Skill.PERFORMANCE, Skill.PERSUASION],
-            self.FORGERY: [Skill.ARCANA, Skill.DECEPTION, Skill.HISTORY, Skill.INVESTIGATION],
-            self.GAMING: [Skill.HISTORY, Skill.INSIGHT, Skill.SLEIGHT_OF_HAND],
-            self.GLASSBLOWER: [Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION],
-            self.HERBALISM: [Skill.ARCANA, Skill.INVESTIGATION, Skill.MEDICINE, Skill.NATURE, Skill.SURVIVAL],
-            self.JEWELER: [Skill.ARCANA, Skill.INVESTIGATION],
-            self.VEHICLES: [Skill.ARCANA, Skill.INVESTIGATION, Skill.PERCEPTION],
-            self.LEATHERWORKER: [Skill.ARCANA, Skill.INVESTIGATION],
-            self.MASON: [Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION],
-            self.MUSICAL: [Skill.HISTORY, Skill.PERFORMANCE],
-            self.NAVIGATOR: [Skill.SURVIVAL],
-            self.PAINTER: [Skill.ARCANA, Skill.HISTORY, Skill.RELIGION, Skill.INVESTIGATION, Skill.PERCEPTION],
-            self.POISONER: [Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION, Skill.MEDICINE, Skill.NATURE, Skill.SURVIVAL],
-            self.POTTER: [Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION],
-            self.SMITH: [Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION],
-            self.THIEVES: [Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION, Skill.SLEIGHT_OF_HAND],
-            self.TINKER: [Skill.HISTORY, Skill.INVESTIGATION],
-            self.WEAVER: [Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION],
-            self.WOODCARVER: [Skill.ARCANA, Skill.HISTORY, Skill.NATURE]
-        }
-        return mapping[self]
+        return list(_TOOL_SKILL_MAP[self])
     
     @classmethod
     def get_values(cls):
@@ -358,7 +315,61 @@ class Tool(Enum):
                 return key
         return Tool.ALCHEMIST
 
-_TOOL_NAME_MAP = {
+# The rules of skills and tools. The tables are frozen, and set_rule_tables() replaces them.
+_SKILL_ABILITY_MAP = MappingProxyType({
+    Skill.ACROBATICS: Ability.DEXTERITY,
+    Skill.ANIMAL_HANDLING: Ability.WISDOM,
+    Skill.ARCANA: Ability.INTELLIGENCE,
+    Skill.ATHLETICS: Ability.STRENGTH,
+    Skill.DECEPTION: Ability.CHARISMA,
+    Skill.HISTORY: Ability.INTELLIGENCE,
+    Skill.INSIGHT: Ability.WISDOM,
+    Skill.INTIMIDATION: Ability.CHARISMA,
+    Skill.INVESTIGATION: Ability.INTELLIGENCE,
+    Skill.MEDICINE: Ability.WISDOM,
+    Skill.NATURE: Ability.INTELLIGENCE,
+    Skill.PERCEPTION: Ability.WISDOM,
+    Skill.PERFORMANCE: Ability.CHARISMA,
+    Skill.PERSUASION: Ability.CHARISMA,
+    Skill.RELIGION: Ability.INTELLIGENCE,
+    Skill.SLEIGHT_OF_HAND: Ability.DEXTERITY,
+    Skill.STEALTH: Ability.DEXTERITY,
+    Skill.SURVIVAL: Ability.WISDOM,
+})
+
+_TOOL_SKILL_MAP = MappingProxyType({
+    Tool.ALCHEMIST: (Skill.ARCANA, Skill.INVESTIGATION),
+    Tool.BREWER: (Skill.HISTORY, Skill.MEDICINE, Skill.PERSUASION),
+    Tool.CALLIGRAPHER: (Skill.ARCANA, Skill.HISTORY),
+    Tool.CARPENTER: (Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION, Skill.STEALTH),
+    Tool.CARTOGRAPHER: (Skill.ARCANA, Skill.HISTORY, Skill.RELIGION, Skill.NATURE, Skill.SURVIVAL),
+    Tool.COBBLER: (Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION),
+    Tool.COOK: (Skill.HISTORY, Skill.MEDICINE, Skill.SURVIVAL),
+    Tool.DISGUISE: (Skill.DECEPTION, Skill.INTIMIDATION, Skill.PERFORMANCE, Skill.PERSUASION),
+    Tool.FORGERY: (Skill.ARCANA, Skill.DECEPTION, Skill.HISTORY, Skill.INVESTIGATION),
+    Tool.GAMING: (Skill.HISTORY, Skill.INSIGHT, Skill.SLEIGHT_OF_HAND),
+    Tool.GLASSBLOWER: (Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION),
+    Tool.HERBALISM: (Skill.ARCANA, Skill.INVESTIGATION, Skill.MEDICINE, Skill.NATURE,
+                     Skill.SURVIVAL),
+    Tool.JEWELER: (Skill.ARCANA, Skill.INVESTIGATION),
+    Tool.VEHICLES: (Skill.ARCANA, Skill.INVESTIGATION, Skill.PERCEPTION),
+    Tool.LEATHERWORKER: (Skill.ARCANA, Skill.INVESTIGATION),
+    Tool.MASON: (Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION),
+    Tool.MUSICAL: (Skill.HISTORY, Skill.PERFORMANCE),
+    Tool.NAVIGATOR: (Skill.SURVIVAL,),
+    Tool.PAINTER: (Skill.ARCANA, Skill.HISTORY, Skill.RELIGION, Skill.INVESTIGATION,
+                   Skill.PERCEPTION),
+    Tool.POISONER: (Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION, Skill.MEDICINE,
+                    Skill.NATURE, Skill.SURVIVAL),
+    Tool.POTTER: (Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION),
+    Tool.SMITH: (Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION),
+    Tool.THIEVES: (Skill.HISTORY, Skill.INVESTIGATION, Skill.PERCEPTION, Skill.SLEIGHT_OF_HAND),
+    Tool.TINKER: (Skill.HISTORY, Skill.INVESTIGATION),
+    Tool.WEAVER: (Skill.ARCANA, Skill.HISTORY, Skill.INVESTIGATION),
+    Tool.WOODCARVER: (Skill.ARCANA, Skill.HISTORY, Skill.NATURE),
+})
+
+_TOOL_NAME_MAP = MappingProxyType({
     Tool.ALCHEMIST: "Alchemist's Supplies", 
     Tool.BREWER: "Brewer's Supplies",
     Tool.CALLIGRAPHER: "Calligrapher's Supplies",
@@ -385,7 +396,8 @@ _TOOL_NAME_MAP = {
     Tool.TINKER: "Tinker's Tools",
     Tool.WEAVER: "Weaver's Tools",
     Tool.WOODCARVER: "Woodcarver's Tools"
-}
+})
+
 class AbilitySet():
     """Represents the 6 ability scores used for a player character.
 
@@ -463,4 +475,26 @@ class AbilitySet():
             self.wisdom = int(value)
         elif key == Ability.CHARISMA:
             self.charisma = int(value)
-        
\ No newline at end of file
+        
+
+def set_rule_tables(skill_abilities: Mapping[Skill, Ability],
+                    tool_skills: Mapping[Tool, Sequence[Skill]],
+                    tool_names: Mapping[Tool, str]) -> None:
+    """Replace the Abilities of Skills and the Skills and names of Tools, such as from a rule pack.
+
+    Args:
+        skill_abilities (Mapping[Skill, Ability]): The Ability of every Skill.
+        tool_skills (Mapping[Tool, Sequence[Skill]]): The Skills of every Tool.
+        tool_names (Mapping[Tool, str]): The display name of every Tool.
+
+    Raises:
+        ValueError: A Skill or Tool is missing from a table.
+    """
+    if (set(skill_abilities) != set(Skill) or set(tool_skills) != set(Tool)
+            or set(tool_names) != set(Tool)):
+        raise ValueError('Rule tables must have every Skill and Tool.')
+    global _SKILL_ABILITY_MAP, _TOOL_SKILL_MAP, _TOOL_NAME_MAP
+    _SKILL_ABILITY_MAP = MappingProxyType(dict(skill_abilities))
+    _TOOL_SKILL_MAP = MappingProxyType({tool: tuple(skills)
+                                        for tool, skills in tool_skills.items()})
+    _TOOL_NAME_MAP = MappingProxyType(dict(tool_names))
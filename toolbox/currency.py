@@ -3,12 +3,26 @@
 Classes:
     CurrencyOptions
     Currency
+    FrozenCurrency
+    CurrencyBatch
+
+Functions:
+    cached_consolidate: Return a cached, consolidated copy of a Currency.
+    cached_split: Return a cached split of a Currency.
+    currency_cache_info: Return the hit statistics of the Currency caches.
+    clear_currency_cache: Clear the Currency caches.
 """
 from __future__ import annotations, absolute_import
-from typing import List
-from functools import total_ordering
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from array import array
+from fractions import Fraction
+from functools import total_ordering, lru_cache
 from enum import Flag, auto
 
+_COIN_VALUES = (('platinum', 1000), ('gold', 100), ('electrum', 50), ('silver', 10),
+                ('copper', 1))
+_COIN_INDEX = {'pp': 0, 'gp': 1, 'ep': 2, 'sp': 3, 'cp': 4}
+
 class CurrencyOptions(Flag):
     """Defines an enumeration of damage types.
     
@@ -33,12 +47,22 @@ class CurrencyOptions(Flag):
 class Currency():
     """Represents a collection of the 5 types of coins.
 
-    Allows comparison, addition, subtraction, and multiplication.
+    Allows comparison, addition, subtraction, and multiplication. Currency objects are hashable
+    by their numbers of coins, so they should not be modified while used as dictionary keys.
     
     Methods:
+        parse: Create a Currency object from its string representation.
+        key: Return the canonical key of the object.
+        freeze: Return an immutable copy of the object.
         to_copper: Return the number of copper coins equivalent to the total value.
         consolidate: Consolidate the coins into the fewest number possible.
         split: Split the currency into a given number of groups as equally as possible.
+        fair_split: Split the physical coins into a given number of groups as equally as possible.
+        weighted_split: Split the currency between recipients in proportion to their shares.
+        iter_weighted_split: Yield the weighted split of the currency one recipient at a time.
+        weighted_split_groups: Return the weighted split grouped by share and amount.
+        weighted_fair_split: Split the physical coins between recipients in proportion to their
+            shares.
         """
     def __init__(self, platinum: int = 0, gold: int = 0, electrum: int = 0, silver: int = 0,
                  copper: int = 0) -> None:
@@ -75,6 +99,14 @@ class Currency():
         equal &= self.copper == other.copper
         return equal
     
+    def __hash__(self) -> int:
+        """Return a hash of the object based on the number of each coin.
+
+        Returns:
+            int: The hash of the canonical key.
+        """
+        return hash(self.key())
+    
     def __lt__(self, other: object) -> bool:
         """Checks if a Currency object is less than the other.
 
@@ -96,15 +128,26 @@ class Currency():
         Returns:
             str: The string representation.
         """
-        val = ''
-        val += f'{self.platinum}pp, ' if self.platinum > 0 else ''
-        val += f'{self.gold}gp, ' if self.gold > 0 else ''
-        val += f'{self.electrum}ep, ' if self.electrum > 0 else ''
-        val += f'{self.silver}sp, ' if self.silver > 0 else ''
-        val += f'{self.copper}cp, ' if (self.copper > 0 or self.to_copper() <= 0) else ''
-        while (val[-1] == ',' or val[-1] == ' '):
-            val = val[:-1]
-        return val
+        return _format_coins(self.platinum, self.gold, self.electrum, self.silver, self.copper)
+    
+    @classmethod
+    def parse(cls, text: str) -> Currency:
+        """Create a Currency object from its string representation.
+
+        The string consists of comma separated numbers of coins, e.g. "3pp, 12gp, 5cp". Coins may
+        appear in any order, and repeated coins are added together. For non-negative numbers of
+        coins, Currency.parse(str(currency)) == currency.
+
+        Args:
+            text (str): The string to parse.
+
+        Raises:
+            ValueError: The string is not a valid representation of a Currency.
+
+        Returns:
+            Currency: The parsed Currency object.
+        """
+        return cls(*_parse_coins(text))
     
     def __add__(self, other: object) -> Currency:
         """Adds the Currency object to another Currency object.
@@ -155,6 +198,23 @@ class Currency():
                         self.silver * other,
                         self.copper * other)
     
+    def key(self) -> Tuple[int, int, int, int, int]:
+        """Return the canonical key of the object.
+
+        Returns:
+            Tuple[int, int, int, int, int]: The number of platinum, gold, electrum, silver, and
+            copper coins.
+        """
+        return (self.platinum, self.gold, self.electrum, self.silver, self.copper)
+    
+    def freeze(self) -> FrozenCurrency:
+        """Return an immutable copy of the object.
+
+        Returns:
+            FrozenCurrency: A FrozenCurrency object with the same numbers of coins.
+        """
+        return FrozenCurrency(*self.key())
+    
     def to_copper(self) -> int:
         """Return the equivalent value of the object in copper coins.
 
@@ -203,7 +263,9 @@ class Currency():
         Args:
             players (int): The number of players to split the Currency among.
             consolidate (bool, optional): If True, the resulting Currency object will be
-                consolidated, as if with the Currency.consolidate() method. Defaults to True.
+                consolidated, as if with the Currency.consolidate() method. If False, the
+                physical coins are shared out as with the Currency.fair_split() method.
+                Defaults to True.
             consolidate_currencies (CurrencyOptions, optional): The coins to use when
                 consolidating. Has no effect if consolidated is False. Defaults to
                 CurrencyOptions.COMMON.
@@ -222,30 +284,562 @@ class Currency():
                 currencies.append(Currency(copper=copper // players)
                                   .consolidate(consolidate_currencies))
         else:
-            coin = self.platinum
-            currencies = [Currency() for i in range(players)]
-            while coin > 0:
-                min_cur = min(currencies)
-                min_cur.platinum += 1
-                coin -= 1
-            coin = self.gold
-            while coin > 0:
-                min_cur = min(currencies)
-                min_cur.gold += 1
-                coin -= 1
-            coin = self.electrum
-            while coin > 0:
-                min_cur = min(currencies)
-                min_cur.electrum += 1
-                coin -= 1
-            coin = self.silver
-            while coin > 0:
-                min_cur = min(currencies)
-                min_cur.silver += 1
-                coin -= 1
-            coin = self.copper
-            while coin > 0:
-                min_cur = min(currencies)
-                min_cur.copper += 1
-                coin -= 1
-        return currencies
\ No newline at end of file
+            currencies = self.fair_split(players)
+        return currencies
+
+    def fair_split(self, players: int) -> List[Currency]:
+        """Return a list of Currency objects obtained by sharing out the physical coins as evenly
+           as possible.
+
+        No coins are exchanged. Coins are handed out from the most to the least valuable, each
+        coin going to the share with the lowest value. Because every coin value divides the next
+        larger one, this minimizes the difference between the most and least valuable shares.
+        Ties are broken in favor of the share holding the fewest coins, then the earliest share.
+        Each denomination is dealt out in bulk, so the run time does not depend on the number of
+        coins.
+
+        Args:
+            players (int): The number of players to split the Currency among.
+
+        Returns:
+            List[Currency]: The share of each player.
+        """
+        currencies = [Currency() for _ in range(players)]
+        values = [0] * players
+        coins = [0] * players
+        for name, value in _COIN_VALUES:
+            remaining = getattr(self, name)
+            if remaining <= 0:
+                continue
+            # Share values are all multiples of the current coin value, so work in coin units
+            levels = [share_value // value for share_value in values]
+            order = sorted(range(players), key=levels.__getitem__)
+            level = levels[order[0]]
+            raised = 0
+            while True:
+                while raised < players and levels[order[raised]] <= level:
+                    raised += 1
+                step = remaining // raised
+                if raised < players:
+                    step = min(step, levels[order[raised]] - level)
+                level += step
+                remaining -= step * raised
+                if raised == players or level < levels[order[raised]]:
+                    break
+            counts = [0] * players
+            for index in order[:raised]:
+                counts[index] = level - levels[index]
+                coins[index] += counts[index]
+            for index in sorted(order[:raised], key=lambda i: (coins[i], i))[:remaining]:
+                counts[index] += 1
+                coins[index] += 1
+            for index, count in enumerate(counts):
+                if count:
+                    setattr(currencies[index], name, count)
+                    values[index] += count * value
+        return currencies
+
+    def weighted_split(self, weights: Iterable[Union[int, float, str, Fraction]],
+                       consolidate_currencies: CurrencyOptions = CurrencyOptions.COMMON
+                       ) -> List[Currency]:
+        """Return a list of Currency objects obtained by splitting the Currency in proportion to
+           the given shares.
+
+        The value is split in copper using the largest remainder method, so the shares always add
+        up to the original value exactly. Each share is consolidated.
+
+        Args:
+            weights (Iterable[Union[int, float, str, Fraction]]): The number of shares taken by
+                each recipient, e.g. 2 for a captain and 0.5 for a hireling.
+            consolidate_currencies (CurrencyOptions, optional): The coins to use when
+                consolidating. Defaults to CurrencyOptions.COMMON.
+
+        Raises:
+            ValueError: A weight is negative or all of the weights are 0.
+
+        Returns:
+            List[Currency]: The share of each recipient, in the order of weights.
+        """
+        return list(self.iter_weighted_split(weights, consolidate_currencies))
+
+    def iter_weighted_split(self, weights: Iterable[Union[int, float, str, Fraction]],
+                            consolidate_currencies: CurrencyOptions = CurrencyOptions.COMMON
+                            ) -> Iterator[Currency]:
+        """Yield the shares of a weighted split one recipient at a time.
+
+        The split is identical to Currency.weighted_split(). The amounts are worked out once per
+        distinct weight, so each recipient costs a constant amount of work.
+
+        Args:
+            weights (Iterable[Union[int, float, str, Fraction]]): The number of shares taken by
+                each recipient.
+            consolidate_currencies (CurrencyOptions, optional): The coins to use when
+                consolidating. Defaults to CurrencyOptions.COMMON.
+
+        Raises:
+            ValueError: A weight is negative or all of the weights are 0.
+
+        Yields:
+            Currency: The share of each recipient, in the order of weights.
+        """
+        fractions = [_to_fraction(weight) for weight in weights]
+        allocations = self._weighted_allocations(fractions)
+        consolidated = {}
+        seen = dict.fromkeys(allocations, 0)
+        for weight in fractions:
+            base, extras, _ = allocations[weight]
+            copper = base + 1 if seen[weight] < extras else base
+            seen[weight] += 1
+            if copper not in consolidated:
+                consolidated[copper] = Currency(copper=copper).consolidate(consolidate_currencies)
+            coins = consolidated[copper]
+            yield Currency(coins.platinum, coins.gold, coins.electrum, coins.silver, coins.copper)
+
+    def weighted_split_groups(self, weights: Iterable[Union[int, float, str, Fraction]],
+                              consolidate_currencies: CurrencyOptions = CurrencyOptions.COMMON,
+                              consolidate: bool = True) -> List[Tuple[Fraction, int, Currency]]:
+        """Return the weighted split grouped by weight and amount.
+
+        Args:
+            weights (Iterable[Union[int, float, str, Fraction]]): The number of shares taken by
+                each recipient.
+            consolidate_currencies (CurrencyOptions, optional): The coins to use when
+                consolidating. Has no effect if consolidate is False. Defaults to
+                CurrencyOptions.COMMON.
+            consolidate (bool, optional): If True, each share is consolidated as with the
+                Currency.weighted_split() method. If False, the physical coins are shared out as
+                with the Currency.weighted_fair_split() method. Defaults to True.
+
+        Raises:
+            ValueError: A weight is negative or all of the weights are 0.
+
+        Returns:
+            List[Tuple[Fraction, int, Currency]]: Tuples of the weight, the number of recipients
+            and the share each of them receives, in order of the first appearance of each weight.
+        """
+        fractions = [_to_fraction(weight) for weight in weights]
+        if not consolidate:
+            counts = {}
+            for weight, share in zip(fractions, self.weighted_fair_split(fractions)):
+                counts[weight, share] = counts.get((weight, share), 0) + 1
+            return [(weight, count, share) for (weight, share), count in counts.items()]
+        allocations = self._weighted_allocations(fractions)
+        groups = []
+        for weight, (base, extras, count) in allocations.items():
+            if extras > 0:
+                groups.append((weight, extras,
+                               Currency(copper=base + 1).consolidate(consolidate_currencies)))
+            if count > extras:
+                groups.append((weight, count - extras,
+                               Currency(copper=base).consolidate(consolidate_currencies)))
+        return groups
+
+    def weighted_fair_split(self, weights: Iterable[Union[int, float, str, Fraction]]
+                            ) -> List[Currency]:
+        """Return a list of Currency objects obtained by sharing out the physical coins in
+           proportion to the given shares.
+
+        No coins are exchanged. Each recipient is owed the value it would receive from
+        Currency.weighted_split(). Coins are handed out from the most to the least valuable, each
+        coin going to the recipient that is owed the most, ties going to the earliest recipient.
+        Each denomination is dealt out in bulk, so the run time does not depend on the number of
+        coins.
+
+        Args:
+            weights (Iterable[Union[int, float, str, Fraction]]): The number of shares taken by
+                each recipient.
+
+        Raises:
+            ValueError: A weight is negative or all of the weights are 0.
+
+        Returns:
+            List[Currency]: The share of each recipient, in the order of weights.
+        """
+        fractions = [_to_fraction(weight) for weight in weights]
+        allocations = self._weighted_allocations(fractions)
+        seen = dict.fromkeys(allocations, 0)
+        owed = []
+        for weight in fractions:
+            base, extras, _ = allocations[weight]
+            owed.append(base + 1 if seen[weight] < extras else base)
+            seen[weight] += 1
+        currencies = [Currency() for _ in fractions]
+        for name, value in _COIN_VALUES:
+            remaining = getattr(self, name)
+            if remaining <= 0:
+                continue
+            # Find the lowest amount owed that the coins can bring every recipient down to
+            low, high = min(owed) - remaining * value, max(owed)
+            while low < high:
+                middle = (low + high) // 2
+                if _coins_needed(owed, middle, value) <= remaining:
+                    high = middle
+                else:
+                    low = middle + 1
+            counts = [max(0, -(-(amount - high) // value)) for amount in owed]
+            remaining -= sum(counts)
+            order = sorted(range(len(owed)), key=lambda i: (counts[i] * value - owed[i], i))
+            for index in order[:remaining]:
+                counts[index] += 1
+            for index, count in enumerate(counts):
+                if count:
+                    setattr(currencies[index], name, count)
+                    owed[index] -= count * value
+        return currencies
+
+    def _weighted_allocations(self, weights: List[Fraction]) -> Dict[Fraction, Tuple[int, int, int]]:
+        """Allocate the value of the Currency between weights using the largest remainder method.
+
+        Recipients with equal weights are grouped. Leftover copper goes to the groups with the
+        largest remainders, ties going to the weight listed first, and within a group to the
+        earliest recipients.
+
+        Args:
+            weights (List[Fraction]): The number of shares taken by each recipient.
+
+        Raises:
+            ValueError: A weight is negative or all of the weights are 0.
+
+        Returns:
+            Dict[Fraction, Tuple[int, int, int]]: The copper given to each recipient of a weight,
+            the number of those recipients given one extra copper, and the number of recipients.
+        """
+        counts = {}
+        for weight in weights:
+            if weight < 0:
+                raise ValueError('Weights must not be negative.')
+            counts[weight] = counts.get(weight, 0) + 1
+        total_weight = sum(weight * count for weight, count in counts.items())
+        if total_weight <= 0:
+            raise ValueError('At least one weight must be positive.')
+        copper = self.to_copper()
+        quotas = {}
+        leftover = copper
+        for weight, count in counts.items():
+            quota = copper * weight / total_weight
+            base = quota.numerator // quota.denominator
+            quotas[weight] = (base, quota - base)
+            leftover -= base * count
+        allocations = {weight: (quotas[weight][0], 0, count) for weight, count in counts.items()}
+        for weight in sorted(counts, key=lambda w: quotas[w][1], reverse=True):
+            if leftover <= 0:
+                break
+            extras = min(counts[weight], leftover)
+            allocations[weight] = (quotas[weight][0], extras, counts[weight])
+            leftover -= extras
+        return allocations
+
+class FrozenCurrency(Currency):
+    """Represents an immutable collection of the 5 types of coins.
+
+    Behaves like Currency, but raises AttributeError when a number of coins is changed, so it can
+    safely be shared between callers and used as a dictionary key. Arithmetic and the
+    consolidate and split methods return mutable Currency objects.
+    """
+    def __init__(self, platinum: int = 0, gold: int = 0, electrum: int = 0, silver: int = 0,
+                 copper: int = 0) -> None:
+        """Initializes the FrozenCurrency object with the given coin values.
+
+        Args:
+            platinum (int, optional): The number of platinum coins. Defaults to 0.
+            gold (int, optional): The number of gold coins. Defaults to 0.
+            electrum (int, optional): The number of electrum coins. Defaults to 0.
+            silver (int, optional): The number of silver coins. Defaults to 0.
+            copper (int, optional): The number of copper coins. Defaults to 0.
+        """
+        super().__init__(platinum, gold, electrum, silver, copper)
+        object.__setattr__(self, '_frozen', True)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Prevents changes once the object has been initialized.
+
+        Raises:
+            AttributeError: The object has been initialized.
+        """
+        if getattr(self, '_frozen', False):
+            raise AttributeError('FrozenCurrency objects cannot be modified.')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        """Prevents attributes from being deleted.
+
+        Raises:
+            AttributeError: Always.
+        """
+        raise AttributeError('FrozenCurrency objects cannot be modified.')
+
+    def freeze(self) -> FrozenCurrency:
+        """Return the object, which is already immutable.
+
+        Returns:
+            FrozenCurrency: The object.
+        """
+        return self
+
+class CurrencyBatch():
+    """Represents many Currency values stored as columns of coin counts.
+
+    Each coin is stored in an array of 64-bit integers, which is far more compact than a list of
+    Currency objects. Rows can be accessed by index as Currency objects.
+
+    Methods:
+        from_strings: Create a CurrencyBatch by parsing a column of strings.
+        from_currencies: Create a CurrencyBatch from Currency objects.
+        append: Add a Currency to the end of the batch.
+        to_strings: Return the string representation of every row.
+        to_copper: Return the value of every row in copper coins.
+        total: Return the sum of every row.
+    """
+    def __init__(self, platinum: Iterable[int] = (), gold: Iterable[int] = (),
+                 electrum: Iterable[int] = (), silver: Iterable[int] = (),
+                 copper: Iterable[int] = ()) -> None:
+        """Initializes the CurrencyBatch with the given columns of coins.
+
+        Args:
+            platinum (Iterable[int], optional): The numbers of platinum coins. Defaults to ().
+            gold (Iterable[int], optional): The numbers of gold coins. Defaults to ().
+            electrum (Iterable[int], optional): The numbers of electrum coins. Defaults to ().
+            silver (Iterable[int], optional): The numbers of silver coins. Defaults to ().
+            copper (Iterable[int], optional): The numbers of copper coins. Defaults to ().
+
+        Raises:
+            ValueError: The columns have different lengths.
+        """
+        self.platinum = array('q', platinum)
+        self.gold = array('q', gold)
+        self.electrum = array('q', electrum)
+        self.silver = array('q', silver)
+        self.copper = array('q', copper)
+        if len({len(column) for column in self._columns()}) > 1:
+            raise ValueError('All coin columns must have the same length.')
+
+    @classmethod
+    def from_strings(cls, lines: Iterable[str]) -> CurrencyBatch:
+        """Create a CurrencyBatch by parsing a column of strings.
+
+        Each string is parsed as with the Currency.parse() method. Surrounding whitespace, such as
+        the newlines of lines read from a file, is ignored.
+
+        Args:
+            lines (Iterable[str]): The strings to parse.
+
+        Raises:
+            ValueError: A string is not a valid representation of a Currency.
+
+        Returns:
+            CurrencyBatch: A CurrencyBatch with one row per string.
+        """
+        batch = cls()
+        add_platinum, add_gold, add_electrum, add_silver, add_copper = (
+            column.append for column in batch._columns())
+        for line in lines:
+            platinum, gold, electrum, silver, copper = _parse_coins(line)
+            add_platinum(platinum)
+            add_gold(gold)
+            add_electrum(electrum)
+            add_silver(silver)
+            add_copper(copper)
+        return batch
+
+    @classmethod
+    def from_currencies(cls, currencies: Iterable[Currency]) -> CurrencyBatch:
+        """Create a CurrencyBatch from Currency objects.
+
+        Args:
+            currencies (Iterable[Currency]): The Currency objects to store.
+
+        Returns:
+            CurrencyBatch: A CurrencyBatch with one row per Currency.
+        """
+        batch = cls()
+        for currency in currencies:
+            batch.append(currency)
+        return batch
+
+    def __len__(self) -> int:
+        """Return the number of rows in the batch."""
+        return len(self.copper)
+
+    def __getitem__(self, index: int) -> Currency:
+        """Return a row of the batch.
+
+        Args:
+            index (int): The index of the row.
+
+        Returns:
+            Currency: A Currency object with the coins of the row.
+        """
+        return Currency(*(column[index] for column in self._columns()))
+
+    def __iter__(self) -> Iterator[Currency]:
+        """Iterate over the rows of the batch as Currency objects."""
+        for coins in zip(*self._columns()):
+            yield Currency(*coins)
+
+    def append(self, currency: Currency) -> None:
+        """Add a Currency to the end of the batch.
+
+        Args:
+            currency (Currency): The Currency to add.
+        """
+        for column, count in zip(self._columns(), currency.key()):
+            column.append(count)
+
+    def to_strings(self) -> Iterator[str]:
+        """Return the string representation of every row.
+
+        Returns:
+            Iterator[str]: The string representations, as with str(Currency).
+        """
+        return (_format_coins(*coins) for coins in zip(*self._columns()))
+
+    def to_copper(self) -> array:
+        """Return the value of every row in copper coins.
+
+        Returns:
+            array: An array of the number of copper coins equivalent to each row.
+        """
+        return array('q', (platinum * 1000 + gold * 100 + electrum * 50 + silver * 10 + copper
+                           for platinum, gold, electrum, silver, copper in zip(*self._columns())))
+
+    def total(self) -> Currency:
+        """Return the sum of every row.
+
+        Returns:
+            Currency: A Currency object with the total number of each coin.
+        """
+        return Currency(*(sum(column) for column in self._columns()))
+
+    def _columns(self) -> Tuple[array, array, array, array, array]:
+        """Return the coin columns, from platinum to copper."""
+        return (self.platinum, self.gold, self.electrum, self.silver, self.copper)
+
+def cached_consolidate(currency: Currency,
+                       currencies: CurrencyOptions = CurrencyOptions.COMMON) -> FrozenCurrency:
+    """Return a consolidated copy of a Currency, reusing earlier results.
+
+    Results are cached on the canonical key of the Currency, so later changes to the Currency
+    do not affect the cache.
+
+    Args:
+        currency (Currency): The Currency to consolidate.
+        currencies (CurrencyOptions, optional): The coins to use when consolidating.
+            Defaults to CurrencyOptions.COMMON.
+
+    Returns:
+        FrozenCurrency: The consolidated Currency, as with the Currency.consolidate() method.
+    """
+    return _cached_consolidate(currency.key(), currencies)
+
+def cached_split(currency: Currency, players: int, consolidate: bool = True,
+                 consolidate_currencies: CurrencyOptions = CurrencyOptions.COMMON
+                 ) -> Tuple[FrozenCurrency, ...]:
+    """Return a split of a Currency, reusing earlier results.
+
+    Results are cached on the canonical key of the Currency, so later changes to the Currency
+    do not affect the cache.
+
+    Args:
+        currency (Currency): The Currency to split.
+        players (int): The number of players to split the Currency among.
+        consolidate (bool, optional): If True, the shares are consolidated. Defaults to True.
+        consolidate_currencies (CurrencyOptions, optional): The coins to use when
+            consolidating. Defaults to CurrencyOptions.COMMON.
+
+    Returns:
+        Tuple[FrozenCurrency, ...]: The shares, as with the Currency.split() method.
+    """
+    return _cached_split(currency.key(), players, consolidate, consolidate_currencies)
+
+def currency_cache_info() -> Dict[str, tuple]:
+    """Return the hit statistics of the Currency caches.
+
+    Returns:
+        Dict[str, tuple]: The functools cache info of the consolidate and split caches.
+    """
+    # pylint checks cache_info() against the parameters of the wrapped function.
+    # pylint: disable=no-value-for-parameter
+    return {'consolidate': _cached_consolidate.cache_info(), 'split': _cached_split.cache_info()}
+
+def clear_currency_cache() -> None:
+    """Clear the Currency caches."""
+    _cached_consolidate.cache_clear()
+    _cached_split.cache_clear()
+
+@lru_cache(maxsize=1024)
+def _cached_consolidate(key: Tuple[int, int, int, int, int],
+                        currencies: CurrencyOptions) -> FrozenCurrency:
+    """Consolidate the Currency with the given key. Used by cached_consolidate()."""
+    return Currency(*key).consolidate(currencies).freeze()
+
+@lru_cache(maxsize=1024)
+def _cached_split(key: Tuple[int, int, int, int, int], players: int, consolidate: bool,
+                  consolidate_currencies: CurrencyOptions) -> Tuple[FrozenCurrency, ...]:
+    """Split the Currency with the given key. Used by cached_split()."""
+    return tuple(share.freeze()
+                 for share in Currency(*key).split(players, consolidate, consolidate_currencies))
+
+def _format_coins(platinum: int, gold: int, electrum: int, silver: int, copper: int) -> str:
+    """Return the string representation of the given coins.
+
+    Coins are omitted unless positive. Copper is also shown when the total value is not
+    positive, so an empty Currency is represented as "0cp".
+    """
+    parts = []
+    if platinum > 0:
+        parts.append(f'{platinum}pp')
+    if gold > 0:
+        parts.append(f'{gold}gp')
+    if electrum > 0:
+        parts.append(f'{electrum}ep')
+    if silver > 0:
+        parts.append(f'{silver}sp')
+    if copper > 0 or (platinum * 1000 + gold * 100 + electrum * 50 + silver * 10 + copper) <= 0:
+        parts.append(f'{copper}cp')
+    return ', '.join(parts)
+
+def _parse_coins(text: str) -> List[int]:
+    """Parse a string representation of coins.
+
+    Raises:
+        ValueError: The string is not a valid representation of a Currency.
+
+    Returns:
+        List[int]: The number of platinum, gold, electrum, silver, and copper coins.
+    """
+    coins = [0, 0, 0, 0, 0]
+    for token in text.lower().split(','):
+        token = token.strip()
+        try:
+            coins[_COIN_INDEX[token[-2:]]] += int(token[:-2])
+        except (KeyError, ValueError):
+            raise ValueError(f'Invalid currency: {text!r}') from None
+    return coins
+
+def _coins_needed(owed: List[int], amount: int, value: int) -> int:
+    """Return the number of coins needed to bring every amount owed down to at most amount.
+
+    Args:
+        owed (List[int]): The value in copper still owed to each recipient.
+        amount (int): The largest value in copper that may still be owed.
+        value (int): The value in copper of each coin.
+
+    Returns:
+        int: The number of coins.
+    """
+    return sum(-(-(debt - amount) // value) for debt in owed if debt > amount)
+
+def _to_fraction(weight: Union[int, float, str, Fraction]) -> Fraction:
+    """Convert a weight into an exact Fraction.
+
+    Floats are converted using their decimal representation, so 0.1 becomes 1/10.
+
+    Args:
+        weight (Union[int, float, str, Fraction]): The weight to convert.
+
+    Returns:
+        Fraction: The converted weight.
+    """
+    if isinstance(weight, float):
+        return Fraction(str(weight))
+    return Fraction(weight)
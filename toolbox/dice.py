@@ -0,0 +1,358 @@
+"""Parse and evaluate dice expressions such as "2d6+1d8+5" in Dungeons & Dragons 5th edition.
+
+An expression is a sum of terms. Each term is a whole number or a dice roll written as NdS,
+where S is the number of sides of one of the Dice members (or % for d100) and N defaults to 1.
+Dice rolls take modifiers after the die:
+
+    khK or kK: Keep the K highest dice, such as 4d6kh3 for ability scores.
+    klK: Keep the K lowest dice, such as 2d20kl1 for disadvantage.
+    rR: Reroll each die showing R or lower once and use the new roll, such as 2d6r2 for Great
+        Weapon Fighting.
+
+Expressions compile to an exact distribution the first time it is needed, and parse() memoizes
+the expressions it returns, so repeated strings share one DiceExpression and its distribution.
+The work of compiling grows with the number of dice, their sides, and the dice kept, so parse()
+rejects expressions that would take more than MAX_COST steps, as well as more than MAX_DICE dice.
+
+Classes:
+    DiceTerm: A roll of one or more dice of the same type.
+    DiceExpression: A parsed dice expression with an exact distribution.
+
+Functions:
+    parse: Parse a dice expression.
+"""
+from __future__ import annotations, absolute_import
+import random
+import re
+from bisect import bisect_left
+from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate
+from math import factorial
+from typing import Dict, List, NamedTuple, Optional, Tuple
+try:
+    from .combat import Dice
+except ImportError:
+    from combat import Dice
+
+MAX_DICE = 100
+# About half a second of compiling in the worst case.
+MAX_COST = 2000000
+
+# The largest total weight that random.choices can sample without rounding.
+_MAX_FLOAT_WEIGHT = 2 ** 53
+
+_DICE_TERM = re.compile(r'(\d*)d(\d+|%)((?:kh|kl|k|r)\d+)*')
+_MODIFIER = re.compile(r'(kh|kl|k|r)(\d+)')
+
+class DiceTerm(NamedTuple):
+    """Represents a roll of one or more dice of the same type.
+
+    Attributes:
+        count: The number of dice rolled.
+        die: The Dice member rolled.
+        keep: The number of dice kept, or 0 to keep all of them.
+        keep_highest: If the highest dice are kept, otherwise the lowest.
+        reroll: Dice showing this value or lower are rerolled once, or 0 to never reroll.
+        sign: 1 if the term is added, -1 if it is subtracted.
+    """
+    count: int
+    die: Dice
+    keep: int = 0
+    keep_highest: bool = True
+    reroll: int = 0
+    sign: int = 1
+
+    def __str__(self) -> str:
+        text = f'{self.count}d{int(self.die)}'
+        if self.keep:
+            text += f"{'kh' if self.keep_highest else 'kl'}{self.keep}"
+        if self.reroll:
+            text += f'r{self.reroll}'
+        return text
+
+class DiceExpression():
+    """Represents a parsed dice expression with an exact distribution.
+
+    The distribution is calculated with integer weights, so probabilities and the mean are exact
+    fractions. It is calculated once, the first time it is needed.
+
+    Attributes:
+        terms: The dice rolls of the expression.
+        constant: The sum of the whole number terms.
+
+    Methods:
+        distribution: Return the probability of each total.
+        mean: Return the average total.
+        minimum: Return the lowest possible total.
+        maximum: Return the highest possible total.
+        roll: Roll the expression once.
+        sample: Roll the expression several times at once.
+    """
+    def __init__(self, terms: Tuple[DiceTerm, ...], constant: int = 0) -> None:
+        """Initializes the DiceExpression.
+
+        Args:
+            terms (Tuple[DiceTerm, ...]): The dice rolls of the expression.
+            constant (int, optional): The sum of the whole number terms. Defaults to 0.
+        """
+        self.terms = tuple(terms)
+        self.constant = constant
+        self._totals = None
+        self._cumulative_weights = None
+        self._weight_total = 1
+
+    def __str__(self) -> str:
+        text = ''
+        for term in self.terms:
+            text += f"{'-' if term.sign < 0 else '+' if text else ''}{term}"
+        if self.constant or not text:
+            text += f"{'+' if text and self.constant >= 0 else ''}{self.constant}"
+        return text
+
+    def __repr__(self) -> str:
+        return f"parse('{self}')"
+
+    def distribution(self) -> Dict[int, Fraction]:
+        """Return the probability of each total.
+
+        Returns:
+            Dict[int, Fraction]: The probability of each possible total, in increasing order of
+            total.
+        """
+        self._compile()
+        previous = 0
+        probabilities = {}
+        for total, cumulative_weight in zip(self._totals, self._cumulative_weights):
+            probabilities[total] = Fraction(cumulative_weight - previous, self._weight_total)
+            previous = cumulative_weight
+        return probabilities
+
+    def mean(self) -> Fraction:
+        """Return the average total.
+
+        Returns:
+            Fraction: The exact average total.
+        """
+        self._compile()
+        # Summed as integer weights, with a single division at the end.
+        previous = 0
+        weighted_sum = 0
+        for total, cumulative_weight in zip(self._totals, self._cumulative_weights):
+            weighted_sum += total * (cumulative_weight - previous)
+            previous = cumulative_weight
+        return Fraction(weighted_sum, self._weight_total)
+
+    def minimum(self) -> int:
+        """Return the lowest possible total."""
+        self._compile()
+        return self._totals[0]
+
+    def maximum(self) -> int:
+        """Return the highest possible total."""
+        self._compile()
+        return self._totals[-1]
+
+    def roll(self, rng: Optional[random.Random] = None) -> int:
+        """Roll the expression once.
+
+        Args:
+            rng (Optional[random.Random], optional): The random number generator to use.
+                Defaults to the random module.
+
+        Returns:
+            int: The total rolled.
+        """
+        return self.sample(1, rng)[0]
+
+    def sample(self, count: int, rng: Optional[random.Random] = None) -> List[int]:
+        """Roll the expression several times at once.
+
+        Totals are drawn straight from the compiled distribution, so the cost of each roll does
+        not depend on the number of dice.
+
+        Args:
+            count (int): The number of rolls.
+            rng (Optional[random.Random], optional): The random number generator to use.
+                Defaults to the random module.
+
+        Returns:
+            List[int]: The total of each roll.
+        """
+        self._compile()
+        rng = rng or random
+        if self._weight_total <= _MAX_FLOAT_WEIGHT:
+            return rng.choices(self._totals, cum_weights=self._cumulative_weights, k=count)
+        # Larger weights lose precision as floats, so draw integer positions instead.
+        positions = (rng.randrange(self._weight_total) for _ in range(count))
+        return [self._totals[bisect_left(self._cumulative_weights, position + 1)]
+                for position in positions]
+
+    def _compile(self) -> None:
+        """Calculate the distribution of the expression if it has not been calculated yet."""
+        if self._totals is not None:
+            return
+        weights, weight_total = {self.constant: 1}, 1
+        for term in self.terms:
+            term_weights, term_total = _term_weights(term)
+            weights = _convolve(weights, {term.sign * total: weight
+                                          for total, weight in term_weights.items()})
+            weight_total *= term_total
+        totals = sorted(weights)
+        self._cumulative_weights = list(accumulate(weights[total] for total in totals))
+        self._weight_total = weight_total
+        # Set last, since other threads only read the distribution once the totals are set.
+        self._totals = totals
+
+@lru_cache(maxsize=1024)
+def parse(text: str) -> DiceExpression:
+    """Parse a dice expression.
+
+    Results are memoized, so parsing the same string again returns the same DiceExpression.
+
+    Args:
+        text (str): The expression, such as "2d6+1d8+5" or "4d6kh3". Spaces and case are
+            ignored.
+
+    Raises:
+        ValueError: The expression is invalid, uses a die that is not a Dice member, rolls
+            more than MAX_DICE dice, or would take more than MAX_COST steps to compile.
+
+    Returns:
+        DiceExpression: The parsed expression.
+    """
+    parts = re.split(r'([+-])', text.replace(' ', '').lower())
+    if parts[0] == '':
+        parts = parts[1:]
+    else:
+        parts.insert(0, '+')
+    if not parts:
+        raise ValueError(f"Invalid dice expression '{text}'.")
+    terms = []
+    constant = 0
+    for sign, part in zip(parts[::2], parts[1::2]):
+        sign = -1 if sign == '-' else 1
+        if part.isdigit():
+            constant += sign * int(part)
+        elif _DICE_TERM.fullmatch(part):
+            terms.append(_parse_term(part, sign, text))
+        else:
+            raise ValueError(f"Invalid dice expression '{text}'.")
+    if sum(term.count for term in terms) > MAX_DICE:
+        raise ValueError(f'Dice expressions can roll at most {MAX_DICE} dice.')
+    if _compile_cost(terms) > MAX_COST:
+        raise ValueError(f"Dice expression '{text}' is too large to calculate.")
+    return DiceExpression(tuple(terms), constant)
+
+def _parse_term(part: str, sign: int, text: str) -> DiceTerm:
+    """Parse a dice roll term of an expression."""
+    count, sides, _ = _DICE_TERM.fullmatch(part).groups()
+    count = int(count) if count else 1
+    sides = 100 if sides == '%' else int(sides)
+    try:
+        die = Dice(sides)
+    except ValueError:
+        raise ValueError(f'Unknown die d{sides}.') from None
+    if count < 1 or die == Dice.D0:
+        raise ValueError(f"Invalid dice expression '{text}'.")
+    keep, keep_highest, reroll = 0, True, 0
+    for modifier, value in _MODIFIER.findall(part[part.index('d') + 1:]):
+        value = int(value)
+        if modifier == 'r':
+            if reroll or not 0 < value < sides:
+                raise ValueError(f"Invalid reroll in '{part}'.")
+            reroll = value
+        else:
+            if keep or not 0 < value <= count:
+                raise ValueError(f"Invalid keep in '{part}'.")
+            keep, keep_highest = value, modifier != 'kl'
+    return DiceTerm(count, die, keep, keep_highest, reroll, sign)
+
+def _compile_cost(terms: List[DiceTerm]) -> int:
+    """Return an upper bound of the steps needed to compile the distribution of dice terms."""
+    cost = 0
+    span = 1
+    for term in terms:
+        sides = int(term.die)
+        term_span = term.count * sides + 1
+        if term.keep and term.keep != term.count:
+            # Every face visits every state of dice rolled and kept total, for each number of
+            # dice showing that face.
+            cost += sides * (term.count + 1) * (term.keep * sides + 1) * (term.count + 1)
+        else:
+            # Each die adds a running sum over the totals of the dice before it, for each run
+            # of faces with the same weight.
+            cost += term.count * term_span * (2 if term.reroll else 1)
+        # The term is convolved with the totals of the terms before it.
+        cost += span * term_span
+        span += term_span - 1
+    return cost
+
+def _term_weights(term: DiceTerm) -> Tuple[Dict[int, int], int]:
+    """Return the integer weight of each total of a term, and the sum of the weights."""
+    sides = int(term.die)
+    if term.reroll:
+        # A die first showing the reroll value or lower takes the value of the second roll.
+        face_weights = {face: (sides if face > term.reroll else 0) + term.reroll
+                        for face in range(1, sides + 1)}
+        face_total = sides * sides
+    else:
+        face_weights = {face: 1 for face in range(1, sides + 1)}
+        face_total = sides
+    weight_total = face_total ** term.count
+    if not term.keep or term.keep == term.count:
+        return _sum_weights(face_weights, term.count), weight_total
+    return _keep_weights(face_weights, term.count, term.keep, term.keep_highest), weight_total
+
+def _sum_weights(face_weights: Dict[int, int], count: int) -> Dict[int, int]:
+    """Return the weight of each total of a roll, adding one die at a time with running sums."""
+    # Faces as runs of equal weight, which is one run without rerolls and two with them.
+    runs = []
+    for face in sorted(face_weights):
+        if runs and runs[-1][2] == face_weights[face]:
+            runs[-1][1] = face
+        else:
+            runs.append([face, face, face_weights[face]])
+    weights = [1]
+    for _ in range(count):
+        # sums[index] is the sum of the weights of the totals below index.
+        sums = [0] + list(accumulate(weights))
+        next_weights = [0] * (len(weights) + runs[-1][1])
+        for first, last, weight in runs:
+            for total in range(first, len(next_weights)):
+                low, high = max(total - last, 0), min(total - first, len(weights) - 1)
+                if low <= high:
+                    next_weights[total] += weight * (sums[high + 1] - sums[low])
+        weights = next_weights
+    return {total: weight for total, weight in enumerate(weights) if weight}
+
+def _keep_weights(face_weights: Dict[int, int], count: int, keep: int,
+                  keep_highest: bool) -> Dict[int, int]:
+    """Return the weight of each total when keeping the highest or lowest dice of a roll."""
+    # Faces are visited from the most to the least preferred. Each state is the number of dice
+    # showing a visited face and the total of the kept dice among them, mapped to its weight.
+    states = {(0, 0): 1}
+    for face in sorted(face_weights, reverse=keep_highest):
+        face_weight = face_weights[face]
+        next_states = {}
+        for (rolled, total), weight in states.items():
+            for same in range(count - rolled + 1):
+                kept = max(min(rolled + same, keep) - rolled, 0)
+                key = (rolled + same, total + kept * face)
+                ways = _binomial(count - rolled, same) * face_weight ** same
+                next_states[key] = next_states.get(key, 0) + weight * ways
+        states = next_states
+    return {total: weight for (rolled, total), weight in states.items() if rolled == count}
+
+def _convolve(first: Dict[int, int], second: Dict[int, int]) -> Dict[int, int]:
+    """Return the weights of the sum of two independent totals."""
+    weights = {}
+    for first_total, first_weight in first.items():
+        for second_total, second_weight in second.items():
+            total = first_total + second_total
+            weights[total] = weights.get(total, 0) + first_weight * second_weight
+    return weights
+
+def _binomial(total: int, chosen: int) -> int:
+    """Return the number of ways to choose items from a total."""
+    return factorial(total) // (factorial(chosen) * factorial(total - chosen))
@@ -0,0 +1,205 @@
+"""Calculate the time needed to train during downtime in Dungeons & Dragons 5th edition.
+
+Training takes BASE_DOWNTIME_DAYS divided by a score based on the character's abilities, rounded
+up. Gaining expertise takes twice as long as gaining proficiency.
+
+The *_days_curve functions return the days for every ability score from MIN_ABILITY_SCORE to
+MAX_ABILITY_SCORE at once. They slice tables of days calculated once at import, so a whole curve
+costs about as much as one day count.
+
+Functions:
+    language_training_days: Return the days needed to learn a language.
+    proficiency_training_days: Return the days needed to gain a proficiency from an ability.
+    skill_training_days: Return the days needed to gain proficiency and expertise in a skill.
+    tool_check_bonus: Return the bonus of a skill check used to train with a tool.
+    tool_training_days: Return the days needed to gain proficiency and expertise with a tool.
+    proficiency_days_curve: Return the days needed to gain a proficiency at every ability score.
+    skill_days_curve: Return the days needed to train a skill at every ability score.
+    language_days_curve: Return the days needed to learn a language at every score of one
+        mental ability.
+    tool_days_curve: Return the days needed to train a tool at every score of one ability.
+    set_base_downtime_days: Replace BASE_DOWNTIME_DAYS, such as from a rule pack.
+"""
+from __future__ import division, absolute_import
+from math import ceil, floor
+from typing import Iterable, Tuple
+
+BASE_DOWNTIME_DAYS = 250
+MIN_ABILITY_SCORE = 1
+MAX_ABILITY_SCORE = 30
+ABILITY_SCORES = tuple(range(MIN_ABILITY_SCORE, MAX_ABILITY_SCORE + 1))
+
+def language_training_days(intelligence: int, wisdom: int, charisma: int) -> int:
+    """Return the days needed to learn a language.
+
+    The score is the sum of how far each mental ability score is above 10, and at least 1.
+
+    Args:
+        intelligence (int): The intelligence score of the character.
+        wisdom (int): The wisdom score of the character.
+        charisma (int): The charisma score of the character.
+
+    Returns:
+        int: The number of days.
+    """
+    score = sum(max(ability_score - 10, 0) for ability_score in (intelligence, wisdom, charisma))
+    return ceil(BASE_DOWNTIME_DAYS / max(score, 1))
+
+def proficiency_training_days(ability_score: int) -> int:
+    """Return the days needed to gain a proficiency, such as a weapon or armor, from an ability.
+
+    Args:
+        ability_score (int): The score of the ability used to train. Scores below 1 count as 1.
+
+    Returns:
+        int: The number of days.
+    """
+    return ceil(BASE_DOWNTIME_DAYS / max(ability_score, 1))
+
+def skill_training_days(ability_score: int) -> Tuple[int, int]:
+    """Return the days needed to gain proficiency and expertise in a skill.
+
+    Args:
+        ability_score (int): The score of the ability used by the skill. Scores below 1 count
+            as 1.
+
+    Returns:
+        Tuple[int, int]: The days to gain proficiency, and the additional days to gain
+        expertise.
+    """
+    ability_score = max(ability_score, 1)
+    return (ceil(BASE_DOWNTIME_DAYS / ability_score),
+            ceil(2 * BASE_DOWNTIME_DAYS / ability_score))
+
+def tool_check_bonus(ability_score: int, proficiency_bonus: int, proficient: bool,
+                     bonus: int = 0) -> int:
+    """Return the bonus of a skill check used to train with a tool.
+
+    Args:
+        ability_score (int): The score of the ability used by the skill.
+        proficiency_bonus (int): The proficiency bonus of the character.
+        proficient (bool): If the character is proficient in the skill.
+        bonus (int, optional): Any other bonus to the check. Defaults to 0.
+
+    Returns:
+        int: The ability modifier, plus the proficiency bonus if proficient, plus the bonus.
+    """
+    return floor((ability_score - 10) / 2) + (proficiency_bonus if proficient else 0) + bonus
+
+def tool_training_days(check_bonuses: Iterable[int]) -> Tuple[int, int]:
+    """Return the days needed to gain proficiency and expertise with a tool.
+
+    The score is 10 plus the average bonus of the skills related to the tool, and at least 1.
+
+    Args:
+        check_bonuses (Iterable[int]): The check bonus of each skill related to the tool, as
+            returned by tool_check_bonus().
+
+    Raises:
+        ValueError: No check bonuses are given.
+
+    Returns:
+        Tuple[int, int]: The days to gain proficiency, and the additional days to gain
+        expertise.
+    """
+    check_bonuses = list(check_bonuses)
+    if not check_bonuses:
+        raise ValueError('A tool needs at least 1 related skill.')
+    score = max(sum(check_bonuses) / len(check_bonuses) + 10, 1)
+    return ceil(BASE_DOWNTIME_DAYS / score), ceil(2 * BASE_DOWNTIME_DAYS / score)
+
+def proficiency_days_curve() -> Tuple[int, ...]:
+    """Return the days needed to gain a proficiency, such as a weapon or armor, at every score.
+
+    Returns:
+        Tuple[int, ...]: The days for each score in ABILITY_SCORES.
+    """
+    return _PROFICIENCY_DAYS
+
+def skill_days_curve() -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Return the days needed to gain proficiency and expertise in a skill at every score.
+
+    Returns:
+        Tuple[Tuple[int, ...], Tuple[int, ...]]: The days to gain proficiency, and the
+        additional days to gain expertise, for each score in ABILITY_SCORES of the skill's
+        ability.
+    """
+    return _PROFICIENCY_DAYS, _EXPERTISE_DAYS
+
+def language_days_curve(other_scores: Iterable[int]) -> Tuple[int, ...]:
+    """Return the days needed to learn a language at every score of one mental ability.
+
+    Args:
+        other_scores (Iterable[int]): The scores of the other two of intelligence, wisdom, and
+            charisma.
+
+    Raises:
+        ValueError: A score is not between MIN_ABILITY_SCORE and MAX_ABILITY_SCORE.
+
+    Returns:
+        Tuple[int, ...]: The days for each score in ABILITY_SCORES of the varied ability.
+    """
+    other_scores = list(other_scores)
+    if any(not MIN_ABILITY_SCORE <= score <= MAX_ABILITY_SCORE for score in other_scores):
+        raise ValueError(f'Ability scores must be between {MIN_ABILITY_SCORE} and '
+                         f'{MAX_ABILITY_SCORE}.')
+    base = sum(max(score - 10, 0) for score in other_scores)
+    # Scores up to 10 add nothing, and each point above 10 adds 1 to the language score.
+    return ((_LANGUAGE_DAYS[base],) * (10 - MIN_ABILITY_SCORE + 1)
+            + _LANGUAGE_DAYS[base + 1:base + MAX_ABILITY_SCORE - 10 + 1])
+
+def tool_days_curve(fixed_bonuses: Iterable[int], varied_bonuses: Iterable[int]
+                    ) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Return the days needed to train a tool at every score of one ability.
+
+    Args:
+        fixed_bonuses (Iterable[int]): The check bonus of each skill related to the tool that
+            does not use the varied ability, as returned by tool_check_bonus().
+        varied_bonuses (Iterable[int]): The check bonus of each skill related to the tool that
+            uses the varied ability, without the ability modifier.
+
+    Raises:
+        ValueError: No check bonuses are given.
+
+    Returns:
+        Tuple[Tuple[int, ...], Tuple[int, ...]]: The days to gain proficiency, and the
+        additional days to gain expertise, for each score in ABILITY_SCORES of the varied
+        ability.
+    """
+    fixed_bonuses, varied_bonuses = list(fixed_bonuses), list(varied_bonuses)
+    count = len(fixed_bonuses) + len(varied_bonuses)
+    if not count:
+        raise ValueError('A tool needs at least 1 related skill.')
+    total = sum(fixed_bonuses) + sum(varied_bonuses)
+    # Matches tool_training_days, which averages the bonuses before adding 10.
+    scores = [max((total + len(varied_bonuses) * ability_modifier) / count + 10, 1)
+              for ability_modifier in _MODIFIERS]
+    return (tuple(ceil(BASE_DOWNTIME_DAYS / score) for score in scores),
+            tuple(ceil(2 * BASE_DOWNTIME_DAYS / score) for score in scores))
+
+def set_base_downtime_days(days: int) -> None:
+    """Replace BASE_DOWNTIME_DAYS, such as from a rule pack, and recalculate the curve tables.
+
+    Args:
+        days (int): The days of training divided by the training score.
+
+    Raises:
+        ValueError: The days are less than 1.
+    """
+    if days < 1:
+        raise ValueError('The base downtime days must be at least 1.')
+    global BASE_DOWNTIME_DAYS
+    BASE_DOWNTIME_DAYS = int(days)
+    _build_tables()
+
+def _build_tables() -> None:
+    """Calculate the tables of days sliced by the curve functions."""
+    global _PROFICIENCY_DAYS, _EXPERTISE_DAYS, _LANGUAGE_DAYS
+    _PROFICIENCY_DAYS = tuple(proficiency_training_days(score) for score in ABILITY_SCORES)
+    _EXPERTISE_DAYS = tuple(skill_training_days(score)[1] for score in ABILITY_SCORES)
+    # Indexed by the language score, which is at most 3 abilities of MAX_ABILITY_SCORE above 10.
+    _LANGUAGE_DAYS = tuple(ceil(BASE_DOWNTIME_DAYS / max(score, 1))
+                           for score in range(3 * (MAX_ABILITY_SCORE - 10) + 1))
+
+_MODIFIERS = tuple(floor((score - 10) / 2) for score in ABILITY_SCORES)
+_build_tables()
@@ -0,0 +1,452 @@
+"""Analyze a party of attackers against an encounter of monsters in Dungeons & Dragons 5th edition.
+
+A DamageMatrix holds the expected damage per round of every party member against every monster,
+taking armor class, resistances, immunities, and vulnerabilities into account. Expected values
+are used throughout, so rounds are estimates for an average fight rather than a simulation.
+
+Classes:
+    Monster: A target with an armor class, hit points, and damage modifiers.
+    PartyMember: A party member that makes one or more weapon attacks each round.
+    DamageMatrix: The expected damage of each party member against each monster.
+    FocusFirePlan: The order in which a party kills an encounter, and the rounds it takes.
+
+Functions:
+    plan_focus_fire: Find the kill order that ends an encounter in the fewest expected rounds.
+"""
+from __future__ import annotations, absolute_import
+from copy import copy
+from functools import lru_cache
+from math import ceil, inf
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+try:
+    from .combat import DamageType, Dice, WeaponAttack
+except ImportError:
+    from combat import DamageType, Dice, WeaponAttack
+
+# Remaining hit points at or below this are treated as 0, absorbing floating point error.
+_EPSILON = 1e-9
+
+class Monster(NamedTuple):
+    """Represents a target with an armor class, hit points, and damage modifiers.
+
+    Attributes:
+        name: The name of the monster.
+        armor_class: The AC of the monster.
+        hit_points: The hit points of the monster.
+        resistances: The damage types that deal half damage.
+        immunities: The damage types that deal no damage.
+        vulnerabilities: The damage types that deal double damage.
+    """
+    name: str
+    armor_class: int
+    hit_points: int
+    resistances: FrozenSet[DamageType] = frozenset()
+    immunities: FrozenSet[DamageType] = frozenset()
+    vulnerabilities: FrozenSet[DamageType] = frozenset()
+
+    def damage_multiplier(self, damage_type: DamageType) -> float:
+        """Return the factor that damage of a type is multiplied by against the monster.
+
+        Args:
+            damage_type (DamageType): The type of damage.
+
+        Returns:
+            float: 0 if immune, otherwise 0.5 for resistance times 2 for vulnerability.
+        """
+        if damage_type in self.immunities:
+            return 0.0
+        multiplier = 1.0
+        if damage_type in self.resistances:
+            multiplier /= 2
+        if damage_type in self.vulnerabilities:
+            multiplier *= 2
+        return multiplier
+
+class PartyMember(NamedTuple):
+    """Represents a party member that makes one or more weapon attacks each round.
+
+    Attributes:
+        name: The name of the party member.
+        attack: The WeaponAttack made by the party member.
+        attacks_per_round: The number of attacks made each round, such as with Extra Attack.
+    """
+    name: str
+    attack: WeaponAttack
+    attacks_per_round: int = 1
+
+class DamageMatrix():
+    """Represents the expected damage of each party member against each monster.
+
+    Each party member's damage is split by damage type once, and hit chances are looked up in
+    tables shared by all attacks with the same hit bonus, so building the matrix only calculates
+    each distinct combination of attack, armor class, and damage modifiers once.
+
+    Attributes:
+        party: The party members, in the order of the rows.
+        monsters: The monsters, in the order of the columns.
+        attack_damage: The expected damage of a single attack of each party member against each
+            monster, indexed by [member][monster].
+
+    Methods:
+        damage_per_round: Return the expected damage per round of a party member against a monster.
+        party_damage_per_round: Return the expected damage per round of the party against a
+            monster.
+        rounds_to_kill: Return the expected rounds for a party member to kill a monster alone.
+        party_rounds_to_kill: Return the expected rounds for the party to kill a monster together.
+    """
+    def __init__(self, party: Sequence[PartyMember], monsters: Sequence[Monster]) -> None:
+        """Initializes the DamageMatrix.
+
+        Args:
+            party (Sequence[PartyMember]): The party members.
+            monsters (Sequence[Monster]): The monsters of the encounter.
+
+        Raises:
+            ValueError: The party or the encounter is empty.
+        """
+        if not party:
+            raise ValueError('The party needs at least 1 member.')
+        if not monsters:
+            raise ValueError('The encounter needs at least 1 monster.')
+        self.party = list(party)
+        self.monsters = list(monsters)
+        armor_classes = tuple(sorted({monster.armor_class for monster in self.monsters}))
+        # Monsters with the same damage modifiers share the multipliers of each damage type.
+        profiles = {}
+        for monster in self.monsters:
+            key = (monster.resistances, monster.immunities, monster.vulnerabilities)
+            if key not in profiles:
+                profiles[key] = {damage_type: monster.damage_multiplier(damage_type)
+                                 for damage_type in DamageType}
+        self.attack_damage = []
+        for member in self.party:
+            hit_table = dict(zip(armor_classes,
+                                 _hit_table(member.attack.hit_bonus, armor_classes)))
+            damages = _split_damage(member.attack)
+            # The hit and critical hit damage against each profile, ignoring the AC.
+            profile_damage = {
+                key: (sum(hit * multipliers[damage_type]
+                          for damage_type, (hit, _) in damages.items()),
+                      sum(critical * multipliers[damage_type]
+                          for damage_type, (_, critical) in damages.items()) / Dice.D20)
+                for key, multipliers in profiles.items()
+            }
+            row = []
+            for monster in self.monsters:
+                hit, critical = profile_damage[(monster.resistances, monster.immunities,
+                                                monster.vulnerabilities)]
+                row.append(max(hit_table[monster.armor_class] * hit + critical, 0.0))
+            self.attack_damage.append(row)
+
+    def damage_per_round(self, member: int, monster: int) -> float:
+        """Return the expected damage per round of a party member against a monster.
+
+        Args:
+            member (int): The index of the party member.
+            monster (int): The index of the monster.
+
+        Returns:
+            float: The expected damage of all the party member's attacks in a round.
+        """
+        return self.attack_damage[member][monster] * self.party[member].attacks_per_round
+
+    def party_damage_per_round(self, monster: int) -> float:
+        """Return the expected damage per round of the whole party against a monster.
+
+        Args:
+            monster (int): The index of the monster.
+
+        Returns:
+            float: The expected damage of every attack of every party member in a round.
+        """
+        return sum(self.damage_per_round(member, monster) for member in range(len(self.party)))
+
+    def rounds_to_kill(self, member: int, monster: int) -> float:
+        """Return the expected rounds for a party member to kill a monster alone.
+
+        Args:
+            member (int): The index of the party member.
+            monster (int): The index of the monster.
+
+        Returns:
+            float: The monster's hit points divided by the expected damage per round, which is
+            infinite if the party member cannot damage the monster.
+        """
+        damage = self.damage_per_round(member, monster)
+        return self.monsters[monster].hit_points / damage if damage > 0 else inf
+
+    def party_rounds_to_kill(self, monster: int) -> float:
+        """Return the expected rounds for the whole party to kill a monster together.
+
+        Args:
+            monster (int): The index of the monster.
+
+        Returns:
+            float: The monster's hit points divided by the party's expected damage per round,
+            which is infinite if no party member can damage the monster.
+        """
+        damage = self.party_damage_per_round(monster)
+        return self.monsters[monster].hit_points / damage if damage > 0 else inf
+
+class FocusFirePlan(NamedTuple):
+    """Represents the order in which a party kills an encounter, and the rounds it takes.
+
+    Attributes:
+        order: The monster indexes in the order they are focused.
+        rounds: The expected number of rounds until every monster is dead.
+        kill_rounds: The round each monster dies in, indexed like the monsters.
+        targets: For each round, the monster index targeted by each attack of each party
+            member, or None for attacks with nothing left to target.
+    """
+    order: Tuple[int, ...]
+    rounds: int
+    kill_rounds: Tuple[int, ...]
+    targets: Tuple[Tuple[Tuple[int, ...], ...], ...]
+
+def plan_focus_fire(matrix: DamageMatrix, max_exhaustive: int = 7) -> FocusFirePlan:
+    """Find the kill order that ends an encounter in the fewest expected rounds.
+
+    Each round, every attack targets the first monster in the kill order that is still alive
+    and that the attacker can damage, so damage that kills a monster spills over to the next
+    one. Kill orders with the same number of rounds are ranked by the total rounds the monsters
+    stay alive, which favors killing monsters early.
+
+    Every kill order is searched for encounters of up to max_exhaustive monsters. Monsters with
+    the same hit points and the same damage taken from every attack are interchangeable, so
+    only one order of them is tried, and an order is abandoned as soon as it cannot beat the
+    best order found so far. Larger encounters start from the monsters the party kills fastest
+    and improve the order by swapping pairs of monsters until no swap helps.
+
+    Rounds in which no monster dies are skipped in one step, so the work depends on the number
+    of monsters rather than the number of rounds.
+
+    Args:
+        matrix (DamageMatrix): The damage of the party against the encounter.
+        max_exhaustive (int, optional): The most monsters to try every kill order for. Defaults
+            to 7.
+
+    Raises:
+        ValueError: No party member can damage one of the monsters.
+
+    Returns:
+        FocusFirePlan: The best kill order found.
+    """
+    for monster in range(len(matrix.monsters)):
+        if matrix.party_damage_per_round(monster) <= 0:
+            raise ValueError(f'No party member can damage {matrix.monsters[monster].name}.')
+    if len(matrix.monsters) <= max_exhaustive:
+        return _simulate(matrix, _search_order(matrix), True)
+    order = sorted(range(len(matrix.monsters)), key=matrix.party_rounds_to_kill)
+    best = _simulate(matrix, order)
+    improved = True
+    while improved:
+        improved = False
+        for first in range(len(order)):
+            for second in range(first + 1, len(order)):
+                candidate = list(best.order)
+                candidate[first], candidate[second] = candidate[second], candidate[first]
+                plan = _simulate(matrix, candidate)
+                if _plan_cost(plan) < _plan_cost(best):
+                    best = plan
+                    improved = True
+    return _simulate(matrix, best.order, True)
+
+@lru_cache(maxsize=256)
+def _hit_table(hit_bonus: int, armor_classes: Tuple[int, ...]) -> Tuple[float, ...]:
+    """Return the chance of a hit that is not critical against each AC, for a hit bonus."""
+    # Matches WeaponAttack.average_damage, where a natural 1 misses and a natural 20 is critical.
+    return tuple(max(min(Dice.D20 - armor_class + hit_bonus + 1, 19) - 1, 1) / Dice.D20
+                 for armor_class in armor_classes)
+
+def _split_damage(attack: WeaponAttack) -> Dict[DamageType, Tuple[float, float]]:
+    """Return the average hit and critical hit damage of an attack for each damage type."""
+    weapon = attack.weapon
+    base = weapon.base_damage
+    modifiers = weapon.bonus + attack.damage_ability_mod + attack.damage_mod
+    damages = {base.damage: (base.average() + modifiers, base.critical_average() + modifiers)}
+    for damage in weapon.extra_damage:
+        hit, critical = damages.get(damage.damage, (0.0, 0.0))
+        damages[damage.damage] = (hit + damage.average(), critical + damage.critical_average())
+    return damages
+
+def _simulate(matrix: DamageMatrix, order: Sequence[int],
+              record_targets: bool = False) -> FocusFirePlan:
+    """Return the plan of a party focusing the monsters of an encounter in an order.
+
+    The targets of each round are only recorded if record_targets is True, and are empty
+    otherwise.
+    """
+    fight = _Fight(matrix, [] if record_targets else None)
+    fight.run(order)
+    return FocusFirePlan(tuple(order), fight.rounds, tuple(fight.kill_rounds),
+                         tuple(fight.targets or ()))
+
+def _search_order(matrix: DamageMatrix) -> Tuple[int, ...]:
+    """Return the kill order with the lowest plan cost, trying every distinct order."""
+    # Monsters with the same hit points and damage taken are interchangeable.
+    kinds = [(monster.hit_points, tuple(damages[index] for damages in matrix.attack_damage))
+             for index, monster in enumerate(matrix.monsters)]
+    best_order: Tuple[int, ...] = ()
+    best_cost = (inf, inf)
+    # Each entry is a fight that needs the next monster of its order to continue.
+    stack = [(_Fight(matrix, None), ())]
+    while stack:
+        fight, order = stack.pop()
+        if fight.lower_bound() >= best_cost:
+            continue
+        if fight.run(order):
+            if fight.cost() < best_cost:
+                best_order, best_cost = order, fight.cost()
+            continue
+        branches = []
+        tried = set()
+        for monster in range(len(kinds)):
+            if monster not in order and kinds[monster] not in tried:
+                tried.add(kinds[monster])
+                branches.append((fight.copy(), order + (monster,)))
+        # Orders are tried in lexicographic order, so ties go to the first order.
+        stack.extend(reversed(branches))
+    return best_order
+
+class _Fight():
+    """Represents a party focusing the monsters of an encounter in an order, round by round.
+
+    The order can be extended while the fight runs, so the kill orders that share a beginning
+    share the rounds simulated for it.
+    """
+    def __init__(self, matrix: DamageMatrix, targets: Optional[list]) -> None:
+        self.matrix = matrix
+        # The party member of each attack of a round, in the order they are made.
+        self.attackers = [member for member, party_member in enumerate(matrix.party)
+                          for _ in range(party_member.attacks_per_round)]
+        self.party_damage = [matrix.party_damage_per_round(monster)
+                             for monster in range(len(matrix.monsters))]
+        # No round deals more damage than every attack against its most damaged monster.
+        self.best_round_damage = sum(max(matrix.damage_per_round(member, monster)
+                                         for monster in range(len(matrix.monsters)))
+                                     for member in range(len(matrix.party)))
+        self.remaining = [float(monster.hit_points) for monster in matrix.monsters]
+        self.kill_rounds = [0] * len(self.remaining)
+        self.rounds = 0
+        self.attack = 0
+        self.targets = targets
+        self.round_targets = []
+
+    def copy(self) -> _Fight:
+        """Return a copy of the fight that can continue separately."""
+        fight = copy(self)
+        fight.remaining = list(self.remaining)
+        fight.kill_rounds = list(self.kill_rounds)
+        fight.round_targets = list(self.round_targets)
+        return fight
+
+    def cost(self) -> Tuple[int, int]:
+        """Return the key that ranks finished fights, as _plan_cost does for plans."""
+        return self.rounds, sum(self.kill_rounds)
+
+    def lower_bound(self) -> Tuple[int, int]:
+        """Return the lowest cost that any order continuing this fight can have."""
+        # Living monsters die in the current round at the earliest. A monster also cannot die
+        # before the whole party could deal its hit points, and the k-th monster to die cannot
+        # die before the party could deal the hit points of the k weakest monsters.
+        current = self.rounds if self.attack else self.rounds + 1
+        alive = sorted((hit_points, monster) for monster, hit_points in enumerate(self.remaining)
+                       if hit_points > _EPSILON)
+        if not alive:
+            return self.cost()
+        alone = [_rounds_needed(hit_points, self.party_damage[monster])
+                 for hit_points, monster in alive]
+        together = []
+        total = 0.0
+        for hit_points, _ in alive:
+            total += hit_points
+            together.append(_rounds_needed(total, self.best_round_damage))
+        dead = sum(self.kill_rounds)
+        return (current + max(max(alone), together[-1]),
+                dead + len(alive) * current + max(sum(alone), sum(together)))
+
+    def run(self, order: Sequence[int]) -> bool:
+        """Continue the fight until it ends or an attack needs a monster missing from the order.
+
+        Returns:
+            bool: True if every monster is dead, or False if the order needs another monster.
+        """
+        while True:
+            if not self.attack:
+                if all(hit_points <= _EPSILON for hit_points in self.remaining):
+                    return True
+                if not self._skip_rounds(order):
+                    return False
+                self.rounds += 1
+            damages = self.matrix.attack_damage[self.attackers[self.attack]]
+            target = self._target(damages, order)
+            if target is None and self._needs_monster(damages, order):
+                return False
+            if target is not None:
+                self.remaining[target] -= damages[target]
+                if self.remaining[target] <= _EPSILON:
+                    self.kill_rounds[target] = self.rounds
+            self.round_targets.append(target)
+            self.attack += 1
+            if self.attack == len(self.attackers):
+                self._end_round()
+
+    def _skip_rounds(self, order: Sequence[int]) -> bool:
+        """Skip the rounds before the next round in which a monster can die.
+
+        Returns:
+            bool: False if an attack needs a monster missing from the order, and True otherwise.
+        """
+        round_damage = {}
+        pattern = []
+        for member in self.attackers:
+            damages = self.matrix.attack_damage[member]
+            target = self._target(damages, order)
+            if target is None and self._needs_monster(damages, order):
+                return False
+            pattern.append(target)
+            if target is not None:
+                round_damage[target] = round_damage.get(target, 0.0) + damages[target]
+        # Every targeted monster survives this many full rounds.
+        skipped = min(max(int((self.remaining[target] - _EPSILON) // damage) - 1, 0)
+                      for target, damage in round_damage.items())
+        if skipped:
+            for target, damage in round_damage.items():
+                self.remaining[target] -= damage * skipped
+            self.rounds += skipped
+            if self.targets is not None:
+                self.targets.extend([self._group_targets(pattern)] * skipped)
+        return True
+
+    def _target(self, damages: List[float], order: Sequence[int]) -> Optional[int]:
+        """Return the first monster of the order that is alive and that an attack can damage."""
+        return next((monster for monster in order
+                     if self.remaining[monster] > _EPSILON and damages[monster] > 0), None)
+
+    def _needs_monster(self, damages: List[float], order: Sequence[int]) -> bool:
+        """Return whether an attack could damage a living monster missing from the order."""
+        return any(damages[monster] > 0 and self.remaining[monster] > _EPSILON
+                   for monster in range(len(damages)) if monster not in order)
+
+    def _end_round(self) -> None:
+        """Record the targets of the round that just ended."""
+        if self.targets is not None:
+            self.targets.append(self._group_targets(self.round_targets))
+        self.round_targets = []
+        self.attack = 0
+
+    def _group_targets(self, targets: List[Optional[int]]
+                       ) -> Tuple[Tuple[Optional[int], ...], ...]:
+        """Group the targets of the attacks of a round by party member."""
+        grouped = [[] for _ in self.matrix.party]
+        for member, target in zip(self.attackers, targets):
+            grouped[member].append(target)
+        return tuple(tuple(member_targets) for member_targets in grouped)
+
+def _rounds_needed(hit_points: float, round_damage: float) -> int:
+    """Return the full rounds after the current one needed to deal damage, at round_damage."""
+    return max(ceil((hit_points - _EPSILON) / round_damage) - 1, 0)
+
+def _plan_cost(plan: FocusFirePlan) -> Tuple[int, int]:
+    """Return the key that ranks plans, with fewer rounds first, then fewer monster rounds."""
+    return plan.rounds, sum(plan.kill_rounds)
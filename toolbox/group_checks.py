@@ -0,0 +1,158 @@
+"""Calculate party level check statistics in Dungeons & Dragons 5th edition.
+
+Each character passes or fails a check independently, so the number of successes in the party
+follows a Poisson binomial distribution. It is calculated exactly with a dynamic program that
+adds one character at a time, which takes O(n^2) steps for n characters instead of enumerating
+all 2^n outcomes.
+
+Classes:
+    PartyCheck: The chances of a party making the same check.
+
+Functions:
+    success_count_distribution: Return the chance of each number of successes.
+    party_check: Calculate the chances of a party making the same check.
+    passive_score: Return a character's passive score for a check.
+    best_passive_score: Return the character with the highest passive score for a check.
+"""
+from __future__ import annotations, absolute_import
+from typing import List, NamedTuple, Sequence, Tuple
+try:
+    from .checks import Character, Check, RollMode, check_bonus, success_chance
+except ImportError:
+    from checks import Character, Check, RollMode, check_bonus, success_chance
+
+PASSIVE_BASE = 10
+PASSIVE_ADVANTAGE = 5
+
+class PartyCheck(NamedTuple):
+    """Represents the chances of a party making the same check.
+
+    Attributes:
+        chances: The chance of each character passing, in the order of the party.
+        success_counts: The chance of exactly k characters passing, indexed by k.
+    """
+    chances: Tuple[float, ...]
+    success_counts: Tuple[float, ...]
+
+    def at_least(self, count: int) -> float:
+        """Return the chance that at least a number of characters pass.
+
+        Args:
+            count (int): The least number of characters that must pass.
+
+        Returns:
+            float: The chance of count or more successes.
+        """
+        return min(sum(self.success_counts[max(count, 0):]), 1.0)
+
+    def group_chance(self) -> float:
+        """Return the chance of passing as a group check, where at least half must pass.
+
+        Returns:
+            float: The chance that at least half the party, rounded up, passes.
+        """
+        return self.at_least((len(self.chances) + 1) // 2)
+
+    def any_chance(self) -> float:
+        """Return the chance that at least one character passes.
+
+        Returns:
+            float: The chance of 1 or more successes.
+        """
+        return self.at_least(1)
+
+    def all_chance(self) -> float:
+        """Return the chance that every character passes.
+
+        Returns:
+            float: The chance that the whole party passes.
+        """
+        return self.success_counts[-1]
+
+def success_count_distribution(chances: Sequence[float]) -> List[float]:
+    """Return the chance of each number of successes of independent attempts.
+
+    Args:
+        chances (Sequence[float]): The chance of each attempt succeeding.
+
+    Raises:
+        ValueError: A chance is not between 0 and 1.
+
+    Returns:
+        List[float]: The chance of exactly k successes, indexed by k from 0 to len(chances).
+    """
+    counts = [1.0]
+    for chance in chances:
+        if not 0 <= chance <= 1:
+            raise ValueError('Chances must be between 0 and 1.')
+        # Each count either stays the same with a failure or moves up by one with a success.
+        counts = ([counts[0] * (1 - chance)]
+                  + [counts[index] * (1 - chance) + counts[index - 1] * chance
+                     for index in range(1, len(counts))]
+                  + [counts[-1] * chance])
+    return counts
+
+def party_check(characters: Sequence[Character], check: Check, dc: int,
+                mode: RollMode = RollMode.NORMAL, guidance: bool = False) -> PartyCheck:
+    """Calculate the chances of a party making the same check.
+
+    Args:
+        characters (Sequence[Character]): The characters making the check.
+        check (Check): The Ability, Skill, or Tool of the check.
+        dc (int): The DC of the check.
+        mode (RollMode, optional): How every character rolls the d20. Defaults to
+            RollMode.NORMAL.
+        guidance (bool, optional): If every character adds 1d4 to the roll. Defaults to False.
+
+    Raises:
+        ValueError: The party is empty.
+
+    Returns:
+        PartyCheck: The chances of the party.
+    """
+    if not characters:
+        raise ValueError('The party needs at least 1 character.')
+    chances = tuple(success_chance(check_bonus(character, check), dc, mode, guidance)
+                    for character in characters)
+    return PartyCheck(chances, tuple(success_count_distribution(chances)))
+
+def passive_score(character: Character, check: Check, mode: RollMode = RollMode.NORMAL) -> int:
+    """Return a character's passive score for a check, such as passive Perception.
+
+    Args:
+        character (Character): The character.
+        check (Check): The Ability, Skill, or Tool of the check.
+        mode (RollMode, optional): Advantage adds 5 and disadvantage subtracts 5. Defaults to
+            RollMode.NORMAL.
+
+    Returns:
+        int: 10 plus the check bonus, adjusted for advantage or disadvantage.
+    """
+    score = PASSIVE_BASE + check_bonus(character, check)
+    if mode == RollMode.ADVANTAGE:
+        return score + PASSIVE_ADVANTAGE
+    if mode == RollMode.DISADVANTAGE:
+        return score - PASSIVE_ADVANTAGE
+    return score
+
+def best_passive_score(characters: Sequence[Character], check: Check,
+                       mode: RollMode = RollMode.NORMAL) -> Tuple[Character, int]:
+    """Return the character with the highest passive score for a check.
+
+    Args:
+        characters (Sequence[Character]): The characters to compare.
+        check (Check): The Ability, Skill, or Tool of the check.
+        mode (RollMode, optional): How every character's score is adjusted. Defaults to
+            RollMode.NORMAL.
+
+    Raises:
+        ValueError: There are no characters.
+
+    Returns:
+        Tuple[Character, int]: The first character with the highest score, and the score.
+    """
+    if not characters:
+        raise ValueError('The party needs at least 1 character.')
+    scores = [passive_score(character, check, mode) for character in characters]
+    best = max(range(len(scores)), key=scores.__getitem__)
+    return characters[best], scores[best]
@@ -0,0 +1,188 @@
+"""Record how often and how long the toolbox calculation methods run.
+
+Instrumentation works by replacing the public methods of the instrumented classes with wrappers
+while it is enabled, and restoring the original methods when it is disabled. Nothing is wrapped
+while instrumentation is disabled, so it costs nothing unless it is in use.
+
+Classes:
+    Instrumentation: Collects call counts, time, and allocations for instrumented methods.
+
+Functions:
+    profile: Return an Instrumentation to use as a context manager.
+"""
+from __future__ import annotations, absolute_import
+import csv
+import sys
+from functools import wraps
+from time import perf_counter
+from types import FunctionType
+from typing import Dict, Iterable, Optional, TextIO
+try:
+    from .combat import Damage, Weapon, WeaponAttack, DamageType, Dice, WeaponType
+    from .common import Ability, Skill, Tool
+    from .currency import Currency
+except ImportError:
+    from combat import Damage, Weapon, WeaponAttack, DamageType, Dice, WeaponType
+    from common import Ability, Skill, Tool
+    from currency import Currency
+
+DEFAULT_TARGETS = (Damage, Weapon, WeaponAttack, Currency, DamageType, Dice, WeaponType, Ability,
+                   Skill, Tool)
+
+_INSTRUMENTED_DUNDERS = ('__add__', '__sub__', '__mul__', '__eq__', '__lt__', '__hash__',
+                         '__str__', '__getitem__', '__setitem__')
+
+class Instrumentation():
+    """Collects call counts, cumulative time, and allocations for instrumented methods.
+
+    Allocations are counted as the change in the number of memory blocks allocated by the
+    interpreter, so they include objects created by nested calls. Cumulative time also includes
+    nested calls. Instrumentation is not thread-safe.
+
+    Methods:
+        enable: Start recording the instrumented methods.
+        disable: Stop recording and restore the original methods.
+        reset: Clear the recorded counters.
+        as_dict: Return the recorded counters.
+        to_csv: Write the recorded counters as CSV.
+        to_prometheus: Return the recorded counters in the Prometheus text format.
+    """
+    def __init__(self, targets: Optional[Iterable[type]] = None) -> None:
+        """Initializes the Instrumentation.
+
+        Args:
+            targets (Optional[Iterable[type]], optional): The classes whose methods are
+                instrumented. Defaults to DEFAULT_TARGETS.
+        """
+        self.targets = tuple(DEFAULT_TARGETS if targets is None else targets)
+        self.enabled = False
+        self._counters = {}
+        self._originals = []
+
+    def __enter__(self) -> Instrumentation:
+        """Enable the Instrumentation for the duration of a with block."""
+        self.enable()
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Disable the Instrumentation at the end of a with block."""
+        self.disable()
+
+    def enable(self) -> None:
+        """Start recording the instrumented methods."""
+        if self.enabled:
+            return
+        for cls in self.targets:
+            for name, attribute in list(vars(cls).items()):
+                if name.startswith('_') and name not in _INSTRUMENTED_DUNDERS:
+                    continue
+                wrapped = self._wrap_attribute(f'{cls.__name__}.{name}', attribute)
+                if wrapped is not None:
+                    self._originals.append((cls, name, attribute))
+                    setattr(cls, name, wrapped)
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording and restore the original methods."""
+        for cls, name, attribute in reversed(self._originals):
+            setattr(cls, name, attribute)
+        self._originals = []
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Clear the recorded counters."""
+        self._counters.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Return the recorded counters.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The calls, seconds, and allocations of each method that
+            has been called, keyed by the qualified method name.
+        """
+        return {name: {'calls': calls, 'seconds': seconds, 'allocations': allocations}
+                for name, (calls, seconds, allocations) in sorted(self._counters.items())}
+
+    def to_csv(self, file: TextIO) -> None:
+        """Write the recorded counters as CSV.
+
+        Args:
+            file (TextIO): The file to write to.
+        """
+        writer = csv.writer(file)
+        writer.writerow(['method', 'calls', 'seconds', 'allocations'])
+        for name, counters in self.as_dict().items():
+            writer.writerow([name, counters['calls'], counters['seconds'],
+                             counters['allocations']])
+
+    def to_prometheus(self, prefix: str = 'toolbox') -> str:
+        """Return the recorded counters in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): The prefix of the metric names. Defaults to 'toolbox'.
+
+        Returns:
+            str: The metrics, one counter per method and measurement.
+        """
+        metrics = [('calls', 'Number of calls'),
+                   ('seconds', 'Cumulative time spent in calls, in seconds'),
+                   ('allocations', 'Net memory blocks allocated during calls')]
+        counters = self.as_dict()
+        lines = []
+        for key, description in metrics:
+            metric = f'{prefix}_{key}_total'
+            lines.append(f'# HELP {metric} {description}.')
+            lines.append(f'# TYPE {metric} counter')
+            for name, values in counters.items():
+                lines.append(f'{metric}{{method="{name}"}} {values[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def _wrap_attribute(self, name: str, attribute: object) -> Optional[object]:
+        """Return an instrumented version of a class attribute, or None if it is not a method."""
+        if isinstance(attribute, FunctionType):
+            return self._wrap_function(name, attribute)
+        if isinstance(attribute, classmethod):
+            return classmethod(self._wrap_function(name, attribute.__func__))
+        if isinstance(attribute, staticmethod):
+            return staticmethod(self._wrap_function(name, attribute.__func__))
+        if isinstance(attribute, property) and attribute.fget is not None:
+            return property(self._wrap_function(name, attribute.fget), attribute.fset,
+                            attribute.fdel, attribute.__doc__)
+        return None
+
+    def _wrap_function(self, name: str, function: FunctionType) -> FunctionType:
+        """Return a wrapper of a function that records its calls."""
+        counters = self._counters
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            blocks = sys.getallocatedblocks()
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                record = counters.get(name)
+                if record is None:
+                    record = counters[name] = [0, 0.0, 0]
+                record[0] += 1
+                record[1] += elapsed
+                record[2] += sys.getallocatedblocks() - blocks
+        return wrapper
+
+def profile(targets: Optional[Iterable[type]] = None) -> Instrumentation:
+    """Return an Instrumentation to use as a context manager.
+
+    Example:
+        with profile() as stats:
+            attack.average_damage(16)
+        print(stats.to_prometheus())
+
+    Args:
+        targets (Optional[Iterable[type]], optional): The classes whose methods are
+            instrumented. Defaults to DEFAULT_TARGETS.
+
+    Returns:
+        Instrumentation: The Instrumentation, which is enabled when the with block is entered.
+    """
+    return Instrumentation(targets)
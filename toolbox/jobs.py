@@ -0,0 +1,123 @@
+"""Run long calculations in the background and post their results back to the GUI.
+
+Classes:
+    JobResult: The outcome of a background job.
+    JobRunner: Runs jobs on a thread or process pool, keeping only the latest job for each key.
+"""
+from __future__ import annotations, absolute_import
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, NamedTuple, Optional
+
+JOB_DONE_EVENT = '-job-done-'
+
+class JobResult(NamedTuple):
+    """Represents the outcome of a background job.
+
+    Attributes:
+        key: The key the job was submitted with.
+        generation: The number of jobs submitted with the key, including this one.
+        value: The value returned by the job, or None if it raised an exception.
+        exception: The exception raised by the job, or None if it succeeded.
+    """
+    key: str
+    generation: int
+    value: Any
+    exception: Optional[BaseException]
+
+class JobRunner():
+    """Runs jobs on a thread or process pool, keeping only the latest job for each key.
+
+    Submitting a job cancels any job with the same key that has not started yet. Results of jobs
+    that have been superseded are dropped instead of posted. Results are posted as the event
+    JOB_DONE_EVENT with a JobResult value, which matches PySimpleGUI's Window.write_event_value.
+
+    Methods:
+        submit: Run a function in the background.
+        is_current: Return whether a result is from the latest job of its key.
+        shutdown: Cancel the pending jobs and stop the pool.
+    """
+    def __init__(self, post: Callable[[str, JobResult], None], max_workers: int = 2,
+                 use_processes: bool = False) -> None:
+        """Initializes the JobRunner.
+
+        Args:
+            post (Callable[[str, JobResult], None]): Called from a worker thread with
+                JOB_DONE_EVENT and the JobResult of each job that is still current.
+            max_workers (int, optional): The number of workers. Defaults to 2.
+            use_processes (bool, optional): If True, jobs run in a process pool, so functions
+                and arguments must be picklable. Defaults to False.
+        """
+        self._post = post
+        executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor = executor_type(max_workers=max_workers)
+        self._lock = Lock()
+        self._generations = {}
+        self._futures = {}
+
+    def submit(self, key: str, function: Callable[..., Any], *args: Any) -> int:
+        """Run a function in the background.
+
+        Args:
+            key (str): Identifies what the job calculates. A new job supersedes older jobs with
+                the same key.
+            function (Callable[..., Any]): The function to run.
+            *args (Any): The arguments to call the function with.
+
+        Returns:
+            int: The generation of the job.
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+        future = self._executor.submit(function, *args)
+        with self._lock:
+            if self._generations[key] == generation:
+                self._futures[key] = future
+        future.add_done_callback(lambda done: self._finished(key, generation, done))
+        return generation
+
+    def is_current(self, result: JobResult) -> bool:
+        """Return whether a result is from the latest job of its key.
+
+        A result can be superseded after it has been posted, so the GUI should check results
+        before showing them.
+
+        Args:
+            result (JobResult): The result to check.
+
+        Returns:
+            bool: True if no newer job has been submitted with the same key.
+        """
+        with self._lock:
+            return self._generations.get(result.key) == result.generation
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel the pending jobs and stop the pool.
+
+        Args:
+            wait (bool, optional): If True, wait for the running jobs to finish. Defaults to
+                False.
+        """
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _finished(self, key: str, generation: int, future: Future) -> None:
+        """Post the result of a finished job if it is still current."""
+        if future.cancelled():
+            return
+        with self._lock:
+            if self._generations.get(key) != generation:
+                return
+            if self._futures.get(key) is future:
+                del self._futures[key]
+        exception = future.exception()
+        value = None if exception is not None else future.result()
+        self._post(JOB_DONE_EVENT, JobResult(key, generation, value, exception))
@@ -0,0 +1,112 @@
+"""Record the latency of GUI events.
+
+Classes:
+    LatencySample: The timing of a single GUI event.
+    LatencyRecorder: A ring buffer of recent event timings.
+"""
+from __future__ import annotations, absolute_import
+import csv
+from collections import deque
+from math import ceil
+from typing import Iterator, NamedTuple, Optional
+
+class LatencySample(NamedTuple):
+    """Represents the timing of a single GUI event.
+
+    Attributes:
+        event: The key of the event.
+        handler: The time spent handling the event, in seconds.
+        update: The time spent redrawing the updated widgets, in seconds.
+    """
+    event: str
+    handler: float
+    update: float
+
+    @property
+    def total(self) -> float:
+        """The total time spent on the event, in seconds."""
+        return self.handler + self.update
+
+class LatencyRecorder():
+    """Represents a ring buffer of the most recent GUI event timings.
+
+    Methods:
+        record: Add the timing of an event.
+        percentile: Return a percentile of the recorded timings.
+        summary: Return a short description of the recorded timings.
+        slowest: Iterate over the slowest recorded events.
+        dump: Write the recorded timings to a CSV file.
+    """
+    def __init__(self, capacity: int = 1000) -> None:
+        """Initializes the LatencyRecorder.
+
+        Args:
+            capacity (int, optional): The number of events kept. Defaults to 1000.
+        """
+        self.samples = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        """Return the number of recorded events."""
+        return len(self.samples)
+
+    def record(self, event: str, handler: float, update: float = 0.0) -> None:
+        """Add the timing of an event, discarding the oldest event if the buffer is full.
+
+        Args:
+            event (str): The key of the event.
+            handler (float): The time spent handling the event, in seconds.
+            update (float, optional): The time spent redrawing the updated widgets, in seconds.
+                Defaults to 0.0.
+        """
+        self.samples.append(LatencySample(str(event), handler, update))
+
+    def percentile(self, percent: float, field: str = 'total') -> Optional[float]:
+        """Return a percentile of the recorded timings using the nearest-rank method.
+
+        Args:
+            percent (float): The percentile to return, from 0 to 100.
+            field (str, optional): The timing to use: 'handler', 'update', or 'total'.
+                Defaults to 'total'.
+
+        Returns:
+            Optional[float]: The percentile in seconds, or None if nothing has been recorded.
+        """
+        if not self.samples:
+            return None
+        timings = sorted(getattr(sample, field) for sample in self.samples)
+        rank = max(ceil(percent / 100 * len(timings)), 1)
+        return timings[rank - 1]
+
+    def summary(self) -> str:
+        """Return a short description of the recorded timings for the status bar.
+
+        Returns:
+            str: The median and 99th percentile of the total event time in milliseconds.
+        """
+        if not self.samples:
+            return 'p50 - / p99 -'
+        return (f'p50 {self.percentile(50) * 1000:.1f} ms / '
+                f'p99 {self.percentile(99) * 1000:.1f} ms')
+
+    def slowest(self, count: int = 10) -> Iterator[LatencySample]:
+        """Iterate over the slowest recorded events.
+
+        Args:
+            count (int, optional): The number of events. Defaults to 10.
+
+        Returns:
+            Iterator[LatencySample]: The events with the longest total time, slowest first.
+        """
+        return iter(sorted(self.samples, key=lambda sample: sample.total, reverse=True)[:count])
+
+    def dump(self, path: str) -> None:
+        """Write the recorded timings to a CSV file.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['event', 'handler_seconds', 'update_seconds', 'total_seconds'])
+            for sample in self.samples:
+                writer.writerow([sample.event, sample.handler, sample.update, sample.total])
@@ -0,0 +1,236 @@
+"""Store currency transactions in an append-only binary ledger file.
+
+Each transaction is a fixed-width record of the 5 coin counts, a timestamp, and a party id, all
+stored as little-endian 64-bit integers. Records are read through a memory map, so queries never
+load the whole file into memory.
+
+Classes:
+    LedgerEntry: A single transaction in a Ledger.
+    Ledger: An append-only file of currency transactions.
+"""
+from __future__ import annotations, absolute_import
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+try:
+    from .currency import Currency, CurrencyOptions
+except ImportError:
+    from currency import Currency, CurrencyOptions
+
+_MAGIC = b'DNDLEDG1'
+_RECORD = struct.Struct('<7q')
+_CHUNK_RECORDS = 65536
+
+class LedgerEntry(NamedTuple):
+    """Represents a single transaction in a Ledger.
+
+    Attributes:
+        currency: The coins gained, or lost if negative.
+        timestamp: The time of the transaction in seconds since the epoch.
+        party: The id of the party the transaction belongs to.
+    """
+    currency: Currency
+    timestamp: int
+    party: int
+
+class Ledger():
+    """Represents an append-only file of currency transactions.
+
+    Running totals for each party are kept in memory and updated incrementally, so repeated
+    balance queries only read the records appended since the last query.
+
+    Methods:
+        append: Add a transaction to the end of the ledger.
+        extend: Add several transactions to the end of the ledger.
+        entries: Iterate over the transactions in the ledger.
+        parties: Return the ids of the parties with transactions.
+        balance: Return the total coins of a party or of the whole ledger.
+        running_balance: Iterate over the balance after each transaction.
+        consolidated_balances: Return the consolidated balance of every party.
+    """
+    def __init__(self, path: str) -> None:
+        """Initializes the Ledger, creating the file if it does not exist.
+
+        Args:
+            path (str): The path of the ledger file.
+
+        Raises:
+            ValueError: The file exists but is not a ledger.
+        """
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as file:
+                file.write(_MAGIC)
+        with open(path, 'rb') as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f'{path} is not a ledger file.')
+        self._totals = {}
+        self._scanned = 0
+
+    def __len__(self) -> int:
+        """Return the number of transactions in the ledger."""
+        return (os.path.getsize(self.path) - len(_MAGIC)) // _RECORD.size
+
+    def __getitem__(self, index: int) -> LedgerEntry:
+        """Return a transaction of the ledger.
+
+        Args:
+            index (int): The index of the transaction. Negative indices count from the end.
+
+        Raises:
+            IndexError: The index is out of range.
+
+        Returns:
+            LedgerEntry: The transaction.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('Ledger index out of range.')
+        with open(self.path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            record = _RECORD.unpack_from(view, len(_MAGIC) + index * _RECORD.size)
+        return _to_entry(record)
+
+    def __iter__(self) -> Iterator[LedgerEntry]:
+        """Iterate over the transactions in the ledger."""
+        return self.entries()
+
+    def append(self, currency: Currency, party: int = 0, timestamp: Optional[int] = None) -> None:
+        """Add a transaction to the end of the ledger.
+
+        Args:
+            currency (Currency): The coins gained, or lost if negative.
+            party (int, optional): The id of the party. Defaults to 0.
+            timestamp (Optional[int], optional): The time of the transaction in seconds since
+                the epoch. Defaults to the current time.
+        """
+        self.extend([LedgerEntry(currency, timestamp, party)])
+
+    def extend(self, entries: Iterable[LedgerEntry]) -> None:
+        """Add several transactions to the end of the ledger.
+
+        Args:
+            entries (Iterable[LedgerEntry]): The transactions to add. A timestamp of None is
+                replaced by the current time.
+        """
+        caught_up = self._scanned == len(self)
+        records = []
+        for currency, timestamp, party in entries:
+            if timestamp is None:
+                timestamp = int(time.time())
+            records.append((*currency.key(), timestamp, party))
+        with open(self.path, 'ab') as file:
+            file.write(b''.join(_RECORD.pack(*record) for record in records))
+        if caught_up:
+            for record in records:
+                self._add_to_totals(record)
+            self._scanned += len(records)
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> Iterator[LedgerEntry]:
+        """Iterate over the transactions in the ledger.
+
+        Args:
+            start (int, optional): The index of the first transaction. Defaults to 0.
+            stop (Optional[int], optional): The index after the last transaction. Defaults to
+                the end of the ledger.
+
+        Yields:
+            LedgerEntry: Each transaction in order.
+        """
+        for record in self._records(start, stop):
+            yield _to_entry(record)
+
+    def parties(self) -> List[int]:
+        """Return the ids of the parties with transactions.
+
+        Returns:
+            List[int]: The sorted party ids.
+        """
+        self._update_totals()
+        return sorted(self._totals)
+
+    def balance(self, party: Optional[int] = None) -> Currency:
+        """Return the total coins of a party or of the whole ledger.
+
+        Args:
+            party (Optional[int], optional): The id of the party. Defaults to every party.
+
+        Returns:
+            Currency: A Currency object with the sum of each coin.
+        """
+        self._update_totals()
+        if party is not None:
+            return Currency(*self._totals.get(party, (0, 0, 0, 0, 0)))
+        totals = [0, 0, 0, 0, 0]
+        for party_totals in self._totals.values():
+            totals = [total + count for total, count in zip(totals, party_totals)]
+        return Currency(*totals)
+
+    def running_balance(self, party: Optional[int] = None) -> Iterator[Tuple[int, Currency]]:
+        """Iterate over the balance after each transaction.
+
+        Args:
+            party (Optional[int], optional): The id of the party to follow. Defaults to every
+                party.
+
+        Yields:
+            Tuple[int, Currency]: The timestamp of each transaction and the balance after it.
+        """
+        totals = [0, 0, 0, 0, 0]
+        for record in self._records(0, None):
+            if party is not None and record[6] != party:
+                continue
+            totals = [total + count for total, count in zip(totals, record[:5])]
+            yield record[5], Currency(*totals)
+
+    def consolidated_balances(self, currencies: CurrencyOptions = CurrencyOptions.COMMON
+                              ) -> Dict[int, Currency]:
+        """Return the consolidated balance of every party.
+
+        Args:
+            currencies (CurrencyOptions, optional): The coins to use when consolidating.
+                Defaults to CurrencyOptions.COMMON.
+
+        Returns:
+            Dict[int, Currency]: The balance of each party, as with the Currency.consolidate()
+            method.
+        """
+        self._update_totals()
+        return {party: Currency(*totals).consolidate(currencies)
+                for party, totals in sorted(self._totals.items())}
+
+    def _records(self, start: int, stop: Optional[int]) -> Iterator[Tuple[int, ...]]:
+        """Iterate over the raw records of the ledger, reading them in chunks."""
+        length = len(self)
+        stop = length if stop is None else min(stop, length)
+        if start >= stop:
+            return
+        with open(self.path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view, \
+                memoryview(view) as buffer:
+            for chunk_start in range(start, stop, _CHUNK_RECORDS):
+                chunk_stop = min(chunk_start + _CHUNK_RECORDS, stop)
+                offset = len(_MAGIC) + chunk_start * _RECORD.size
+                with buffer[offset:offset + (chunk_stop - chunk_start) * _RECORD.size] as chunk:
+                    yield from _RECORD.iter_unpack(chunk)
+
+    def _update_totals(self) -> None:
+        """Add the records appended since the last query to the running totals."""
+        length = len(self)
+        for record in self._records(self._scanned, length):
+            self._add_to_totals(record)
+        self._scanned = length
+
+    def _add_to_totals(self, record: Tuple[int, ...]) -> None:
+        """Add a raw record to the running totals of its party."""
+        totals = self._totals.setdefault(record[6], [0, 0, 0, 0, 0])
+        for index in range(5):
+            totals[index] += record[index]
+
+def _to_entry(record: Tuple[int, ...]) -> LedgerEntry:
+    """Convert a raw record into a LedgerEntry."""
+    return LedgerEntry(Currency(*record[:5]), record[5], record[6])
@@ -0,0 +1,343 @@
+"""Calculate the downtime training days of every option for many characters at once.
+
+Characters are streamed from a CSV or JSON Lines file in fixed-size chunks. Chunks are
+evaluated by a pool of worker processes and written to the output in input order as they
+finish, with a bounded number of chunks in flight, so memory use does not grow with the size
+of the roster.
+
+Each input row describes one character with the same inputs as the downtime screen:
+    name: The name of the character. Required.
+    strength, dexterity, constitution, intelligence, wisdom, charisma: The ability scores.
+        Each defaults to 10.
+    proficiency_bonus: The proficiency bonus of the character. Defaults to 2.
+    <skill>_proficient: If the character is proficient in a skill, such as
+        "sleight_of_hand_proficient". Used for tool training. Defaults to false.
+    <skill>_bonus: Any other bonus to a skill, such as "stealth_bonus". Used for tool training.
+        Defaults to 0.
+
+Each output row has the name of the character and the days of every training option: language,
+each skill and tool with its additional expertise days, weapons trained with strength or
+dexterity, and light, medium, and heavy armor.
+
+Classes:
+    RosterStats: The number of characters processed and the time it took.
+
+Functions:
+    training_options: Return the days of every training option for a character row.
+    evaluate_roster: Iterate over the training options of each row, using worker processes.
+    write_roster: Write the training options of a roster, and time it.
+    main: Run the roster processor from the command line.
+"""
+from __future__ import annotations, absolute_import
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+from typing import (IO, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    TextIO, Tuple)
+try:
+    from .batch import guess_format, parse_bool, parse_int, read_rows
+    from .common import Ability, Skill, Tool
+    from .downtime import (language_training_days, proficiency_training_days,
+                           skill_training_days, tool_check_bonus, tool_training_days)
+    from .rules import apply_rule_pack, current_rule_pack, use_rule_pack
+except ImportError:
+    from batch import guess_format, parse_bool, parse_int, read_rows
+    from common import Ability, Skill, Tool
+    from downtime import (language_training_days, proficiency_training_days,
+                          skill_training_days, tool_check_bonus, tool_training_days)
+    from rules import apply_rule_pack, current_rule_pack, use_rule_pack
+
+DEFAULT_CHUNK_SIZE = 256
+OUTPUT_FORMATS = ('csv', 'jsonl', 'parquet')
+ROSTER_FIELDS = (['name', 'language']
+                 + [field for member in list(Skill) + list(Tool)
+                    for field in (member.name.lower(), f'{member.name.lower()}_expertise')]
+                 + ['weapon_strength', 'weapon_dexterity', 'light_armor', 'medium_armor',
+                    'heavy_armor'])
+
+_PROFICIENCY_ABILITIES = (Ability.STRENGTH, Ability.DEXTERITY, Ability.DEXTERITY,
+                          Ability.STRENGTH, Ability.STRENGTH)
+
+class RosterStats(NamedTuple):
+    """Represents the number of characters processed and the time it took.
+
+    Attributes:
+        rows: The number of characters written.
+        seconds: The time taken to read, evaluate, and write them.
+    """
+    rows: int
+    seconds: float
+
+    def rows_per_second(self) -> float:
+        """Return the throughput of the roster processor.
+
+        Returns:
+            float: The characters processed per second, or 0 if no time was measured.
+        """
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+def training_options(row: Dict[str, Any]) -> List[Any]:
+    """Return the days of every training option for a character row.
+
+    Args:
+        row (Dict[str, Any]): The fields of the row, as described in the module documentation.
+
+    Raises:
+        ValueError: The name is missing or a field is invalid.
+
+    Returns:
+        List[Any]: The values of ROSTER_FIELDS for the character.
+    """
+    return _training_options(row, *_rule_tables())
+
+def evaluate_roster(rows: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    workers: Optional[int] = None) -> Iterator[List[Any]]:
+    """Iterate over the training options of each row, evaluating chunks in worker processes.
+
+    At most two chunks per worker are in flight, and results are yielded in input order.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): The input rows.
+        chunk_size (int, optional): The number of rows in each chunk. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        workers (Optional[int], optional): The number of worker processes. If 0, chunks are
+            evaluated in this process. Defaults to the number of CPUs.
+
+    Raises:
+        ValueError: A row is invalid. The message includes the number of the row.
+
+    Yields:
+        List[Any]: The values of ROSTER_FIELDS for each row.
+    """
+    chunks = _chunks(rows, chunk_size)
+    if workers == 0:
+        for first_row, chunk in chunks:
+            yield from _evaluate_chunk(chunk, first_row)
+        return
+    workers = workers or os.cpu_count() or 1
+    # Workers start with the active rules, even if they do not inherit them from this process.
+    with ProcessPoolExecutor(max_workers=workers, initializer=apply_rule_pack,
+                             initargs=(current_rule_pack(),)) as executor:
+        pending = deque()
+        for first_row, chunk in chunks:
+            pending.append(executor.submit(_evaluate_chunk, chunk, first_row))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def write_roster(source: TextIO, destination: IO, input_format: str = 'csv',
+                 output_format: str = 'csv', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: Optional[int] = None) -> RosterStats:
+    """Write the training options of every character of a roster in a single pass.
+
+    CSV and JSON Lines are written a chunk of rows at a time. Parquet is written with one
+    column-oriented row group per chunk, and needs the optional pyarrow package.
+
+    Args:
+        source (TextIO): The input file.
+        destination (IO): The file to write to. Parquet needs a binary file, the other formats
+            a text file.
+        input_format (str, optional): The format of the input, 'csv' or 'jsonl'. Defaults to
+            'csv'.
+        output_format (str, optional): One of OUTPUT_FORMATS. Defaults to 'csv'.
+        chunk_size (int, optional): The number of rows evaluated at a time. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        workers (Optional[int], optional): The number of worker processes. If 0, rows are
+            evaluated in this process. Defaults to the number of CPUs.
+
+    Raises:
+        ValueError: A format is unknown, pyarrow is not installed for Parquet, or a row is
+            invalid.
+
+    Returns:
+        RosterStats: The number of rows written and the time taken.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format '{output_format}'.")
+    start = perf_counter()
+    write_chunk = _chunk_writer(destination, output_format)
+    count = 0
+    results = evaluate_roster(read_rows(source, input_format), chunk_size, workers)
+    try:
+        while True:
+            chunk = list(islice(results, chunk_size))
+            if not chunk:
+                break
+            write_chunk(chunk)
+            count += len(chunk)
+    finally:
+        write_chunk(None)
+    return RosterStats(count, perf_counter() - start)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the roster processor from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments. Defaults to
+            sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description='Write the downtime training days of every '
+                                     'character in a CSV or JSON Lines file.')
+    parser.add_argument('input', help='the input file, or - for standard input')
+    parser.add_argument('-o', '--output', default='-',
+                        help='the output file, or - for standard output (default)')
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'],
+                        help='the input format (default: from the file extension)')
+    parser.add_argument('--output-format', choices=list(OUTPUT_FORMATS),
+                        help='the output format (default: from the file extension)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'rows evaluated at a time (default {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--workers', type=int,
+                        help='worker processes, or 0 to use none (default: the number of CPUs)')
+    parser.add_argument('--rules', metavar='FILE',
+                        help='use the tools, skills, and downtime of a JSON or TOML rule pack')
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if args.workers is not None and args.workers < 0:
+        parser.error('--workers must be at least 0')
+    input_format = args.input_format or guess_format(args.input)
+    output_format = args.output_format or (
+        'parquet' if args.output.lower().endswith('.parquet') else guess_format(args.output))
+    if output_format == 'parquet' and args.output == '-':
+        parser.error('Parquet output needs an output file')
+    if args.rules:
+        try:
+            use_rule_pack(args.rules)
+        except (OSError, ValueError) as error:
+            parser.error(f'cannot use rule pack: {error}')
+    try:
+        source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    except OSError as error:
+        parser.error(f'cannot open input: {error}')
+    try:
+        try:
+            if args.output == '-':
+                destination = sys.stdout
+            elif output_format == 'parquet':
+                destination = open(args.output, 'wb')
+            else:
+                destination = open(args.output, 'w', newline='')
+        except OSError as error:
+            parser.error(f'cannot open output: {error}')
+        try:
+            stats = write_roster(source, destination, input_format, output_format,
+                                 args.chunk_size, args.workers)
+        finally:
+            if destination is not sys.stdout:
+                destination.close()
+    except ValueError as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f'Wrote {stats.rows} rows in {stats.seconds:.2f} s '
+          f'({stats.rows_per_second():.0f} rows/s).', file=sys.stderr)
+    return 0
+
+def _rule_tables() -> Tuple[Tuple[Tuple[Ability, str], ...], Tuple[Tuple[int, ...], ...]]:
+    """Return the ability and field name of each skill, and the skill indexes of each tool.
+
+    Looked up once per chunk rather than for every row, and not once at import, since a rule
+    pack can change them.
+    """
+    skills = list(Skill)
+    return (tuple((skill.ability(), skill.name.lower()) for skill in skills),
+            tuple(tuple(skills.index(skill) for skill in tool.skills()) for tool in Tool))
+
+def _training_options(row: Dict[str, Any], skill_abilities: Tuple[Tuple[Ability, str], ...],
+                      tool_skills: Tuple[Tuple[int, ...], ...]) -> List[Any]:
+    """Return the days of every training option for a character row, with the rule tables."""
+    if row.get('name') in (None, ''):
+        raise ValueError("Missing field 'name'.")
+    scores = {ability: parse_int(row, ability.name.lower(), 10) for ability in Ability}
+    proficiency_bonus = parse_int(row, 'proficiency_bonus', 2)
+    record = [str(row['name']),
+              language_training_days(scores[Ability.INTELLIGENCE], scores[Ability.WISDOM],
+                                     scores[Ability.CHARISMA])]
+    check_bonuses = []
+    for ability, field in skill_abilities:
+        record.extend(skill_training_days(scores[ability]))
+        check_bonuses.append(tool_check_bonus(scores[ability], proficiency_bonus,
+                                              parse_bool(row, f'{field}_proficient', False),
+                                              parse_int(row, f'{field}_bonus', 0)))
+    for skills in tool_skills:
+        record.extend(tool_training_days(check_bonuses[skill] for skill in skills))
+    # Weapons train with either ability, light armor with dexterity and heavier armor with
+    # strength.
+    record.extend(proficiency_training_days(scores[ability]) for ability in _PROFICIENCY_ABILITIES)
+    return record
+
+def _chunks(rows: Iterable[Dict[str, Any]], chunk_size: int
+            ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Iterate over chunks of rows, with the number of the first row of each chunk."""
+    rows = iter(rows)
+    first_row = 1
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield first_row, chunk
+        first_row += len(chunk)
+
+def _evaluate_chunk(chunk: List[Dict[str, Any]], first_row: int) -> List[List[Any]]:
+    """Return the training options of each row of a chunk."""
+    records = []
+    skill_abilities, tool_skills = _rule_tables()
+    for row_number, row in enumerate(chunk, first_row):
+        try:
+            records.append(_training_options(row, skill_abilities, tool_skills))
+        except ValueError as error:
+            raise ValueError(f'Row {row_number}: {error}') from None
+    return records
+
+def _chunk_writer(destination: IO, output_format: str
+                  ) -> Callable[[Optional[List[List[Any]]]], None]:
+    """Return a function that writes a chunk of records, and finishes the output given None."""
+    if output_format == 'parquet':
+        return _parquet_writer(destination)
+    writer = csv.writer(destination) if output_format == 'csv' else None
+    if writer is not None:
+        writer.writerow(ROSTER_FIELDS)
+    def write_chunk(chunk: Optional[List[List[Any]]]) -> None:
+        if chunk is None:
+            return
+        if writer is not None:
+            writer.writerows(chunk)
+        else:
+            destination.writelines(json.dumps(dict(zip(ROSTER_FIELDS, record))) + '\n'
+                                   for record in chunk)
+    return write_chunk
+
+def _parquet_writer(destination: IO) -> Callable[[Optional[List[List[Any]]]], None]:
+    """Return a function that writes a chunk of records as a Parquet row group."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError('Parquet output needs the pyarrow package.') from None
+    schema = pyarrow.schema([(field, pyarrow.string() if field == 'name' else pyarrow.int32())
+                             for field in ROSTER_FIELDS])
+    writer = pyarrow.parquet.ParquetWriter(destination, schema)
+    def write_chunk(chunk: Optional[List[List[Any]]]) -> None:
+        if chunk is None:
+            writer.close()
+            return
+        # Each chunk becomes one row group, stored column by column.
+        columns = [list(column) for column in zip(*chunk)]
+        writer.write_table(pyarrow.Table.from_arrays(columns, schema=schema))
+    return write_chunk
+
+if __name__ == '__main__':
+    sys.exit(main())
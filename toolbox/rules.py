@@ -0,0 +1,341 @@
+"""Load rule packs that replace the weapon, tool, skill, and downtime tables.
+
+A rule pack is a JSON or TOML file that overrides any part of the built-in rules, for house
+rules or other books. Members are named like the enum members, in any case and with spaces or
+underscores:
+
+    name = "House rules"
+
+    [downtime]
+    base_days = 200
+
+    [skills]
+    intimidation = "strength"
+
+    [tools.smith]
+    name = "Smith's Tools"
+    skills = ["arcana", "athletics", "history"]
+
+    [weapons.longsword]
+    damage = "1d10"
+    type = "slashing"
+
+Anything a pack does not set keeps its built-in value. Packs only change the rules of existing
+members, since the members themselves are enums.
+
+A pack is compiled into a RulePack of compact tables indexed by the order of the enum members,
+and the compiled tables are cached as JSON next to the file. The cache is plain data, like the
+pack, and is used until the file changes, so loading a pack again does not parse it. Applying a
+pack replaces the frozen lookup tables that Skill.ability(), Tool.skills(),
+Tool.get_display_name(), and Weapon use, so the hot paths cost the same as with the built-in
+rules.
+
+Classes:
+    RulePack: The compiled tables of a rule pack.
+
+Functions:
+    default_rule_pack: Return the built-in rules as a RulePack.
+    compile_rule_pack: Compile the data of a rule pack.
+    load_rule_pack: Load a rule pack file, using its compiled cache when it is current.
+    save_rule_pack: Write a RulePack as a JSON rule pack file.
+    apply_rule_pack: Make a RulePack the active rules.
+    use_rule_pack: Load a rule pack file and make it the active rules.
+    current_rule_pack: Return the active rules as a RulePack.
+"""
+from __future__ import annotations, absolute_import
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Type, Union
+try:
+    from . import common, downtime
+    from .combat import Damage, DamageType, Dice, Weapon, WeaponType
+    from .common import Ability, Skill, Tool
+except ImportError:
+    import common
+    import downtime
+    from combat import Damage, DamageType, Dice, Weapon, WeaponType
+    from common import Ability, Skill, Tool
+
+# Changed whenever the layout of RulePack changes, so older cached packs are compiled again.
+_CACHE_VERSION = 2
+_CACHE_SUFFIX = '.cache.json'
+_DAMAGE_PATTERN = re.compile(r'^(\d+)d(\d+)$')
+_active_name = 'Built-in rules'
+
+class RulePack(NamedTuple):
+    """Represents the compiled tables of a rule pack.
+
+    Tables hold indexes into the members of the enums rather than the members, so a compiled
+    pack does not depend on how the modules were imported.
+
+    Attributes:
+        name: The name of the pack.
+        base_downtime_days: The BASE_DOWNTIME_DAYS of the downtime module.
+        skill_abilities: The index of the Ability of each Skill, in Skill order.
+        tool_skills: The indexes of the Skills of each Tool, in Tool order.
+        tool_names: The display name of each Tool, in Tool order.
+        weapons: The number of dice, sides of the die, and index of the DamageType of each
+            WeaponType, in WeaponType order, or None for weapons without damage rules.
+    """
+    name: str
+    base_downtime_days: int
+    skill_abilities: bytes
+    tool_skills: Tuple[bytes, ...]
+    tool_names: Tuple[str, ...]
+    weapons: Tuple[Optional[Tuple[int, int, int]], ...]
+
+def default_rule_pack() -> RulePack:
+    """Return the built-in rules as a RulePack.
+
+    Returns:
+        RulePack: The rules the modules start with.
+    """
+    return _DEFAULT_PACK
+
+def compile_rule_pack(data: Dict[str, Any]) -> RulePack:
+    """Compile the data of a rule pack over the built-in rules.
+
+    Args:
+        data (Dict[str, Any]): The parsed JSON or TOML of the pack, as described in the module
+            documentation.
+
+    Raises:
+        ValueError: The data names an unknown member or has an invalid value.
+
+    Returns:
+        RulePack: The compiled pack.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('A rule pack must be a table.')
+    unknown = set(data) - {'name', 'downtime', 'skills', 'tools', 'weapons'}
+    if unknown:
+        raise ValueError(f"Unknown rule pack section '{sorted(unknown)[0]}'.")
+    pack = _DEFAULT_PACK
+    base_days = _section(data, 'downtime').get('base_days', pack.base_downtime_days)
+    if not isinstance(base_days, int) or isinstance(base_days, bool) or base_days < 1:
+        raise ValueError('The downtime base_days must be a whole number of at least 1.')
+    skill_abilities = bytearray(pack.skill_abilities)
+    for name, ability in _section(data, 'skills').items():
+        skill_abilities[_index(Skill, name)] = _index(Ability, ability)
+    tool_skills = list(pack.tool_skills)
+    tool_names = list(pack.tool_names)
+    for name, tool in _section(data, 'tools').items():
+        index = _index(Tool, name)
+        if not isinstance(tool, dict) or set(tool) - {'name', 'skills'}:
+            raise ValueError(f"Tool '{name}' must be a table of 'name' and 'skills'.")
+        if 'name' in tool:
+            tool_names[index] = str(tool['name'])
+        if 'skills' in tool:
+            if isinstance(tool['skills'], str) or not tool['skills']:
+                raise ValueError(f"Tool '{name}' needs a list of at least 1 skill.")
+            tool_skills[index] = bytes(_index(Skill, skill) for skill in tool['skills'])
+    weapons = list(pack.weapons)
+    for name, weapon in _section(data, 'weapons').items():
+        index = _index(WeaponType, name)
+        if not isinstance(weapon, dict) or set(weapon) != {'damage', 'type'}:
+            raise ValueError(f"Weapon '{name}' must be a table of 'damage' and 'type'.")
+        match = _DAMAGE_PATTERN.match(str(weapon['damage']).strip().lower())
+        if match is None or int(match.group(2)) not in Dice.__members__.values():
+            raise ValueError(f"Invalid damage '{weapon['damage']}' for weapon '{name}'.")
+        weapons[index] = (int(match.group(1)), int(match.group(2)),
+                          _index(DamageType, weapon['type']))
+    return RulePack(str(data.get('name', 'Custom rules')), base_days, bytes(skill_abilities),
+                    tuple(tool_skills), tuple(tool_names), tuple(weapons))
+
+def load_rule_pack(path: Union[str, Path], use_cache: bool = True) -> RulePack:
+    """Load a rule pack file, using its compiled cache when it is current.
+
+    The cache is a JSON file of the compiled tables named after the file with '.cache.json'
+    appended. It is only used if it was written for the current size and modification time of
+    the file and its tables are valid, and is otherwise compiled again. Failing to write the
+    cache is not an error.
+
+    Args:
+        path (Union[str, Path]): The JSON (.json) or TOML (.toml) file.
+        use_cache (bool, optional): If the compiled cache is read and written. Defaults to True.
+
+    Raises:
+        OSError: The file cannot be read.
+        ValueError: The file is not valid JSON or TOML, or not a valid rule pack. TOML needs
+            Python 3.11 or the tomli package.
+
+    Returns:
+        RulePack: The compiled pack.
+    """
+    path = Path(path)
+    stat = path.stat()
+    signature = [_CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
+    cache_path = path.with_name(path.name + _CACHE_SUFFIX)
+    if use_cache:
+        try:
+            with open(cache_path, encoding='utf-8') as file:
+                cached = json.load(file)
+            if cached['signature'] == signature:
+                return _pack_from_cache(cached['pack'])
+        except (OSError, KeyError, TypeError, ValueError):
+            pass
+    pack = compile_rule_pack(_parse(path))
+    if use_cache:
+        try:
+            # Written to a temporary file first, so a reader never sees a partial cache.
+            temporary_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                json.dump({'signature': signature, 'pack': _pack_to_cache(pack)}, file)
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            pass
+    return pack
+
+def save_rule_pack(pack: RulePack, path: Union[str, Path]) -> None:
+    """Write a RulePack as a JSON rule pack file with every rule, such as to start a new pack.
+
+    Args:
+        pack (RulePack): The pack to write.
+        path (Union[str, Path]): The file to write.
+    """
+    skills, tools, abilities = list(Skill), list(Tool), list(Ability)
+    damage_types = list(DamageType)
+    data = {
+        'name': pack.name,
+        'downtime': {'base_days': pack.base_downtime_days},
+        'skills': {skill.name.lower(): abilities[index].name.lower()
+                   for skill, index in zip(skills, pack.skill_abilities)},
+        'tools': {tool.name.lower(): {'name': name,
+                                      'skills': [skills[index].name.lower() for index in indexes]}
+                  for tool, name, indexes in zip(tools, pack.tool_names, pack.tool_skills)},
+        'weapons': {weapon_type.name.lower(): {'damage': f'{weapon[0]}d{weapon[1]}',
+                                               'type': damage_types[weapon[2]].name.lower()}
+                    for weapon_type, weapon in zip(WeaponType, pack.weapons)
+                    if weapon is not None},
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2)
+        file.write('\n')
+
+def apply_rule_pack(pack: RulePack) -> None:
+    """Make a RulePack the active rules of the common, combat, and downtime modules.
+
+    Args:
+        pack (RulePack): The pack to apply, such as default_rule_pack() to restore the built-in
+            rules.
+    """
+    skills, abilities = list(Skill), list(Ability)
+    common.set_rule_tables(
+        {skill: abilities[index] for skill, index in zip(skills, pack.skill_abilities)},
+        {tool: [skills[index] for index in indexes]
+         for tool, indexes in zip(Tool, pack.tool_skills)},
+        dict(zip(Tool, pack.tool_names)))
+    damage_types = list(DamageType)
+    Weapon.set_weapon_map({weapon_type: Damage(weapon[0], Dice(weapon[1]),
+                                               damage_types[weapon[2]])
+                           for weapon_type, weapon in zip(WeaponType, pack.weapons)
+                           if weapon is not None})
+    downtime.set_base_downtime_days(pack.base_downtime_days)
+    global _active_name
+    _active_name = pack.name
+
+def use_rule_pack(path: Union[str, Path]) -> RulePack:
+    """Load a rule pack file and make it the active rules.
+
+    Args:
+        path (Union[str, Path]): The JSON or TOML file.
+
+    Raises:
+        OSError: The file cannot be read.
+        ValueError: The file is not a valid rule pack.
+
+    Returns:
+        RulePack: The applied pack.
+    """
+    pack = load_rule_pack(path)
+    apply_rule_pack(pack)
+    return pack
+
+def current_rule_pack() -> RulePack:
+    """Return the active rules of the common, combat, and downtime modules as a RulePack.
+
+    Returns:
+        RulePack: The active rules, such as to apply them in another process.
+    """
+    skills, abilities = list(Skill), list(Ability)
+    damage_types = list(DamageType)
+    # pylint: disable=protected-access
+    weapon_map = Weapon._weapon_map
+    return RulePack(
+        _active_name, downtime.BASE_DOWNTIME_DAYS,
+        bytes(abilities.index(skill.ability()) for skill in skills),
+        tuple(bytes(skills.index(skill) for skill in tool.skills()) for tool in Tool),
+        tuple(Tool.get_display_name(tool) for tool in Tool),
+        tuple((weapon_map[weapon_type].num_dice, int(weapon_map[weapon_type].die),
+               damage_types.index(weapon_map[weapon_type].damage))
+              if weapon_type in weapon_map else None for weapon_type in WeaponType))
+
+def _parse(path: Path) -> Dict[str, Any]:
+    """Return the parsed data of a JSON or TOML rule pack file."""
+    if path.suffix.lower() == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError('TOML rule packs need Python 3.11 or the tomli package.') \
+                    from None
+        try:
+            with open(path, 'rb') as file:
+                return tomllib.load(file)
+        except tomllib.TOMLDecodeError as error:
+            raise ValueError(f'Invalid TOML in {path.name}: {error}') from None
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except json.JSONDecodeError as error:
+        raise ValueError(f'Invalid JSON in {path.name}: {error}') from None
+
+def _pack_to_cache(pack: RulePack) -> Dict[str, Any]:
+    """Return the tables of a RulePack as JSON compatible data."""
+    return {'name': pack.name, 'base_downtime_days': pack.base_downtime_days,
+            'skill_abilities': list(pack.skill_abilities),
+            'tool_skills': [list(skills) for skills in pack.tool_skills],
+            'tool_names': list(pack.tool_names), 'weapons': list(pack.weapons)}
+
+def _pack_from_cache(data: Dict[str, Any]) -> RulePack:
+    """Return the RulePack of cached tables, raising ValueError if they are not valid."""
+    skills, tools, abilities = len(Skill), len(Tool), len(Ability)
+    pack = RulePack(str(data['name']), int(data['base_downtime_days']),
+                    bytes(data['skill_abilities']),
+                    tuple(bytes(skills) for skills in data['tool_skills']),
+                    tuple(str(name) for name in data['tool_names']),
+                    tuple(None if weapon is None else tuple(int(value) for value in weapon)
+                          for weapon in data['weapons']))
+    valid = (pack.base_downtime_days >= 1
+             and len(pack.skill_abilities) == skills
+             and all(index < abilities for index in pack.skill_abilities)
+             and len(pack.tool_skills) == tools == len(pack.tool_names)
+             and all(indexes and max(indexes) < skills for indexes in pack.tool_skills)
+             and len(pack.weapons) == len(WeaponType)
+             and all(weapon is None or (len(weapon) == 3 and weapon[0] >= 0
+                                        and weapon[1] in Dice.__members__.values()
+                                        and 0 <= weapon[2] < len(DamageType))
+                     for weapon in pack.weapons))
+    if not valid:
+        raise ValueError('The cached rule pack is not valid.')
+    return pack
+
+def _section(data: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """Return a section of the data of a rule pack, which must be a table."""
+    section = data.get(name, {})
+    if not isinstance(section, dict):
+        raise ValueError(f"The '{name}' section of a rule pack must be a table.")
+    return section
+
+def _index(enum: Type, name: Any) -> int:
+    """Return the index of the member of an enum with a name, in any case and with spaces."""
+    member = str(name).strip().upper().replace(' ', '_')
+    if member not in enum.__members__:
+        raise ValueError(f"Unknown {enum.__name__} '{name}'.")
+    return list(enum.__members__).index(member)
+
+_DEFAULT_PACK = current_rule_pack()
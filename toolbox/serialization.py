@@ -0,0 +1,278 @@
+"""Convert the model classes to and from compact binary and JSON representations.
+
+The binary form packs each object with struct: a 1 byte type tag followed by little-endian
+integers, with enum members stored by value. Dice modifiers are packed with the dice they
+modify. Damage, weapon and attack records from before the dice modifiers have upper case tags
+and are still read, while new records get lower case tags. Records are self-delimiting, so
+several objects can be concatenated and read back with iter_from_bytes. The JSON form stores
+enum members by name, so it is also readable by people and other programs.
+
+Supported classes are Damage, Weapon, WeaponAttack, Currency, and AbilitySet.
+
+Functions:
+    to_bytes: Return the binary form of an object.
+    from_bytes: Create an object from its binary form.
+    iter_from_bytes: Iterate over the objects in concatenated binary forms.
+    to_dict: Return the JSON compatible form of an object.
+    from_dict: Create an object from its JSON compatible form.
+    to_json: Return the JSON form of an object.
+    from_json: Create an object from its JSON form.
+"""
+from __future__ import annotations, absolute_import
+import json
+import struct
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
+try:
+    from .combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+    from .common import AbilitySet
+    from .currency import Currency
+except ImportError:
+    from combat import Damage, DamageType, Dice, Weapon, WeaponAttack, WeaponType
+    from common import AbilitySet
+    from currency import Currency
+
+Serializable = Union[Damage, Weapon, WeaponAttack, Currency, AbilitySet]
+
+_TAG = struct.Struct('<c')
+_CURRENCY = struct.Struct('<5q')
+_DAMAGE = struct.Struct('<HBBBB?')
+_WEAPON = struct.Struct('<BhBBB?')
+# Damage and weapon layouts without the dice modifiers, read from records with upper case tags.
+_OLD_DAMAGE = struct.Struct('<HBB')
+_OLD_WEAPON = struct.Struct('<BhB')
+# The flags byte of an attack was a bool of proficient, so older data still reads the same.
+_ATTACK = struct.Struct('<hhBh')
+_PROFICIENT = 1
+_OFF_HAND = 2
+_ABILITY_SET = struct.Struct('<6h')
+_ABILITIES = ('strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma')
+
+def to_bytes(value: Union[Serializable, Iterable[Serializable]]) -> bytes:
+    """Return the binary form of an object.
+
+    Args:
+        value (Union[Serializable, Iterable[Serializable]]): The object, or several objects to
+            concatenate.
+
+    Raises:
+        TypeError: The object is not a supported class.
+        ValueError: A field is out of range for the binary form.
+
+    Returns:
+        bytes: The packed object.
+    """
+    if not isinstance(value, (Damage, Weapon, WeaponAttack, Currency, AbilitySet)):
+        if isinstance(value, (str, bytes)) or not hasattr(value, '__iter__'):
+            raise TypeError(f'Cannot serialize objects of type {type(value).__name__}.')
+        return b''.join(to_bytes(item) for item in value)
+    try:
+        return _pack(value)
+    except struct.error as error:
+        raise ValueError(f'Cannot pack {type(value).__name__}: {error}') from None
+
+def from_bytes(data: bytes) -> Serializable:
+    """Create an object from its binary form.
+
+    Args:
+        data (bytes): The packed object.
+
+    Raises:
+        ValueError: The data is not the binary form of a single object.
+
+    Returns:
+        Serializable: The unpacked object.
+    """
+    value, offset = _unpack(data, 0)
+    if offset != len(data):
+        raise ValueError('Unexpected data after the object.')
+    return value
+
+def iter_from_bytes(data: bytes) -> Iterator[Serializable]:
+    """Iterate over the objects in concatenated binary forms.
+
+    Args:
+        data (bytes): The packed objects.
+
+    Raises:
+        ValueError: The data is not a sequence of binary forms.
+
+    Yields:
+        Serializable: Each unpacked object in order.
+    """
+    offset = 0
+    while offset < len(data):
+        value, offset = _unpack(data, offset)
+        yield value
+
+def to_dict(value: Serializable) -> Dict[str, Any]:
+    """Return the JSON compatible form of an object.
+
+    Args:
+        value (Serializable): The object.
+
+    Raises:
+        TypeError: The object is not a supported class.
+
+    Returns:
+        Dict[str, Any]: The fields of the object, with the class name stored under 'type'.
+    """
+    if isinstance(value, Currency):
+        return {'type': 'Currency', 'platinum': value.platinum, 'gold': value.gold,
+                'electrum': value.electrum, 'silver': value.silver, 'copper': value.copper}
+    if isinstance(value, Damage):
+        return {'type': 'Damage', 'num_dice': value.num_dice, 'die': Dice(value.die).name,
+                'damage': value.damage.name, **_modifiers_to_dict(value)}
+    if isinstance(value, Weapon):
+        return {'type': 'Weapon', 'weapon_type': value.weapon_type.name, 'bonus': value.bonus,
+                'extra_damage': [to_dict(damage) for damage in value.extra_damage],
+                **_modifiers_to_dict(value)}
+    if isinstance(value, WeaponAttack):
+        return {'type': 'WeaponAttack', 'weapon': to_dict(value.weapon), 'level': value.level,
+                'attack_stat': value.attack_stat, 'proficient': bool(value.proficient),
+                'damage_mod': value.damage_mod, 'off_hand': bool(value.off_hand)}
+    if isinstance(value, AbilitySet):
+        return {'type': 'AbilitySet',
+                **{ability: getattr(value, ability) for ability in _ABILITIES}}
+    raise TypeError(f'Cannot serialize objects of type {type(value).__name__}.')
+
+def from_dict(data: Dict[str, Any]) -> Serializable:
+    """Create an object from its JSON compatible form.
+
+    Args:
+        data (Dict[str, Any]): The fields of the object, as returned by to_dict().
+
+    Raises:
+        ValueError: The type, a field, or an enum member is missing or invalid.
+
+    Returns:
+        Serializable: The object.
+    """
+    try:
+        kind = data['type']
+        if kind == 'Currency':
+            return Currency(int(data['platinum']), int(data['gold']), int(data['electrum']),
+                            int(data['silver']), int(data['copper']))
+        if kind == 'Damage':
+            return Damage(int(data['num_dice']), Dice[data['die']], DamageType[data['damage']],
+                          *_modifiers_from_dict(data))
+        if kind == 'Weapon':
+            return Weapon(WeaponType[data['weapon_type']], int(data['bonus']),
+                          [from_dict(damage) for damage in data['extra_damage']],
+                          *_modifiers_from_dict(data))
+        if kind == 'WeaponAttack':
+            return WeaponAttack(from_dict(data['weapon']), int(data['level']),
+                                int(data['attack_stat']), bool(data['proficient']),
+                                int(data['damage_mod']), bool(data.get('off_hand', False)))
+        if kind == 'AbilitySet':
+            return AbilitySet(*(int(data[ability]) for ability in _ABILITIES))
+    except (KeyError, TypeError) as error:
+        raise ValueError(f'Invalid {data.get("type", "object")}: {error!r}') from None
+    raise ValueError(f"Unknown type '{kind}'.")
+
+def to_json(value: Serializable) -> str:
+    """Return the JSON form of an object.
+
+    Args:
+        value (Serializable): The object.
+
+    Raises:
+        TypeError: The object is not a supported class.
+
+    Returns:
+        str: The object as a JSON object.
+    """
+    return json.dumps(to_dict(value), separators=(',', ':'))
+
+def from_json(text: str) -> Serializable:
+    """Create an object from its JSON form.
+
+    Args:
+        text (str): The object as a JSON object, as returned by to_json().
+
+    Raises:
+        ValueError: The text is not valid JSON or not a supported object.
+
+    Returns:
+        Serializable: The object.
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError('JSON value is not an object.')
+    return from_dict(data)
+
+def _pack(value: Serializable) -> bytes:
+    """Return the binary form of an object, letting struct errors through."""
+    if isinstance(value, Currency):
+        return b'C' + _CURRENCY.pack(*value.key())
+    if isinstance(value, Damage):
+        return b'd' + _pack_damage(value)
+    if isinstance(value, Weapon):
+        return b'w' + _pack_weapon(value)
+    if isinstance(value, WeaponAttack):
+        flags = (_PROFICIENT if value.proficient else 0) | (_OFF_HAND if value.off_hand else 0)
+        return (b'a' + _ATTACK.pack(value.level, value.attack_stat, flags, value.damage_mod)
+                + _pack_weapon(value.weapon))
+    if isinstance(value, AbilitySet):
+        return b'S' + _ABILITY_SET.pack(*(getattr(value, ability) for ability in _ABILITIES))
+    raise TypeError(f'Cannot serialize objects of type {type(value).__name__}.')
+
+def _pack_damage(damage: Damage) -> bytes:
+    """Return the untagged binary form of a Damage object."""
+    return _DAMAGE.pack(damage.num_dice, int(damage.die), damage.damage.value, damage.reroll,
+                        damage.minimum, bool(damage.best_of_two))
+
+def _pack_weapon(weapon: Weapon) -> bytes:
+    """Return the untagged binary form of a Weapon object."""
+    return (_WEAPON.pack(weapon.weapon_type.value, weapon.bonus, len(weapon.extra_damage),
+                         weapon.reroll, weapon.minimum, bool(weapon.best_of_two))
+            + b''.join(_pack_damage(damage) for damage in weapon.extra_damage))
+
+def _unpack(data: bytes, offset: int) -> Tuple[Serializable, int]:
+    """Unpack the object starting at an offset and return it with the offset after it."""
+    try:
+        tag = _TAG.unpack_from(data, offset)[0]
+        offset += _TAG.size
+        if tag == b'C':
+            return Currency(*_CURRENCY.unpack_from(data, offset)), offset + _CURRENCY.size
+        if tag in (b'd', b'D'):
+            return _unpack_damage(data, offset, tag == b'D')
+        if tag in (b'w', b'W'):
+            return _unpack_weapon(data, offset, tag == b'W')
+        if tag in (b'a', b'A'):
+            level, attack_stat, flags, damage_mod = _ATTACK.unpack_from(data, offset)
+            weapon, offset = _unpack_weapon(data, offset + _ATTACK.size, tag == b'A')
+            return WeaponAttack(weapon, level, attack_stat, bool(flags & _PROFICIENT), damage_mod,
+                                bool(flags & _OFF_HAND)), offset
+        if tag == b'S':
+            return AbilitySet(*_ABILITY_SET.unpack_from(data, offset)), offset + _ABILITY_SET.size
+    except struct.error:
+        raise ValueError('Data is truncated.') from None
+    raise ValueError(f'Unknown type tag {tag!r}.')
+
+def _unpack_damage(data: bytes, offset: int, old: bool = False) -> Tuple[Damage, int]:
+    """Unpack an untagged Damage object and return it with the offset after it."""
+    layout = _OLD_DAMAGE if old else _DAMAGE
+    num_dice, die, damage_type, *modifiers = layout.unpack_from(data, offset)
+    return Damage(num_dice, Dice(die), DamageType(damage_type), *modifiers), offset + layout.size
+
+def _unpack_weapon(data: bytes, offset: int, old: bool = False) -> Tuple[Weapon, int]:
+    """Unpack an untagged Weapon object and return it with the offset after it."""
+    layout = _OLD_WEAPON if old else _WEAPON
+    weapon_type, bonus, count, *modifiers = layout.unpack_from(data, offset)
+    offset += layout.size
+    extra_damage = []
+    for _ in range(count):
+        damage, offset = _unpack_damage(data, offset, old)
+        extra_damage.append(damage)
+    return Weapon(WeaponType(weapon_type), bonus, extra_damage, *modifiers), offset
+
+def _modifiers_to_dict(value: Union[Damage, Weapon]) -> Dict[str, Any]:
+    """Return the dice modifiers of a Damage or Weapon that differ from the defaults."""
+    modifiers = {'reroll': value.reroll, 'minimum': value.minimum,
+                 'best_of_two': bool(value.best_of_two)}
+    return {name: modifier for name, modifier in modifiers.items() if modifier}
+
+def _modifiers_from_dict(data: Dict[str, Any]) -> Tuple[int, int, bool]:
+    """Return the dice modifiers stored by _modifiers_to_dict, with defaults for missing ones."""
+    return (int(data.get('reroll', 0)), int(data.get('minimum', 0)),
+            bool(data.get('best_of_two', False)))
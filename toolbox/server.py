@@ -0,0 +1,461 @@
+"""Serve the toolbox calculations over a local HTTP JSON API.
+
+The server is built on asyncio streams. Concurrent requests are collected into micro-batches
+that are calculated together in a worker process, so the event loop only parses and routes
+requests and the cost of sending work to a process is shared by the whole batch.
+
+Endpoints (POST with a JSON object body, except /health):
+    GET /health: Return {"status": "ok"}.
+    POST /attack: The fields of a batch report row (see batch.py), plus target_ac or
+        target_acs. Returns the hit bonus, the average damage on a hit and on a critical hit,
+        and the average damage against each AC.
+    POST /split: currency, players (at most MAX_PLAYERS), consolidate (default true), and
+        currencies (default ["cp", "sp", "gp"]). Returns the shares.
+    POST /consolidate: currency and currencies. Returns the consolidated currency.
+    POST /downtime: kind ("language", "skill", "tool", "weapon", or "armor") and the scores
+        used by that kind of training. Returns the days of training.
+
+Currencies are given as a string like "3pp, 12gp" or an object with the number of each coin.
+
+Classes:
+    RequestBatcher: Collects concurrent requests into batches calculated by an executor.
+    ToolboxServer: An HTTP server for the calculation endpoints.
+
+Functions:
+    calculate: Run the calculation of an endpoint.
+    run_batch: Run the calculations of several requests.
+    main: Run the server from the command line.
+"""
+from __future__ import annotations, absolute_import
+import argparse
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+try:
+    from .batch import parse_attack
+    from .currency import Currency, CurrencyOptions
+    from .downtime import (language_training_days, proficiency_training_days,
+                           skill_training_days, tool_check_bonus, tool_training_days)
+    from .rules import apply_rule_pack, current_rule_pack, use_rule_pack
+except ImportError:
+    from batch import parse_attack
+    from currency import Currency, CurrencyOptions
+    from downtime import (language_training_days, proficiency_training_days,
+                          skill_training_days, tool_check_bonus, tool_training_days)
+    from rules import apply_rule_pack, current_rule_pack, use_rule_pack
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8750
+MAX_BODY_SIZE = 1 << 20
+IDLE_TIMEOUT = 30.0
+MAX_PLAYERS = 20
+
+_COIN_OPTIONS = {'cp': CurrencyOptions.COPPER, 'sp': CurrencyOptions.SILVER,
+                 'ep': CurrencyOptions.ELECTRUM, 'gp': CurrencyOptions.GOLD,
+                 'pp': CurrencyOptions.PLATINUM}
+_COIN_NAMES = ('platinum', 'gold', 'electrum', 'silver', 'copper')
+
+def calculate(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the calculation of an endpoint.
+
+    Args:
+        path (str): The path of the endpoint, e.g. '/attack'.
+        payload (Dict[str, Any]): The body of the request.
+
+    Raises:
+        KeyError: The path is not an endpoint.
+        ValueError: The payload is invalid.
+
+    Returns:
+        Dict[str, Any]: The body of the response.
+    """
+    return _ENDPOINTS[path](payload)
+
+def run_batch(requests: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Run the calculations of several requests.
+
+    Used by the worker processes, so that a whole batch is sent to a process at once.
+
+    Args:
+        requests (List[Tuple[str, Dict[str, Any]]]): The path and payload of each request.
+
+    Returns:
+        List[Tuple[int, Dict[str, Any]]]: The HTTP status and body of each response.
+    """
+    responses = []
+    for path, payload in requests:
+        if path not in _ENDPOINTS:
+            responses.append((HTTPStatus.NOT_FOUND, {'error': f'Unknown endpoint {path}.'}))
+            continue
+        try:
+            responses.append((HTTPStatus.OK, calculate(path, payload)))
+        except KeyError as error:
+            responses.append((HTTPStatus.BAD_REQUEST, {'error': f'Missing field {error}.'}))
+        except (AttributeError, TypeError, ValueError) as error:
+            responses.append((HTTPStatus.BAD_REQUEST, {'error': str(error)}))
+        except Exception as error: # pylint: disable=broad-except
+            responses.append((HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}))
+    return [(int(status), body) for status, body in responses]
+
+class RequestBatcher():
+    """Collects concurrent requests into batches calculated by an executor.
+
+    A batch is sent when it reaches max_batch requests, or max_delay seconds after its first
+    request arrived, whichever comes first.
+
+    Methods:
+        submit: Add a request to the next batch and wait for its response.
+    """
+    def __init__(self, executor: Optional[Executor], max_batch: int = 64,
+                 max_delay: float = 0.002) -> None:
+        """Initializes the RequestBatcher.
+
+        Args:
+            executor (Optional[Executor]): Runs the batches. If None, batches are calculated on
+                the event loop.
+            max_batch (int, optional): The largest number of requests in a batch.
+                Defaults to 64.
+            max_delay (float, optional): The longest time a request waits for its batch to
+                fill, in seconds. Defaults to 0.002.
+        """
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.requests = 0
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, path: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Add a request to the next batch and wait for its response.
+
+        Args:
+            path (str): The path of the endpoint.
+            payload (Dict[str, Any]): The body of the request.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: The HTTP status and body of the response.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((path, payload, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Send the pending requests as a batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.requests += len(batch)
+        requests = [(path, payload) for path, payload, _ in batch]
+        futures = [future for _, _, future in batch]
+        if self.executor is None:
+            _resolve(futures, run_batch(requests))
+            return
+        done = asyncio.get_running_loop().run_in_executor(self.executor, run_batch, requests)
+        done.add_done_callback(lambda task: _resolve_task(futures, task))
+
+class ToolboxServer():
+    """Represents an HTTP server for the calculation endpoints.
+
+    Connections are kept alive between requests unless the client asks to close them, or are
+    closed after idle_timeout seconds without a request.
+
+    Methods:
+        start: Start listening for connections.
+        serve_forever: Serve requests until the server is closed.
+        close: Stop the server, its open connections, and its workers.
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 workers: Optional[int] = None, max_batch: int = 64,
+                 max_delay: float = 0.002, idle_timeout: float = IDLE_TIMEOUT) -> None:
+        """Initializes the ToolboxServer.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to DEFAULT_HOST.
+            port (int, optional): The port to listen on, or 0 for any free port. Defaults to
+                DEFAULT_PORT.
+            workers (Optional[int], optional): The number of worker processes, which start with
+                the active rule pack. If 0, requests are calculated on the event loop. Defaults
+                to the number of CPUs.
+            max_batch (int, optional): The largest number of requests in a batch.
+                Defaults to 64.
+            max_delay (float, optional): The longest time a request waits for its batch to
+                fill, in seconds. Defaults to 0.002.
+            idle_timeout (float, optional): The longest time to wait for the next request on a
+                connection, in seconds. Defaults to IDLE_TIMEOUT.
+        """
+        self.host = host
+        self.port = port
+        # Workers start with the active rules, even if they do not inherit them from this process.
+        self.executor = None if workers == 0 else ProcessPoolExecutor(
+            max_workers=workers, initializer=apply_rule_pack, initargs=(current_rule_pack(),))
+        self.batcher = RequestBatcher(self.executor, max_batch, max_delay)
+        self.idle_timeout = idle_timeout
+        self._server = None
+        self._writers = set()
+
+    async def start(self) -> Tuple[str, int]:
+        """Start listening for connections.
+
+        Returns:
+            Tuple[str, int]: The address and port the server is listening on.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        """Serve requests until the server is closed."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop the server, close its open connections, and stop its workers."""
+        if self._server is not None:
+            server, self._server = self._server, None
+            server.close()
+            # wait_closed() waits for open connections from Python 3.12, so idle keep-alive
+            # connections are closed first.
+            for writer in list(self._writers):
+                writer.close()
+            await server.wait_closed()
+        if self.executor is not None:
+            executor, self.executor = self.executor, None
+            executor.shutdown()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of a connection until it is closed or idle."""
+        self._writers.add(writer)
+        try:
+            while True:
+                request = await asyncio.wait_for(_read_request(reader), self.idle_timeout)
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, response = await self._respond(method, path, body)
+                data = json.dumps(response).encode()
+                writer.write(f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n'
+                             'Content-Type: application/json\r\n'
+                             f'Content-Length: {len(data)}\r\n'
+                             f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+                             '\r\n'.encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, method: str, path: str,
+                       body: Optional[bytes]) -> Tuple[int, Dict[str, Any]]:
+        """Return the status and body of the response to a request."""
+        if body is None:
+            return HTTPStatus.BAD_REQUEST, {'error': 'Invalid request.'}
+        if path == '/health':
+            return HTTPStatus.OK, {'status': 'ok'}
+        if path not in _ENDPOINTS:
+            return HTTPStatus.NOT_FOUND, {'error': f'Unknown endpoint {path}.'}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use POST.'}
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {'error': 'Body is not valid JSON.'}
+        if not isinstance(payload, dict):
+            return HTTPStatus.BAD_REQUEST, {'error': 'Body is not a JSON object.'}
+        return await self.batcher.submit(path, payload)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the server from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments. Defaults to
+            sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description='Serve the toolbox calculations over HTTP.')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f'the address to listen on (default {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'the port to listen on (default {DEFAULT_PORT})')
+    parser.add_argument('--workers', type=int,
+                        help='worker processes, or 0 to calculate on the event loop '
+                        '(default: number of CPUs)')
+    parser.add_argument('--max-batch', type=int, default=64,
+                        help='the largest number of requests in a batch (default 64)')
+    parser.add_argument('--max-delay', type=float, default=2.0,
+                        help='milliseconds a request waits for its batch to fill (default 2)')
+    parser.add_argument('--rules', metavar='FILE',
+                        help='use the weapons, tools, skills, and downtime of a JSON or TOML '
+                        'rule pack')
+    args = parser.parse_args(argv)
+    if args.max_batch < 1:
+        parser.error('--max-batch must be at least 1')
+    if args.rules:
+        try:
+            use_rule_pack(args.rules)
+        except (OSError, ValueError) as error:
+            parser.error(f'cannot use rule pack: {error}')
+    server = ToolboxServer(args.host, args.port, args.workers, args.max_batch,
+                           args.max_delay / 1000)
+
+    async def serve():
+        host, port = await server.start()
+        print(f'Serving on http://{host}:{port}', flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def _attack(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate the /attack endpoint."""
+    _, attack = parse_attack({'name': 'attack', **payload})
+    target_acs = payload.get('target_acs', [payload.get('target_ac', 10)])
+    if not isinstance(target_acs, list):
+        raise ValueError('target_acs must be a list.')
+    target_acs = [int(target_ac) for target_ac in target_acs]
+    return {'hit_bonus': attack.hit_bonus,
+            'average_hit_damage': attack.average_hit_damage(),
+            'critical_hit_damage': attack.critical_hit_damage(),
+            'average_damage': dict(zip((str(target_ac) for target_ac in target_acs),
+                                       attack.average_damages(target_acs)))}
+
+def _split(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate the /split endpoint."""
+    players = int(payload['players'])
+    if players < 1:
+        raise ValueError('players must be at least 1.')
+    if players > MAX_PLAYERS:
+        raise ValueError(f'players must be at most {MAX_PLAYERS}.')
+    shares = _parse_currency(payload['currency']).split(
+        players, bool(payload.get('consolidate', True)), _parse_options(payload))
+    return {'shares': [str(share) for share in shares]}
+
+def _consolidate(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate the /consolidate endpoint."""
+    return {'currency': str(_parse_currency(payload['currency']).consolidate(
+        _parse_options(payload)))}
+
+def _downtime(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate the /downtime endpoint."""
+    kind = payload['kind']
+    if kind == 'language':
+        return {'days': language_training_days(int(payload['intelligence']),
+                                               int(payload['wisdom']), int(payload['charisma']))}
+    if kind in ('weapon', 'armor'):
+        return {'days': proficiency_training_days(int(payload['ability_score']))}
+    if kind == 'skill':
+        days, expertise_days = skill_training_days(int(payload['ability_score']))
+    elif kind == 'tool':
+        checks = payload['skills']
+        if not isinstance(checks, list):
+            raise ValueError('skills must be a list.')
+        days, expertise_days = tool_training_days(
+            tool_check_bonus(int(check['ability_score']), int(payload['proficiency_bonus']),
+                             bool(check.get('proficient', False)), int(check.get('bonus', 0)))
+            for check in checks)
+    else:
+        raise ValueError(f"Unknown downtime kind '{kind}'.")
+    return {'days': days, 'expertise_days': expertise_days}
+
+def _parse_currency(value: Any) -> Currency:
+    """Create a Currency from a string or an object with the number of each coin."""
+    if isinstance(value, str):
+        return Currency.parse(value)
+    if isinstance(value, dict):
+        return Currency(*(int(value.get(coin, 0)) for coin in _COIN_NAMES))
+    raise ValueError('currency must be a string or an object.')
+
+def _parse_options(payload: Dict[str, Any]) -> CurrencyOptions:
+    """Return the coins to consolidate to from the currencies field of a request."""
+    coins = payload.get('currencies')
+    if coins is None:
+        return CurrencyOptions.COMMON
+    if not isinstance(coins, list) or any(coin not in _COIN_OPTIONS for coin in coins):
+        raise ValueError(f'currencies must be a list of {", ".join(_COIN_OPTIONS)}.')
+    options = CurrencyOptions.COPPER
+    for coin in coins:
+        options |= _COIN_OPTIONS[coin]
+    return options
+
+async def _read_request(reader: asyncio.StreamReader
+                        ) -> Optional[Tuple[str, str, Optional[bytes], bool]]:
+    """Read a request, returning its method, path, body, and whether to keep the connection.
+
+    Returns None at the end of the connection. The body is None if the request is malformed.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode('latin-1').split()
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = header.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if len(parts) != 3:
+        return '', '', None, False
+    method, path, version = parts
+    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        return method, path, None, False
+    if not 0 <= length <= MAX_BODY_SIZE:
+        return method, path, None, False
+    body = await reader.readexactly(length) if length else b''
+    return method, path.split('?', 1)[0], body, keep_alive
+
+def _resolve(futures: List[asyncio.Future],
+             responses: List[Tuple[int, Dict[str, Any]]]) -> None:
+    """Set the results of the futures of a batch, skipping requests that were abandoned."""
+    for future, response in zip(futures, responses):
+        if not future.done():
+            future.set_result(response)
+
+def _resolve_task(futures: List[asyncio.Future], task: asyncio.Future) -> None:
+    """Set the results of the futures of a batch from the task that calculated it."""
+    if task.cancelled() or task.exception() is not None:
+        error = 'Calculation cancelled.' if task.cancelled() else str(task.exception())
+        _resolve(futures, [(int(HTTPStatus.INTERNAL_SERVER_ERROR), {'error': error})]
+                 * len(futures))
+    else:
+        _resolve(futures, task.result())
+
+_ENDPOINTS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    '/attack': _attack,
+    '/split': _split,
+    '/consolidate': _consolidate,
+    '/downtime': _downtime,
+}
+
+if __name__ == '__main__':
+    main()
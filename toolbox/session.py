@@ -0,0 +1,118 @@
+"""Save and restore the state of a GUI session.
+
+A session stores the values of the input elements, the text of the output elements, and the
+layout state (such as the active screen) in a JSON file. The outputs are only restored if they
+were calculated by the same version of the toolbox with the same rules, including any rule pack,
+so a warm start never shows stale results.
+
+Classes:
+    Session: The saved state of a GUI session.
+
+Functions:
+    session_fingerprint: Return a fingerprint of the code that calculates the outputs.
+    save_session: Write a Session to a file.
+    load_session: Read a Session from a file.
+"""
+from __future__ import annotations, absolute_import
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, NamedTuple, Optional
+try:
+    from .rules import current_rule_pack
+    from .version import __version__
+except ImportError:
+    from rules import current_rule_pack
+    from version import __version__
+
+SESSION_VERSION = 1
+
+class Session(NamedTuple):
+    """Represents the saved state of a GUI session.
+
+    Attributes:
+        values: The values of the input elements, keyed by element key.
+        outputs: The text of the output elements, keyed by element key. Empty if the outputs
+            must be recalculated.
+        layout: Other state of the window, such as the active screen.
+    """
+    values: Dict[str, Any]
+    outputs: Dict[str, str]
+    layout: Dict[str, Any]
+
+def session_fingerprint() -> str:
+    """Return a fingerprint of the code that calculates the outputs.
+
+    Returns:
+        str: The toolbox version and a hash of every table of the active rules: weapons, tools,
+            skills, and downtime.
+    """
+    pack = current_rule_pack()
+    # The name of the pack does not change any result.
+    rules = [pack.base_downtime_days, list(pack.skill_abilities),
+             [list(skills) for skills in pack.tool_skills], list(pack.tool_names), pack.weapons]
+    return f'{__version__}:{hashlib.sha256(json.dumps(rules).encode()).hexdigest()}'
+
+def save_session(path: str, session: Session) -> None:
+    """Write a Session to a file.
+
+    Values that cannot be stored as JSON are skipped. The file is replaced atomically, so an
+    interrupted save never leaves a partial session.
+
+    Args:
+        path (str): The path of the session file.
+        session (Session): The Session to save.
+    """
+    data = {
+        'version': SESSION_VERSION,
+        'fingerprint': session_fingerprint(),
+        'values': {key: value for key, value in session.values.items()
+                   if isinstance(key, str) and _is_json_value(value)},
+        'outputs': {key: str(value) for key, value in session.outputs.items()},
+        'layout': session.layout,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w') as file:
+            json.dump(data, file)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+def load_session(path: str) -> Optional[Session]:
+    """Read a Session from a file.
+
+    Args:
+        path (str): The path of the session file.
+
+    Returns:
+        Optional[Session]: The saved Session, or None if the file does not exist or is not a
+        valid session. If the outputs were calculated by a different version of the toolbox or
+        with different weapon rules, the outputs are empty.
+    """
+    try:
+        with open(path) as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != SESSION_VERSION:
+        return None
+    values = data.get('values')
+    outputs = data.get('outputs')
+    layout = data.get('layout')
+    if not all(isinstance(part, dict) for part in (values, outputs, layout)):
+        return None
+    if data.get('fingerprint') != session_fingerprint():
+        outputs = {}
+    return Session(values, outputs, layout)
+
+def _is_json_value(value: Any) -> bool:
+    """Return whether a value can be stored as JSON without conversion."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_json_value(item) for item in value)
+    return False
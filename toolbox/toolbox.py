@@ -1,13 +1,28 @@
 """Implents a GUI that provides an interface to use the toolbox calculation methods.
 """
 from __future__ import division, absolute_import
-from math import ceil, floor
+from collections import Counter
+from time import perf_counter
+from typing import List, Optional, Tuple
+import argparse
 import sys
 import PySimpleGUI as sg
 from pathlib import Path
-from currency import Currency, CurrencyOptions
+from currency import Currency, CurrencyOptions, cached_consolidate, cached_split
 from combat import WeaponType, Dice, DamageType, Weapon, Damage, WeaponAttack
-from common import Skill, Tool, Ability
+from common import Skill, Tool, Ability, AbilitySet
+from latency import LatencyRecorder
+from jobs import JOB_DONE_EVENT, JobResult, JobRunner
+from cache import ResultCache
+from downtime import (ABILITY_SCORES, MAX_ABILITY_SCORE,
+                      language_days_curve, language_training_days, proficiency_days_curve,
+                      proficiency_training_days, skill_days_curve, skill_training_days,
+                      tool_check_bonus, tool_days_curve, tool_training_days)
+from session import Session, load_session, save_session
+from checks import Character, RollMode
+from group_checks import best_passive_score, party_check
+from rules import use_rule_pack
+import downtime
 import version
 
 #region GUI Constants
@@ -25,9 +40,11 @@ TAB_SELECTED_BACKGROUND_COLOR = '#64778D'
 COMBAT_SCREEN_KEY = '-screen-0-'
 CURRENCY_SCREEN_KEY = '-screen-1-'
 DOWNTIME_SCREEN_KEY = '-screen-2-'
+PARTY_SCREEN_KEY = '-screen-3-'
 WEAPON_TYPE_KEY = '-weapon-type-'
 WEAPON_BONUS_KEY = '-weapon-bonus-'
 EXIT_BUTTON_KEY = '-exit-'
+LATENCY_STATUS_KEY = '-latency-status-'
 NAV_COMBO_KEY = '-nav-'
 CHARACTER_LEVEL_KEY = '-character-level-'
 CHARACTER_ATTACK_STAT_KEY = '-character-attack-stat-'
@@ -53,6 +70,7 @@ SPLIT_SILVER_INPUT_KEY = '-split-silver-input-'
 SPLIT_COPPER_INPUT_KEY = '-split-copper-input-'
 SPLIT_CONSOLIDATE_CURRENCY_KEY = '-split-consolidate-currency-'
 PARTY_SIZE_KEY = '-party-size-'
+SPLIT_SHARES_KEY = '-split-shares-'
 SPLIT_PLATINUM_USED_KEY = '-split-platinum-used-'
 SPLIT_GOLD_USED_KEY = '-split-gold-used-'
 SPLIT_ELECTRUM_USED_KEY = '-split-electrum-used-'
@@ -104,7 +122,27 @@ DOWNTIME_ARMOR_LIGHT_KEY = '-downtime-armor-light-'
 DOWNTIME_ARMOR_MEDIUM_KEY = '-downtime-armor-medium-'
 DOWNTIME_ARMOR_HEAVY_KEY = '-downtime-armor-heavy-'
 DOWNTIME_RESULT_KEY = '-downtime-result-'
-SCREEN_NAMES = ['Combat', 'Currency', 'Downtime Training']
+DOWNTIME_CHART_ABILITY_KEY = '-downtime-chart-ability-'
+DOWNTIME_CHART_LABEL_KEY = '-downtime-chart-label-'
+DOWNTIME_CHART_KEY = '-downtime-chart-'
+DOWNTIME_CHART_SIZE = (360, 160)
+MAX_PARTY_MEMBERS = 6
+PARTY_MEMBERS_KEY = '-party-members-'
+PARTY_CHECK_KEY = '-party-check-'
+PARTY_DC_KEY = '-party-dc-'
+PARTY_ROLL_MODE_KEY = '-party-roll-mode-'
+PARTY_GUIDANCE_KEY = '-party-guidance-'
+PARTY_MEMBER_PANEL_KEYS = [f'-party-member-col-{x}' for x in range(0, MAX_PARTY_MEMBERS)]
+PARTY_NAME_KEYS = [f'-party-name-{x}' for x in range(0, MAX_PARTY_MEMBERS)]
+PARTY_SCORE_KEYS = {ability: [f'-party-{ability.name.lower()}-{x}'
+                              for x in range(0, MAX_PARTY_MEMBERS)] for ability in Ability}
+PARTY_PROFICIENCY_BONUS_KEYS = [f'-party-prof-bonus-{x}' for x in range(0, MAX_PARTY_MEMBERS)]
+PARTY_PROFICIENT_KEYS = [f'-party-proficient-{x}' for x in range(0, MAX_PARTY_MEMBERS)]
+PARTY_EXPERTISE_KEYS = [f'-party-expertise-{x}' for x in range(0, MAX_PARTY_MEMBERS)]
+PARTY_CHANCE_KEYS = [f'-party-chance-{x}' for x in range(0, MAX_PARTY_MEMBERS)]
+PARTY_RESULT_KEY = '-party-result-'
+ROLL_MODE_NAMES = ['Normal', 'Advantage', 'Disadvantage']
+SCREEN_NAMES = ['Combat', 'Currency', 'Downtime Training', 'Party Checks']
 #endregion
 
 DAMAGE_CALCULATION_EVENTS = [CHARACTER_LEVEL_KEY, CHARACTER_ATTACK_STAT_KEY,
@@ -115,18 +153,41 @@ DAMAGE_CALCULATION_EVENTS = [CHARACTER_LEVEL_KEY, CHARACTER_ATTACK_STAT_KEY,
 
 NUM_DAMAGE_PANELS = 3
 
-BASE_DOWNTIME_DAYS = 250
+OUTPUT_KEYS = ([f'{key}-{index}' for index in range(1, 3)
+                for key in (HIT_BONUS_KEY, AVG_HIT_DAMAGE_KEY, AVG_DAMAGE_KEY)]
+               + [WEAPON_SUMMARY_KEY, SPLIT_CURRENCY_RESULTS_KEY, MATH_CURRENCY_RESULTS_KEY,
+                  DOWNTIME_RESULT_KEY, PARTY_RESULT_KEY] + PARTY_CHANCE_KEYS)
+RESIZED_OUTPUT_KEYS = [SPLIT_CURRENCY_RESULTS_KEY, DOWNTIME_RESULT_KEY]
+DEFAULT_SESSION_PATH = str(Path.home() / '.dnd-toolbox-session.json')
 
-def main():
+def main(profile_latency: bool = False, latency_dump: Optional[str] = None,
+         cache_path: Optional[str] = None, session_path: Optional[str] = None):
     """The main calling program that displays the GUI and handles events.
 
     The primary purpose of this program is the repeated loop that listens for events and calls
     the appropriate function.
+
+    Args:
+        profile_latency (bool, optional): If True, the time spent handling each event and
+            redrawing the window is recorded and summarized in the status bar. Defaults to False.
+        latency_dump (Optional[str], optional): A CSV file to write the recorded event timings
+            to when the window closes. Has no effect if profile_latency is False. Defaults to
+            None.
+        cache_path (Optional[str], optional): A cache database to store currency splits in
+            between sessions. Defaults to None, which disables the on-disk cache.
+        session_path (Optional[str], optional): A file to restore the inputs and results from
+            on startup and to save them to on exit. Defaults to None, which starts from the
+            default inputs.
     """
     set_theme()
-    window = main_window()
+    window = main_window(profile_latency)
     active_layout = 0
     first_read = False
+    recorder = LatencyRecorder() if profile_latency else None
+    jobs = JobRunner(window.write_event_value)
+    cache = ResultCache(cache_path) if cache_path else None
+    session = load_session(session_path) if session_path else None
+    snapshot = None
 
     while True:
         if not first_read:
@@ -136,174 +197,259 @@ def main():
         #print(event, values)
         if not first_read:
             first_read = True
-            init_combat_panel(window, values)
-            init_currency_panel(window, values)
-            init_downtime_panel(window, values)
+            if session is None:
+                init_combat_panel(window, values)
+                init_currency_panel(window, values)
+                init_downtime_panel(window, values)
+                init_party_panel(window, values)
+            else:
+                # The values read before the session was restored are stale
+                active_layout = restore_session(window, session)
+                continue
         if event == sg.WINDOW_CLOSED or event == EXIT_BUTTON_KEY:
             break
 
-        if event == NAV_COMBO_KEY:
-            try:
-                new_layout = SCREEN_NAMES.index(values[NAV_COMBO_KEY])
-                active_layout = change_screen(window, active_layout, new_layout)
-            except ValueError:
-                window[NAV_COMBO_KEY].update(value=SCREEN_NAMES[active_layout])
-
-        #region Combat screen events
-        if ADD_WEAPON_DAMAGE_BUTTON_KEY in event:
-            add_index = int(event.replace(ADD_WEAPON_DAMAGE_BUTTON_KEY, '')[1:])
-            add_weapon_damage(window, add_index)
-
-        if REMOVE_WEAPON_DAMAGE_BUTTON_KEY in event:
-            remove_index = int(event.replace(REMOVE_WEAPON_DAMAGE_BUTTON_KEY, '')[1:])
-            remove_weapon_damage(window, remove_index)
-
-        if any(key in event for key in DAMAGE_CALCULATION_EVENTS):
-            global_events = [CHARACTER_LEVEL_KEY, CHARACTER_ATTACK_STAT_KEY,
-                             CHARACTER_DAMAGE_MOD_KEY, TARGET_AC_KEY]
-            if event in global_events:
-                for update_index in range(1, 3):
-                    update_weapon_attack(window, values, update_index)
-            else:
-                damage_panel_events = [DICE_NUMBER_KEY, DAMAGE_TYPE_KEY, DAMAGE_TYPE_KEY]
-                splits = event.split('-')
-                if any(key in event for key in damage_panel_events):
-                    update_index = int(splits[len(splits)-2])
-                else:
-                    update_index = int(splits[len(splits)-1])
-                update_weapon_attack(window, values, update_index)
-        #endregion
-
-        #region Currency screen events
-        if event in [SPLIT_PLATINUM_INPUT_KEY, SPLIT_GOLD_INPUT_KEY, SPLIT_ELECTRUM_INPUT_KEY,
-                     SPLIT_SILVER_INPUT_KEY, SPLIT_COPPER_INPUT_KEY]:
-            # Input validation
-            if not values[event]:
-                continue
-            if values[event][-1] not in '0123456789':
-                window[event].update(values[event][:-1])
-            if int(values[event]) >= int(1e9):
-                window[event].update(str(int(1e9)-1))
-            if int(values[event]) < 0:
-                window[event].update(str(0))
-            split_currency(window, values)
-        
-        if event in [SPLIT_PLATINUM_USED_KEY, SPLIT_GOLD_USED_KEY, SPLIT_ELECTRUM_USED_KEY,
-                     SPLIT_SILVER_USED_KEY, SPLIT_COPPER_USED_KEY, SPLIT_CONSOLIDATE_CURRENCY_KEY]:
-            split_currency(window, values)
-            if event == SPLIT_CONSOLIDATE_CURRENCY_KEY:
-                window[SPLIT_CURRENCIES_USED_PANEL].update(visible=values[event])
-        
-        if event == PARTY_SIZE_KEY:
-            if not values[event]:
-                continue
-            if values[event][-1] not in '0123456789':
-                window[event].update(values[event][:-1])
-            if int(values[event]) > 20:
-                window[event].update(str(20))
-            if int(values[event]) < 1:
-                window[event].update(str(1))
-            split_currency(window, values)
-        
-        if event in [MATH_PLATINUM_INPUT_1_KEY, MATH_GOLD_INPUT_1_KEY, MATH_ELECTRUM_INPUT_1_KEY,
-                     MATH_SILVER_INPUT_1_KEY, MATH_COPPER_INPUT_1_KEY, MATH_PLATINUM_INPUT_2_KEY,
-                     MATH_GOLD_INPUT_2_KEY, MATH_ELECTRUM_INPUT_2_KEY, MATH_SILVER_INPUT_2_KEY, 
-                     MATH_COPPER_INPUT_2_KEY]:
-            # Input validation
-            if not values[event]:
-                continue
-            if values[event][-1] not in '0123456789':
-                window[event].update(values[event][:-1])
-            if int(values[event]) >= int(1e9):
-                window[event].update(str(int(1e9)-1))
-            if int(values[event]) < 0:
-                window[event].update(str(0))
-            calculate_currency(window, values)
-        
-        if event in [MATH_PLATINUM_USED_KEY, MATH_GOLD_USED_KEY, MATH_ELECTRUM_USED_KEY,
-                     MATH_SILVER_USED_KEY, MATH_COPPER_USED_KEY, MATH_CONSOLIDATE_CURRENCY_KEY,
-                     MATH_OPERATION_KEY]:
-            calculate_currency(window, values)
-            if event == MATH_CONSOLIDATE_CURRENCY_KEY:
-                window[MATH_CURRENCIES_USED_PANEL].update(visible=values[event])
-        #endregion
-
-        #region Downtime screen events
-        if event == DOWNTIME_TABS_KEY:
-            init_active_downtime_panel(window, values)
-        
-        if event in [DOWNTIME_STRENGTH_INPUT_KEY, DOWNTIME_DEXTERITY_INPUT_KEY,
-                     DOWNTIME_CONSTITUTION_INPUT_KEY, DOWNTIME_INTELLIGENCE_INPUT_KEY,
-                     DOWNTIME_WISDOM_INPUT_KEY, DOWNTIME_CHARISMA_INPUT_KEY]:
-            # Input validation
-            if not values[event]:
-                continue
-            if values[event][-1] not in '0123456789':
-                window[event].update(values[event][:-1])
-            if int(values[event]) > 30:
-                window[event].update(str(int(30)))
-            if int(values[event]) < 1:
-                window[event].update(str(1))
-            init_active_downtime_panel(window, values)
-        
-        if event == DOWNTIME_PROFICIENCY_BONUS_INPUT_KEY:
-            # Input validation
-            if not values[event]:
-                continue
-            if values[event][-1] not in '0123456789':
-                window[event].update(values[event][:-1])
-            if int(values[event]) > 6:
-                window[event].update(str(6))
-            if int(values[event]) < 2:
-                window[event].update(str(2))
-            calculate_tool_training(window, values)
-        
-        if event == DOWNTIME_SKILL_INPUT_KEY:
-            calculate_skill_training(window, values)
-        
-        if event == DOWNTIME_TOOL_INPUT_KEY:
-            show_tool_skills(window, values)
-            calculate_tool_training(window, values)
-        
-        if event in DOWNTIME_TOOL_SKILL_PROFICIENCY_KEYS:
-            calculate_tool_training(window, values)
-        
-        if event in DOWNTIME_TOOL_SKILL_BONUS_KEYS:
-            # Input validation
-            if not values[event]:
-                continue
-            if values[event][-1] not in '0123456789':
-                window[event].update(values[event][:-1])
-            if int(values[event]) > 20:
-                window[event].update(str(20))
-            if int(values[event]) < 0:
-                window[event].update(0)
-            calculate_tool_training(window, values)
-        
-        if event in [DOWNTIME_WEAPON_STRENGTH_KEY, DOWNTIME_WEAPON_DEXTERITY_KEY]:
-            calculate_weapon_training(window, values)
-        
-        if event in [DOWNTIME_ARMOR_LIGHT_KEY, DOWNTIME_ARMOR_MEDIUM_KEY,
-                     DOWNTIME_ARMOR_HEAVY_KEY]:
-            calculate_armor_training(window, values)
-        #endregion  
+        if recorder is None:
+            active_layout = handle_event(window, event, values, active_layout, jobs, cache)
+        else:
+            start = perf_counter()
+            active_layout = handle_event(window, event, values, active_layout, jobs, cache)
+            handled = perf_counter()
+            window.refresh()
+            recorder.record(event, handled - start, perf_counter() - handled)
+            window[LATENCY_STATUS_KEY].update(recorder.summary())
+        if session_path:
+            # The window is destroyed before the closed event is read, so keep a snapshot
+            snapshot = snapshot_session(window, values, active_layout)
     
+    if session_path and event == EXIT_BUTTON_KEY:
+        snapshot = snapshot_session(window, values, active_layout)
+    if snapshot is not None:
+        save_session(session_path, snapshot)
+    if recorder is not None and latency_dump:
+        recorder.dump(latency_dump)
+    jobs.shutdown(wait=cache is not None)
+    if cache is not None:
+        cache.close()
     window.close()
     
 
-def main_window() -> sg.Window:
+def handle_event(window: sg.Window, event: str, values: dict, active_layout: int,
+                 jobs: Optional[JobRunner] = None, cache: Optional[ResultCache] = None) -> int:
+    """Handle a single event read from the window.
+
+    Args:
+        window (sg.Window): The Window that generated the event.
+        event (str): The key of the event.
+        values (dict): The values of the last window read.
+        active_layout (int): The number of the active screen.
+        jobs (Optional[JobRunner], optional): Runs long calculations in the background. If None,
+            every calculation runs on the calling thread. Defaults to None.
+        cache (Optional[ResultCache], optional): Stores results on disk. Defaults to None.
+
+    Returns:
+        int: The number of the active screen after handling the event.
+    """
+    if event == JOB_DONE_EVENT:
+        show_job_result(window, jobs, values[event])
+        return active_layout
+
+    if event == NAV_COMBO_KEY:
+        try:
+            new_layout = SCREEN_NAMES.index(values[NAV_COMBO_KEY])
+            active_layout = change_screen(window, active_layout, new_layout)
+        except ValueError:
+            window[NAV_COMBO_KEY].update(value=SCREEN_NAMES[active_layout])
+
+    #region Combat screen events
+    if ADD_WEAPON_DAMAGE_BUTTON_KEY in event:
+        add_index = int(event.replace(ADD_WEAPON_DAMAGE_BUTTON_KEY, '')[1:])
+        add_weapon_damage(window, add_index)
+
+    if REMOVE_WEAPON_DAMAGE_BUTTON_KEY in event:
+        remove_index = int(event.replace(REMOVE_WEAPON_DAMAGE_BUTTON_KEY, '')[1:])
+        remove_weapon_damage(window, remove_index)
+
+    if any(key in event for key in DAMAGE_CALCULATION_EVENTS):
+        global_events = [CHARACTER_LEVEL_KEY, CHARACTER_ATTACK_STAT_KEY,
+                         CHARACTER_DAMAGE_MOD_KEY, TARGET_AC_KEY]
+        if event in global_events:
+            for update_index in range(1, 3):
+                update_weapon_attack(window, values, update_index)
+        else:
+            damage_panel_events = [DICE_NUMBER_KEY, DAMAGE_TYPE_KEY, DAMAGE_TYPE_KEY]
+            splits = event.split('-')
+            if any(key in event for key in damage_panel_events):
+                update_index = int(splits[len(splits)-2])
+            else:
+                update_index = int(splits[len(splits)-1])
+            update_weapon_attack(window, values, update_index)
+    #endregion
+
+    #region Currency screen events
+    if event in [SPLIT_PLATINUM_INPUT_KEY, SPLIT_GOLD_INPUT_KEY, SPLIT_ELECTRUM_INPUT_KEY,
+                 SPLIT_SILVER_INPUT_KEY, SPLIT_COPPER_INPUT_KEY]:
+        # Input validation
+        if not values[event]:
+            return active_layout
+        if values[event][-1] not in '0123456789':
+            window[event].update(values[event][:-1])
+        if int(values[event]) >= int(1e9):
+            window[event].update(str(int(1e9)-1))
+        if int(values[event]) < 0:
+            window[event].update(str(0))
+        split_currency(window, values, jobs, cache)
+    
+    if event in [SPLIT_PLATINUM_USED_KEY, SPLIT_GOLD_USED_KEY, SPLIT_ELECTRUM_USED_KEY,
+                 SPLIT_SILVER_USED_KEY, SPLIT_COPPER_USED_KEY, SPLIT_CONSOLIDATE_CURRENCY_KEY,
+                 SPLIT_SHARES_KEY]:
+        split_currency(window, values, jobs, cache)
+        if event == SPLIT_CONSOLIDATE_CURRENCY_KEY:
+            window[SPLIT_CURRENCIES_USED_PANEL].update(visible=values[event])
+    
+    if event == PARTY_SIZE_KEY:
+        if not values[event]:
+            return active_layout
+        if values[event][-1] not in '0123456789':
+            window[event].update(values[event][:-1])
+        if int(values[event]) > 20:
+            window[event].update(str(20))
+        if int(values[event]) < 1:
+            window[event].update(str(1))
+        split_currency(window, values, jobs, cache)
+    
+    if event in [MATH_PLATINUM_INPUT_1_KEY, MATH_GOLD_INPUT_1_KEY, MATH_ELECTRUM_INPUT_1_KEY,
+                 MATH_SILVER_INPUT_1_KEY, MATH_COPPER_INPUT_1_KEY, MATH_PLATINUM_INPUT_2_KEY,
+                 MATH_GOLD_INPUT_2_KEY, MATH_ELECTRUM_INPUT_2_KEY, MATH_SILVER_INPUT_2_KEY, 
+                 MATH_COPPER_INPUT_2_KEY]:
+        # Input validation
+        if not values[event]:
+            return active_layout
+        if values[event][-1] not in '0123456789':
+            window[event].update(values[event][:-1])
+        if int(values[event]) >= int(1e9):
+            window[event].update(str(int(1e9)-1))
+        if int(values[event]) < 0:
+            window[event].update(str(0))
+        calculate_currency(window, values)
+    
+    if event in [MATH_PLATINUM_USED_KEY, MATH_GOLD_USED_KEY, MATH_ELECTRUM_USED_KEY,
+                 MATH_SILVER_USED_KEY, MATH_COPPER_USED_KEY, MATH_CONSOLIDATE_CURRENCY_KEY,
+                 MATH_OPERATION_KEY]:
+        calculate_currency(window, values)
+        if event == MATH_CONSOLIDATE_CURRENCY_KEY:
+            window[MATH_CURRENCIES_USED_PANEL].update(visible=values[event])
+    #endregion
+
+    #region Downtime screen events
+    if event in [DOWNTIME_TABS_KEY, DOWNTIME_CHART_ABILITY_KEY]:
+        init_active_downtime_panel(window, values)
+    
+    if event in [DOWNTIME_STRENGTH_INPUT_KEY, DOWNTIME_DEXTERITY_INPUT_KEY,
+                 DOWNTIME_CONSTITUTION_INPUT_KEY, DOWNTIME_INTELLIGENCE_INPUT_KEY,
+                 DOWNTIME_WISDOM_INPUT_KEY, DOWNTIME_CHARISMA_INPUT_KEY]:
+        # Input validation
+        if not values[event]:
+            return active_layout
+        if values[event][-1] not in '0123456789':
+            window[event].update(values[event][:-1])
+        if int(values[event]) > 30:
+            window[event].update(str(int(30)))
+        if int(values[event]) < 1:
+            window[event].update(str(1))
+        init_active_downtime_panel(window, values)
+    
+    if event == DOWNTIME_PROFICIENCY_BONUS_INPUT_KEY:
+        # Input validation
+        if not values[event]:
+            return active_layout
+        if values[event][-1] not in '0123456789':
+            window[event].update(values[event][:-1])
+        if int(values[event]) > 6:
+            window[event].update(str(6))
+        if int(values[event]) < 2:
+            window[event].update(str(2))
+        calculate_tool_training(window, values)
+    
+    if event == DOWNTIME_SKILL_INPUT_KEY:
+        calculate_skill_training(window, values)
+    
+    if event == DOWNTIME_TOOL_INPUT_KEY:
+        show_tool_skills(window, values)
+        calculate_tool_training(window, values)
+    
+    if event in DOWNTIME_TOOL_SKILL_PROFICIENCY_KEYS:
+        calculate_tool_training(window, values)
+    
+    if event in DOWNTIME_TOOL_SKILL_BONUS_KEYS:
+        # Input validation
+        if not values[event]:
+            return active_layout
+        if values[event][-1] not in '0123456789':
+            window[event].update(values[event][:-1])
+        if int(values[event]) > 20:
+            window[event].update(str(20))
+        if int(values[event]) < 0:
+            window[event].update(0)
+        calculate_tool_training(window, values)
+    
+    if event in [DOWNTIME_WEAPON_STRENGTH_KEY, DOWNTIME_WEAPON_DEXTERITY_KEY]:
+        calculate_weapon_training(window, values)
+    
+    if event in [DOWNTIME_ARMOR_LIGHT_KEY, DOWNTIME_ARMOR_MEDIUM_KEY,
+                 DOWNTIME_ARMOR_HEAVY_KEY]:
+        calculate_armor_training(window, values)
+    #endregion
+
+    #region Party check screen events
+    if event in [PARTY_DC_KEY, *PARTY_PROFICIENCY_BONUS_KEYS,
+                 *(key for keys in PARTY_SCORE_KEYS.values() for key in keys)]:
+        # Input validation. values is corrected along with the input, so the check is
+        # calculated with the number shown.
+        if not values[event].isdigit():
+            values[event] = ''.join(char for char in values[event] if char in '0123456789')
+            window[event].update(values[event])
+        if not values[event]:
+            return active_layout
+        minimum, maximum = party_number_range(event)
+        if int(values[event]) > maximum:
+            values[event] = str(maximum)
+            window[event].update(values[event])
+        if int(values[event]) < minimum:
+            values[event] = str(minimum)
+            window[event].update(values[event])
+        calculate_party_check(window, values)
+
+    if event == PARTY_MEMBERS_KEY:
+        show_party_members(window, values)
+        calculate_party_check(window, values)
+
+    if event in [PARTY_CHECK_KEY, PARTY_ROLL_MODE_KEY, PARTY_GUIDANCE_KEY, *PARTY_NAME_KEYS,
+                 *PARTY_PROFICIENT_KEYS, *PARTY_EXPERTISE_KEYS]:
+        calculate_party_check(window, values)
+    #endregion
+    return active_layout
+
+
+def main_window(show_latency: bool = False) -> sg.Window:
     """Create the main window used by the GUI.
 
     The Window consists of a navigation dropdown, the subscreen actively displayed, a button to
     close the application, and a bottom status bar.
 
+    Args:
+        show_latency (bool, optional): If True, the status bar includes the event latency.
+            Defaults to False.
+
     Returns:
         sg.Window: The created Window object.
     """
     bottom_bar_color = '#3F4B59'
     bottom_bar_layout = [
         [
-            sg.Text(version.__version__, background_color=bottom_bar_color)
+            sg.Text(version.__version__, background_color=bottom_bar_color),
+            sg.Text('', key=LATENCY_STATUS_KEY, size=(30, 1), visible=show_latency,
+                    background_color=bottom_bar_color)
         ]
     ]
     bottom_bar = sg.Column(bottom_bar_layout, background_color=bottom_bar_color,
@@ -312,7 +458,7 @@ def main_window() -> sg.Window:
     layout = [
         [sg.Combo(SCREEN_NAMES, key=NAV_COMBO_KEY, enable_events=True, default_value='Combat',
                   size=(20, 1), pad=(0, 8))],
-        [combat_panel(True), currency_panel(False), downtime_panel(False)],
+        [combat_panel(True), currency_panel(False), downtime_panel(False), party_panel(False)],
         [sg.Exit(key=EXIT_BUTTON_KEY, size=(12, 1))],
         [bottom_bar]
     ]
@@ -526,8 +672,9 @@ def currency_split_panel() -> sg.Tab:
     """Create the tab on the currency screen for splitting currency.
 
     The currency split tab consists of inputs for the number of platinum, gold, electrum, silver,
-    and copper coins, the number of people to split, an option to consolidate the result, options
-    for which coins to consolidate to, and an output for the result.
+    and copper coins, the number of people to split, optional weighted shares, an option to
+    consolidate the result, options for which coins to consolidate to, and an output for the
+    result.
 
     Returns:
         sg.Tab: The created Tab object.
@@ -551,6 +698,11 @@ def currency_split_panel() -> sg.Tab:
             sg.Text('Party size:'),
             sg.Input(default_text='1', size=(5, 1), key=PARTY_SIZE_KEY, enable_events=True)
         ],
+        [
+            sg.Text('Shares (optional):'),
+            sg.Input(default_text='', size=(30, 1), key=SPLIT_SHARES_KEY, enable_events=True,
+                     tooltip='Comma separated shares, e.g. 2, 1, 1, 0.5')
+        ],
         [
             sg.Text('Consolidate currency?'),
             sg.Checkbox('', default=True, key=SPLIT_CONSOLIDATE_CURRENCY_KEY, enable_events=True)
@@ -730,6 +882,21 @@ def downtime_panel(visible: bool = False) -> sg.Column:
         ],
         [
             sg.Text('', key=DOWNTIME_RESULT_KEY, size=(40, 1), justification='center')
+        ],
+        [
+            sg.Text('', key=DOWNTIME_CHART_LABEL_KEY, size=(30, 1)),
+            sg.Text('Chart Ability'),
+            sg.Combo(Ability.get_values(), default_value=Ability.get_display_name(
+                Ability.INTELLIGENCE), key=DOWNTIME_CHART_ABILITY_KEY, enable_events=True,
+                     readonly=True, size=(12, 1)),
+        ],
+        [
+            # Scores on the x axis and days on the y axis, with a margin for the axis labels.
+            sg.Graph(DOWNTIME_CHART_SIZE,
+                     graph_bottom_left=(-3, -downtime.BASE_DOWNTIME_DAYS // 5),
+                     graph_top_right=(MAX_ABILITY_SCORE + 1,
+                                      downtime.BASE_DOWNTIME_DAYS * 11 // 10),
+                     key=DOWNTIME_CHART_KEY, background_color='white')
         ]
     ]
     return sg.Column(layout, key=DOWNTIME_SCREEN_KEY, visible=visible,
@@ -838,9 +1005,103 @@ def downtime_armor_panel() -> sg.Tab:
         ]
     ]
     return sg.Tab('Armor', layout=layout, element_justification='center', key=DOWNTIME_ARMOR_TAB_KEY)
+#endregion
+
+#region Party Check Screen
+def party_panel(visible: bool = False) -> sg.Column:
+    """Create the party check screen shown on the GUI.
+
+    The party check screen consists of inputs for the check, its DC, how the d20 is rolled, and
+    guidance, a row for each party member, and an output for the party's chances.
+
+    Args:
+        visible (bool, optional): If True, the screen will start as visible. Defaults to False.
+
+    Returns:
+        sg.Column: The created Column object.
+    """
+    # The names are read when the screen is built, after a rule pack may have renamed tools.
+    check_names = Skill.get_values() + Ability.get_values() + Tool.get_values()
+    layout = [
+        [
+            sg.Text('Check'),
+            sg.Combo(check_names, default_value=Skill.get_display_name(Skill.PERCEPTION),
+                     key=PARTY_CHECK_KEY, enable_events=True, readonly=True, size=(25, 1)),
+            sg.Text('DC'),
+            sg.Input(key=PARTY_DC_KEY, default_text=15, enable_events=True, size=(5, 1)),
+        ],
+        [
+            sg.Combo(ROLL_MODE_NAMES, default_value=ROLL_MODE_NAMES[0], key=PARTY_ROLL_MODE_KEY,
+                     enable_events=True, readonly=True, size=(15, 1)),
+            sg.Checkbox('Guidance (+1d4)', default=False, key=PARTY_GUIDANCE_KEY,
+                        enable_events=True),
+            sg.Text('Party Members'),
+            sg.Spin(list(range(1, MAX_PARTY_MEMBERS + 1)), initial_value=4, key=PARTY_MEMBERS_KEY,
+                    enable_events=True, readonly=True, size=(3, 1)),
+        ],
+        [sg.HorizontalSeparator()],
+        *[[sg.pin(party_member_panel(index, index < 4))] for index in range(MAX_PARTY_MEMBERS)],
+        [sg.HorizontalSeparator()],
+        [sg.Text('Results', font='any 10 bold')],
+        [sg.Text('', key=PARTY_RESULT_KEY, size=(40, 4), justification='center')],
+    ]
+    return sg.Column(layout, key=PARTY_SCREEN_KEY, visible=visible,
+                     element_justification='center')
+
+def party_member_panel(index: int, visible: bool = False) -> sg.Column:
+    """Create the section for one party member of the party check screen.
+
+    The section consists of inputs for the member's name, ability scores, and proficiency bonus,
+    inputs for whether the member is proficient or has expertise in the check, and an output for
+    the member's chance to pass.
+
+    Args:
+        index (int): The number of the party member, starting from 0.
+        visible (bool, optional): If True, the section will start as visible. Defaults to False.
+
+    Returns:
+        sg.Column: The created Column object.
+    """
+    scores = []
+    for ability in Ability:
+        scores += [sg.Text(ability.name[:3].title()),
+                   sg.Input(key=PARTY_SCORE_KEYS[ability][index], default_text=10,
+                            enable_events=True, size=(3, 1))]
+    layout = [
+        [
+            sg.Input(key=PARTY_NAME_KEYS[index], default_text=f'Member {index + 1}',
+                     enable_events=True, size=(12, 1)),
+            *scores,
+            sg.Text('Prof.'),
+            sg.Input(key=PARTY_PROFICIENCY_BONUS_KEYS[index], default_text=2, enable_events=True,
+                     size=(3, 1)),
+            sg.Checkbox('Proficient', default=False, key=PARTY_PROFICIENT_KEYS[index],
+                        enable_events=True),
+            sg.Checkbox('Expertise', default=False, key=PARTY_EXPERTISE_KEYS[index],
+                        enable_events=True),
+            sg.Text('', key=PARTY_CHANCE_KEYS[index], size=(6, 1), justification='right'),
+        ]
+    ]
+    return sg.Column(layout, key=PARTY_MEMBER_PANEL_KEYS[index], visible=visible)
 
 #endregion
 
+def show_job_result(window: sg.Window, jobs: Optional[JobRunner], result: JobResult):
+    """Display the result of a background job, unless a newer job has superseded it.
+
+    Args:
+        window (sg.Window): The Window to display the result in.
+        jobs (Optional[JobRunner]): The JobRunner that ran the job.
+        result (JobResult): The result posted by the job.
+    """
+    if jobs is None or not jobs.is_current(result):
+        return
+    if result.exception is not None:
+        window[result.key].update('Calculation failed.')
+        return
+    if result.key == SPLIT_CURRENCY_RESULTS_KEY:
+        show_split_results(window, result.value)
+
 def change_screen(window: sg.Window, old_layout: int, new_layout: int) -> int:
     """Change the active screen being displayed in the window.
 
@@ -992,12 +1253,19 @@ def init_combat_panel(window: sg.Window, values: dict):
 #endregion
 
 #region Currency Screen Functions
-def split_currency(window: sg.Window, values: dict):
+def split_currency(window: sg.Window, values: dict, jobs: Optional[JobRunner] = None,
+                   cache: Optional[ResultCache] = None):
     """Split the Currency entered on the currency split tab and display the result.
 
+    If shares are entered, the Currency is split in proportion to the shares and the party size
+    is ignored.
+
     Args:
         window (sg.Window): The Window containing the currency split tab.
         values (dict): The values of the last window read.
+        jobs (Optional[JobRunner], optional): If given, the split is calculated in the
+            background and displayed when the result is posted to the window. Defaults to None.
+        cache (Optional[ResultCache], optional): Stores the split on disk. Defaults to None.
     """
     currency = Currency(
         int(values[SPLIT_PLATINUM_INPUT_KEY]),
@@ -1012,23 +1280,60 @@ def split_currency(window: sg.Window, values: dict):
     currencies_used |= CurrencyOptions.ELECTRUM if values[SPLIT_ELECTRUM_USED_KEY] else CurrencyOptions.COPPER
     currencies_used |= CurrencyOptions.GOLD if values[SPLIT_GOLD_USED_KEY] else CurrencyOptions.COPPER
     currencies_used |= CurrencyOptions.PLATINUM if values[SPLIT_PLATINUM_USED_KEY] else CurrencyOptions.COPPER
-    results = currency.split(party_size, consolidate, currencies_used)
-    if len(results) <= 1:
-        output = str(results[0])
-        num_rows = 1
+    shares = [share.strip() for share in values[SPLIT_SHARES_KEY].split(',') if share.strip()]
+    if jobs is None:
+        show_split_results(window, calculate_split(currency, party_size, consolidate,
+                                                   currencies_used, shares, cache))
     else:
-        counts = {}
-        for result in results:
-            result_str = str(result)
-            if result_str in counts:
-                counts[result_str] += 1
-            else:
-                counts[result_str] = 1
-        output = ''
-        for curr, count in counts.items():
-            output += f'{count}x {curr}\n'
-        output.strip()
-        num_rows = len(counts)
+        jobs.submit(SPLIT_CURRENCY_RESULTS_KEY, calculate_split, currency, party_size,
+                    consolidate, currencies_used, shares, cache)
+
+def calculate_split(currency: Currency, party_size: int, consolidate: bool,
+                    currencies_used: CurrencyOptions, shares: List[str],
+                    cache: Optional[ResultCache] = None) -> Tuple[str, int]:
+    """Split a Currency and format the result for the currency split tab.
+
+    Args:
+        currency (Currency): The Currency to split.
+        party_size (int): The number of players to split the Currency among.
+        consolidate (bool): If True, the shares are consolidated. If False, the physical coins are
+            shared out, in proportion to the weighted shares if there are any.
+        currencies_used (CurrencyOptions): The coins to use when consolidating.
+        shares (List[str]): The weighted shares of each player. If not empty, the party size is
+            ignored.
+        cache (Optional[ResultCache], optional): If given, an even split is read from and stored
+            in the cache instead of the in-memory cache. Defaults to None.
+
+    Returns:
+        Tuple[str, int]: The formatted result and its number of rows.
+    """
+    if shares:
+        try:
+            groups = currency.weighted_split_groups(shares, currencies_used, consolidate)
+        except (ValueError, ZeroDivisionError):
+            return 'Invalid shares.', 1
+        output = '\n'.join(f'{count}x {curr} ({float(weight):g} share'
+                           + f'{"" if weight == 1 else "s"})'
+                           for weight, count, curr in groups)
+        return output, len(groups)
+    if cache is None:
+        results = cached_split(currency, party_size, consolidate, currencies_used)
+    else:
+        results = cache.split(currency, party_size, consolidate, currencies_used)
+    if len(results) <= 1:
+        return str(results[0]), 1
+    counts = Counter(results)
+    output = '\n'.join(f'{count}x {curr}' for curr, count in counts.items())
+    return output, len(counts)
+
+def show_split_results(window: sg.Window, result: Tuple[str, int]):
+    """Display the result of a split on the currency split tab.
+
+    Args:
+        window (sg.Window): The Window containing the currency split tab.
+        result (Tuple[str, int]): The formatted result and its number of rows.
+    """
+    output, num_rows = result
     window[SPLIT_CURRENCY_RESULTS_KEY].update(output)
     window[SPLIT_CURRENCY_RESULTS_KEY].set_size((None, num_rows))
 
@@ -1064,7 +1369,7 @@ def calculate_currency(window: sg.Window, values: dict):
     else:
         result = currency1 - currency2
     if consolidate:
-        result = result.consolidate(currencies_used)
+        result = cached_consolidate(result, currencies_used)
     window[MATH_CURRENCY_RESULTS_KEY].update(str(result))
 
 def init_currency_panel(window: sg.Window, values: dict):
@@ -1087,16 +1392,19 @@ def calculate_language_training(window: sg.Window, values: dict):
         window (sg.Window): The Window containing the downtime languages tab.
         values (dict): The values of the last window read.
     """
-    intelligence = int(values[DOWNTIME_INTELLIGENCE_INPUT_KEY])
-    wisdom = int(values[DOWNTIME_WISDOM_INPUT_KEY])
-    charisma = int(values[DOWNTIME_CHARISMA_INPUT_KEY])
-    int_mod = intelligence - 10 if intelligence >= 10 else 0
-    wis_mod = wisdom - 10 if wisdom >= 10 else 0
-    cha_mod = charisma - 10 if charisma >= 10 else 0
-    score = max(int_mod + wis_mod + cha_mod, 1)
-    days = ceil(BASE_DOWNTIME_DAYS / score)
+    days = language_training_days(int(values[DOWNTIME_INTELLIGENCE_INPUT_KEY]),
+                                  int(values[DOWNTIME_WISDOM_INPUT_KEY]),
+                                  int(values[DOWNTIME_CHARISMA_INPUT_KEY]))
     window[DOWNTIME_RESULT_KEY].update(f'{days} days.')
     window[DOWNTIME_RESULT_KEY].set_size((None, 1))
+    chart_ability = Ability.convert_display_name(values[DOWNTIME_CHART_ABILITY_KEY])
+    mental_abilities = [Ability.INTELLIGENCE, Ability.WISDOM, Ability.CHARISMA]
+    if chart_ability in mental_abilities:
+        curve = language_days_curve(get_ability_score(values, ability)
+                                    for ability in mental_abilities if ability != chart_ability)
+    else:
+        curve = (days,) * len(ABILITY_SCORES)
+    draw_training_curve(window, values, curve, chart_ability)
 
 def calculate_skill_training(window: sg.Window, values: dict):
     """Calculate the time required for training a skill on the downtime skill tab.
@@ -1107,13 +1415,11 @@ def calculate_skill_training(window: sg.Window, values: dict):
     """
     skill = Skill.convert_display_name(values[DOWNTIME_SKILL_INPUT_KEY])
     ability = skill.ability()
-    ability_score = get_ability_score(values, ability)
-    ability_score = max(ability_score, 1)
-    base_days = ceil(BASE_DOWNTIME_DAYS / ability_score)
-    expert_days = ceil(2 * BASE_DOWNTIME_DAYS / ability_score)
+    base_days, expert_days = skill_training_days(get_ability_score(values, ability))
     window[DOWNTIME_RESULT_KEY].update(f'Proficient in {base_days} days.\nExpertise in an'
                                        + f' additional {expert_days} days.')
     window[DOWNTIME_RESULT_KEY].set_size((None, 2))
+    draw_training_curve(window, values, skill_days_curve()[0], ability)
 
 def calculate_tool_training(window: sg.Window, values: dict):
     """Calculate the time required for training a tool on the downtime tool tab.
@@ -1123,20 +1429,32 @@ def calculate_tool_training(window: sg.Window, values: dict):
         values (dict): The values of the last window read.
     """
     tool = Tool.convert_display_name(values[DOWNTIME_TOOL_INPUT_KEY])
-    total = 0
+    chart_ability = Ability.convert_display_name(values[DOWNTIME_CHART_ABILITY_KEY])
+    check_bonuses = []
+    # The chart varies the chart ability, so skills using it are kept without the modifier.
+    fixed_bonuses = []
+    varied_bonuses = []
     related_skills = tool.skills()
     for index, (_, member) in enumerate(Skill.__members__.items()):
         if member in related_skills:
-            ability_mod = floor((get_ability_score(values, member.ability()) - 10) / 2)
-            proficiency_bonus = int(values[DOWNTIME_PROFICIENCY_BONUS_INPUT_KEY]) if values[DOWNTIME_TOOL_SKILL_PROFICIENCY_KEYS[index]] else 0
-            bonus = int(values[DOWNTIME_TOOL_SKILL_BONUS_KEYS[index]])
-            total += ability_mod + proficiency_bonus + bonus
-    score = total / len(tool.skills()) + 10
-    base_days = ceil(BASE_DOWNTIME_DAYS / score)
-    expert_days = ceil(2 * BASE_DOWNTIME_DAYS / score)
+            proficient = bool(values[DOWNTIME_TOOL_SKILL_PROFICIENCY_KEYS[index]])
+            proficiency_bonus = int(values[DOWNTIME_PROFICIENCY_BONUS_INPUT_KEY]) if proficient else 0
+            skill_bonus = int(values[DOWNTIME_TOOL_SKILL_BONUS_KEYS[index]])
+            check_bonus = tool_check_bonus(get_ability_score(values, member.ability()),
+                                           proficiency_bonus, proficient, skill_bonus)
+            check_bonuses.append(check_bonus)
+            if member.ability() == chart_ability:
+                # A score of 10 has no modifier.
+                varied_bonuses.append(tool_check_bonus(10, proficiency_bonus, proficient,
+                                                       skill_bonus))
+            else:
+                fixed_bonuses.append(check_bonus)
+    base_days, expert_days = tool_training_days(check_bonuses)
     window[DOWNTIME_RESULT_KEY].update(f'Proficient in {base_days} days.\nExpertise in an'
                                        + f' additional {expert_days} days.')
     window[DOWNTIME_RESULT_KEY].set_size((None, 2))
+    draw_training_curve(window, values, tool_days_curve(fixed_bonuses, varied_bonuses)[0],
+                        chart_ability)
 
 def calculate_weapon_training(window: sg.Window, values: dict):
     """Calculate the time required for training a weapon on the downtime weapon tab.
@@ -1146,16 +1464,16 @@ def calculate_weapon_training(window: sg.Window, values: dict):
         values (dict): The values of the last window read.
     """
     if bool(values[DOWNTIME_WEAPON_STRENGTH_KEY]):
-        ability_score = get_ability_score(values, Ability.STRENGTH)
+        ability = Ability.STRENGTH
     elif bool(values[DOWNTIME_WEAPON_DEXTERITY_KEY]):
-        ability_score = get_ability_score(values, Ability.DEXTERITY)
+        ability = Ability.DEXTERITY
     else:
         window[DOWNTIME_RESULT_KEY].update('Invalid selection.')
         return
-    ability_score = max(ability_score, 1)
-    days = ceil(BASE_DOWNTIME_DAYS / ability_score)
+    days = proficiency_training_days(get_ability_score(values, ability))
     window[DOWNTIME_RESULT_KEY].update(f'{days} days.')
     window[DOWNTIME_RESULT_KEY].set_size((None, 1))
+    draw_training_curve(window, values, proficiency_days_curve(), ability)
 
 def calculate_armor_training(window: sg.Window, values: dict):
     """Calculate the time required for training an armor on the downtime armor tab.
@@ -1165,18 +1483,18 @@ def calculate_armor_training(window: sg.Window, values: dict):
         values (dict): The values of the last window read.
     """
     if bool(values[DOWNTIME_ARMOR_LIGHT_KEY]):
-        ability_score = get_ability_score(values, Ability.DEXTERITY)
+        ability = Ability.DEXTERITY
     elif bool(values[DOWNTIME_ARMOR_MEDIUM_KEY]):
-        ability_score = get_ability_score(values, Ability.STRENGTH)
+        ability = Ability.STRENGTH
     elif bool(values[DOWNTIME_ARMOR_HEAVY_KEY]):
-        ability_score = get_ability_score(values, Ability.STRENGTH)
+        ability = Ability.STRENGTH
     else:
         window[DOWNTIME_RESULT_KEY].update('Invalid selection.')
         return
-    ability_score = max(ability_score, 1)
-    days = ceil(BASE_DOWNTIME_DAYS / ability_score)
+    days = proficiency_training_days(get_ability_score(values, ability))
     window[DOWNTIME_RESULT_KEY].update(f'{days} days.')
     window[DOWNTIME_RESULT_KEY].set_size((None, 1))
+    draw_training_curve(window, values, proficiency_days_curve(), ability)
 
 def init_downtime_panel(window: sg.Window, values: dict):
     """Initialize the downtime screen by calculating with the current values.
@@ -1227,6 +1545,48 @@ def get_ability_score(values: dict, ability: Ability) -> int:
     }
     return mapping[ability]
 
+def draw_training_curve(window: sg.Window, values: dict, curve: Tuple[int, ...],
+                        ability: Ability):
+    """Draw the training days at every score of an ability on the downtime chart.
+
+    The axes are drawn once, and only the line segments whose days changed since the last curve
+    are redrawn, along with the red line marking the current score.
+
+    Args:
+        window (sg.Window): The Window containing the downtime screen.
+        values (dict): The values of the last window read.
+        curve (Tuple[int, ...]): The days for each score in ABILITY_SCORES.
+        ability (Ability): The Ability varied along the x axis.
+    """
+    graph = window[DOWNTIME_CHART_KEY]
+    if graph.metadata is None:
+        graph.draw_line((0, 0), (MAX_ABILITY_SCORE + 1, 0))
+        graph.draw_line((0, 0), (0, downtime.BASE_DOWNTIME_DAYS))
+        for score in range(5, MAX_ABILITY_SCORE + 1, 5):
+            graph.draw_text(str(score), (score, -downtime.BASE_DOWNTIME_DAYS // 10))
+        for days in (0, downtime.BASE_DOWNTIME_DAYS // 2, downtime.BASE_DOWNTIME_DAYS):
+            graph.draw_text(str(days), (-1.5, days))
+        graph.metadata = {'curve': (), 'segments': [None] * (len(ABILITY_SCORES) - 1),
+                          'marker': None}
+    chart = graph.metadata
+    points = [(score, min(days, downtime.BASE_DOWNTIME_DAYS))
+              for score, days in zip(ABILITY_SCORES, curve)]
+    for index in range(len(points) - 1):
+        if chart['curve'][index:index + 2] == curve[index:index + 2]:
+            continue
+        if chart['segments'][index] is not None:
+            graph.delete_figure(chart['segments'][index])
+        chart['segments'][index] = graph.draw_line(points[index], points[index + 1],
+                                                   color='blue', width=2)
+    chart['curve'] = tuple(curve)
+    if chart['marker'] is not None:
+        graph.delete_figure(chart['marker'])
+    score = min(max(get_ability_score(values, ability), ABILITY_SCORES[0]), ABILITY_SCORES[-1])
+    chart['marker'] = graph.draw_line((score, 0), points[score - ABILITY_SCORES[0]], color='red')
+    window[DOWNTIME_CHART_LABEL_KEY].update(
+        f'Days by {Ability.get_display_name(ability)}: {curve[score - ABILITY_SCORES[0]]}'
+        f' at {score}')
+
 def show_tool_skills(window: sg.Window, values: dict):
     """Show/hide the Skills related to the active Tool on the downtime tool tab.
 
@@ -1246,7 +1606,216 @@ def show_tool_skills(window: sg.Window, values: dict):
         else:
             window[DOWNTIME_TOOL_SKILL_PANEL_KEYS[index]].update(visible=False)
 
+#endregion
+
+#region Party Check Screen Functions
+def calculate_party_check(window: sg.Window, values: dict):
+    """Calculate the chances of the party passing the check on the party check screen.
+
+    Args:
+        window (sg.Window): The Window containing the party check screen.
+        values (dict): The values of the last window read.
+    """
+    try:
+        check = get_party_check(values[PARTY_CHECK_KEY])
+    except ValueError as error:
+        for key in PARTY_CHANCE_KEYS:
+            window[key].update('')
+        window[PARTY_RESULT_KEY].update(str(error))
+        return
+    mode = RollMode[values[PARTY_ROLL_MODE_KEY].upper()]
+    guidance = bool(values[PARTY_GUIDANCE_KEY])
+    dc = get_party_number(values, PARTY_DC_KEY)
+    characters = []
+    for index in range(int(values[PARTY_MEMBERS_KEY])):
+        abilities = AbilitySet(*(get_party_number(values, PARTY_SCORE_KEYS[ability][index])
+                                 for ability in Ability))
+        proficiencies = frozenset([check]) if values[PARTY_PROFICIENT_KEYS[index]] else frozenset()
+        expertise = frozenset([check]) if values[PARTY_EXPERTISE_KEYS[index]] else frozenset()
+        characters.append(Character(values[PARTY_NAME_KEYS[index]] or f'Member {index + 1}',
+                                    abilities,
+                                    get_party_number(values, PARTY_PROFICIENCY_BONUS_KEYS[index]),
+                                    proficiencies, expertise))
+    result = party_check(characters, check, dc, mode, guidance)
+    for index in range(MAX_PARTY_MEMBERS):
+        window[PARTY_CHANCE_KEYS[index]].update(
+            f'{result.chances[index]:.0%}' if index < len(characters) else '')
+    best, score = best_passive_score(characters, check, mode)
+    window[PARTY_RESULT_KEY].update(f'Group check passes: {result.group_chance():.1%}\n'
+                                    f'Anyone passes: {result.any_chance():.1%}\n'
+                                    f'Everyone passes: {result.all_chance():.1%}\n'
+                                    f'Best passive score: {best.name} ({score})')
+
+def init_party_panel(window: sg.Window, values: dict):
+    """Initialize the party check screen by calculating with the current values.
+
+    Args:
+        window (sg.Window): The Window containing the party check screen.
+        values (dict): The values of the last window read.
+    """
+    show_party_members(window, values)
+    calculate_party_check(window, values)
+
+def show_party_members(window: sg.Window, values: dict):
+    """Show/hide the party member sections on the party check screen.
+
+    Args:
+        window (sg.Window): The Window containing the party check screen.
+        values (dict): The values of the last window read.
+    """
+    members = int(values[PARTY_MEMBERS_KEY])
+    for index in range(MAX_PARTY_MEMBERS):
+        window[PARTY_MEMBER_PANEL_KEYS[index]].update(visible=index < members)
+
+def get_party_check(name: str):
+    """Return the Skill, Ability, or Tool selected on the party check screen.
+
+    Args:
+        name (str): The display name of the check.
+
+    Raises:
+        ValueError: No Skill, Ability, or Tool has the name.
+
+    Returns:
+        The matching Skill, Ability, or Tool member.
+    """
+    if name in Skill.get_values():
+        return Skill.convert_display_name(name)
+    if name in Ability.get_values():
+        return Ability.convert_display_name(name)
+    if name in Tool.get_values():
+        return Tool.convert_display_name(name)
+    raise ValueError(f"Unknown check '{name}'.")
+
+def get_party_number(values: dict, key: str) -> int:
+    """Return a number input of the party check screen, limited to its range.
+
+    The inputs are corrected as they are typed in, so this only limits values that were not
+    typed, such as an empty input or a restored session.
+
+    Args:
+        values (dict): The values of the last window read.
+        key (str): The key of the input.
+
+    Returns:
+        int: The number in the input, or the lowest allowed number if it is not a number.
+    """
+    minimum, maximum = party_number_range(key)
+    try:
+        return min(max(int(values[key]), minimum), maximum)
+    except ValueError:
+        return minimum
+
+def party_number_range(key: str) -> Tuple[int, int]:
+    """Return the lowest and highest allowed numbers of an input of the party check screen.
+
+    Args:
+        key (str): The key of the DC, ability score, or proficiency bonus input.
+
+    Returns:
+        Tuple[int, int]: The lowest and highest allowed numbers.
+    """
+    if key == PARTY_DC_KEY:
+        return 1, 40
+    if key in PARTY_PROFICIENCY_BONUS_KEYS:
+        return 2, 6
+    return 1, 30
+
+#endregion
+
+#region Session Functions
+def snapshot_session(window: sg.Window, values: dict, active_layout: int) -> Session:
+    """Capture the inputs, results, and layout of the window.
+
+    Args:
+        window (sg.Window): The main Window.
+        values (dict): The values of the last window read.
+        active_layout (int): The number of the active screen.
+
+    Returns:
+        Session: The state of the window.
+    """
+    damage_panels = [sum(window[f'{WEAPON_DAMAGE_PANEL_KEY}-{parent_index}-{index}'].visible
+                         for index in range(1, NUM_DAMAGE_PANELS + 1))
+                     for parent_index in range(1, 3)]
+    outputs = {key: window[key].get() for key in OUTPUT_KEYS}
+    return Session(dict(values), outputs, {'screen': active_layout,
+                                           'damage_panels': damage_panels})
+
+def restore_session(window: sg.Window, session: Session) -> int:
+    """Restore the inputs, results, and layout of the window from a saved session.
+
+    The saved results are shown without recalculating them, except the active downtime tab,
+    which is recalculated to draw its training curve. If the session has no results, every
+    screen is recalculated from the restored inputs instead.
+
+    Args:
+        window (sg.Window): The main Window.
+        session (Session): The saved session.
+
+    Returns:
+        int: The number of the active screen.
+    """
+    damage_panels = session.layout.get('damage_panels', [0, 0])
+    for parent_index, count in enumerate(damage_panels[:2], 1):
+        for _ in range(min(int(count), NUM_DAMAGE_PANELS)):
+            add_weapon_damage(window, parent_index)
+    for key, value in session.values.items():
+        if key not in window.AllKeysDict:
+            continue
+        element = window[key]
+        if isinstance(element, sg.TabGroup):
+            if value in window.AllKeysDict:
+                window[value].select()
+        elif isinstance(element, (sg.Input, sg.Combo, sg.Spin, sg.Checkbox, sg.Radio)):
+            element.update(value=value)
+    _, values = window.read(timeout=0)
+    window[SPLIT_CURRENCIES_USED_PANEL].update(visible=values[SPLIT_CONSOLIDATE_CURRENCY_KEY])
+    window[MATH_CURRENCIES_USED_PANEL].update(visible=values[MATH_CONSOLIDATE_CURRENCY_KEY])
+    show_tool_skills(window, values)
+    show_party_members(window, values)
+    if session.outputs:
+        for key, output in session.outputs.items():
+            if key not in OUTPUT_KEYS:
+                continue
+            window[key].update(output)
+            if key in RESIZED_OUTPUT_KEYS:
+                window[key].set_size((None, output.count('\n') + 1))
+        # The chart is not saved, so the active tab draws it again.
+        init_active_downtime_panel(window, values)
+    else:
+        init_combat_panel(window, values)
+        init_currency_panel(window, values)
+        init_active_downtime_panel(window, values)
+        calculate_party_check(window, values)
+    screen = session.layout.get('screen', 0)
+    if screen in range(len(SCREEN_NAMES)):
+        window[NAV_COMBO_KEY].update(value=SCREEN_NAMES[screen])
+        return change_screen(window, 0, screen)
+    return 0
 
 #endregion
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='D&D Toolbox')
+    parser.add_argument('--profile-latency', action='store_true',
+                        help='record event latency and show p50/p99 in the status bar')
+    parser.add_argument('--latency-dump', metavar='FILE',
+                        help='write the recorded event timings to a CSV file on exit')
+    parser.add_argument('--cache', metavar='FILE',
+                        help='store currency splits in this cache database between sessions')
+    parser.add_argument('--session', metavar='FILE', default=DEFAULT_SESSION_PATH,
+                        help='save and restore the inputs and results in this file '
+                        f'(default {DEFAULT_SESSION_PATH})')
+    parser.add_argument('--no-session', action='store_true',
+                        help='start from the default inputs and do not save them on exit')
+    parser.add_argument('--rules', metavar='FILE',
+                        help='use the weapons, tools, skills, and downtime of a JSON or TOML '
+                        'rule pack')
+    args = parser.parse_args()
+    if args.rules:
+        try:
+            use_rule_pack(args.rules)
+        except (OSError, ValueError) as error:
+            parser.error(f'cannot use rule pack: {error}')
+    main(args.profile_latency, args.latency_dump, args.cache,
+         None if args.no_session else args.session)
\ No newline at end of file
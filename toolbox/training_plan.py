@@ -0,0 +1,318 @@
+"""Plan the fastest order to train several downtime goals in Dungeons & Dragons 5th edition.
+
+The days each goal takes come from the formulas of the downtime module. Goals can make later
+goals cheaper: proficiency or expertise in a skill raises the check bonus of that skill when
+training with a tool related to it, and expertise can only be trained after proficiency. The
+planner finds the order with the fewest total days with a dynamic program over the sets of
+goals already trained, which is exact and memoizes the best plan of every set.
+
+Goals that neither affect nor depend on another goal cost the same in any order, so only the
+goals that interact are planned. Each group of goals that interact with each other is planned
+on its own, in O(2^k * k) steps for a group of k goals. Groups of more than MAX_EXACT_GOALS
+goals train every goal after the goals it depends on instead, which is also the best order as
+long as training a goal never makes another goal more expensive.
+
+Classes:
+    GoalType: Enumeration of the kinds of downtime training.
+    TrainingGoal: A language, proficiency, or expertise to train.
+    PlanStep: A goal of a plan, and when it is trained.
+    TrainingPlan: The order to train goals in, and the total days.
+
+Functions:
+    goal_days: Return the days a character needs to train a goal.
+    plan_training: Find the order of goals that takes the fewest total days.
+
+Constants:
+    MAX_EXACT_GOALS: The most interacting goals planned with the dynamic program.
+"""
+from __future__ import annotations, absolute_import
+from enum import Enum, auto
+from math import inf
+from typing import Dict, FrozenSet, List, NamedTuple, Sequence, Tuple, Union
+try:
+    from .checks import Character
+    from .common import Ability, Skill, Tool
+    from .downtime import (language_training_days, proficiency_training_days,
+                           skill_training_days, tool_check_bonus, tool_training_days)
+except ImportError:
+    from checks import Character
+    from common import Ability, Skill, Tool
+    from downtime import (language_training_days, proficiency_training_days,
+                          skill_training_days, tool_check_bonus, tool_training_days)
+
+MAX_EXACT_GOALS = 16
+
+class GoalType(Enum):
+    """Defines an enumeration of the kinds of downtime training.
+
+    Members:
+        LANGUAGE
+        SKILL
+        TOOL
+        WEAPON
+        ARMOR
+    """
+    LANGUAGE = auto()
+    SKILL = auto()
+    TOOL = auto()
+    WEAPON = auto()
+    ARMOR = auto()
+
+class TrainingGoal(NamedTuple):
+    """Represents a language, proficiency, or expertise to train.
+
+    Attributes:
+        goal_type: The GoalType of the training.
+        target: The Skill or Tool trained, or the Ability used to train a weapon or armor. None
+            for languages.
+        expertise: If the goal is expertise in a Skill or Tool, rather than proficiency.
+        name: The name of the goal, such as the language or weapon.
+    """
+    goal_type: GoalType
+    target: Union[Ability, Skill, Tool, None] = None
+    expertise: bool = False
+    name: str = ''
+
+    def __str__(self) -> str:
+        if self.goal_type == GoalType.SKILL:
+            text = Skill.get_display_name(self.target)
+        elif self.goal_type == GoalType.TOOL:
+            text = Tool.get_display_name(self.target)
+        else:
+            text = self.name or self.goal_type.name.title()
+        return f"{text} {'expertise' if self.expertise else 'proficiency'}"
+
+class PlanStep(NamedTuple):
+    """Represents a goal of a plan, and when it is trained.
+
+    Attributes:
+        goal: The TrainingGoal.
+        days: The days needed to train the goal at this point of the plan.
+        start_day: The days of training before the goal is started.
+    """
+    goal: TrainingGoal
+    days: int
+    start_day: int
+
+class TrainingPlan(NamedTuple):
+    """Represents the order to train goals in, and the total days.
+
+    Attributes:
+        steps: The goals in the order they are trained.
+        days: The total days of training.
+    """
+    steps: Tuple[PlanStep, ...]
+    days: int
+
+def goal_days(character: Character, goal: TrainingGoal,
+              trained: Sequence[TrainingGoal] = ()) -> int:
+    """Return the days a character needs to train a goal.
+
+    Args:
+        character (Character): The character training.
+        goal (TrainingGoal): The goal to train.
+        trained (Sequence[TrainingGoal], optional): Goals already trained, which add to the
+            proficiencies and expertise of the character. Defaults to ().
+
+    Raises:
+        ValueError: The goal is invalid.
+
+    Returns:
+        int: The number of days. Expertise goals count only the days after proficiency.
+    """
+    _validate_goal(goal)
+    proficiencies, expertise = _trained_proficiencies(character, trained)
+    return _goal_days(character, goal, proficiencies, expertise)
+
+def plan_training(character: Character, goals: Sequence[TrainingGoal]) -> TrainingPlan:
+    """Find the order of goals that takes a character the fewest total days.
+
+    Goals that do not interact with another goal keep their order and are trained after the
+    planned goals. Groups of more than MAX_EXACT_GOALS interacting goals are trained in the order
+    of their dependencies rather than searched.
+
+    Args:
+        character (Character): The character training.
+        goals (Sequence[TrainingGoal]): The goals to train.
+
+    Raises:
+        ValueError: A goal is invalid, repeated, or already trained, or an expertise goal has
+            no proficiency to build on.
+
+    Returns:
+        TrainingPlan: The best order of the goals.
+    """
+    goals = list(goals)
+    for goal in goals:
+        _validate_goal(goal)
+        if goal.goal_type in (GoalType.SKILL, GoalType.TOOL):
+            if goal.target in character.expertise or (not goal.expertise
+                                                      and goal.target in character.proficiencies):
+                raise ValueError(f'{character.name} already has {goal}.')
+            if (goal.expertise and goal.target not in character.proficiencies
+                    and goal._replace(expertise=False) not in goals):
+                raise ValueError(f'{goal} needs proficiency first.')
+    if len(set(goals)) != len(goals):
+        raise ValueError('Each goal can only be trained once.')
+    dependencies, prerequisites = _dependencies(goals)
+    order = []
+    alone = []
+    for group in _groups(dependencies):
+        if len(group) == 1:
+            alone.extend(group)
+            continue
+        group_dependencies = [_submask(dependencies[index], group) for index in group]
+        if len(group) > MAX_EXACT_GOALS:
+            group_order = _dependency_order(group_dependencies)
+        else:
+            group_order = _best_order(character, [goals[index] for index in group],
+                                      group_dependencies,
+                                      [_submask(prerequisites[index], group) for index in group])
+        order.extend(group[index] for index in group_order)
+    order.extend(alone)
+    steps = []
+    days = 0
+    for position, index in enumerate(order):
+        goal = goals[index]
+        step_days = goal_days(character, goal, [goals[other] for other in order[:position]])
+        steps.append(PlanStep(goal, step_days, days))
+        days += step_days
+    return TrainingPlan(tuple(steps), days)
+
+def _validate_goal(goal: TrainingGoal) -> None:
+    """Raise a ValueError if the target of a goal does not match its type."""
+    valid = {
+        GoalType.LANGUAGE: goal.target is None,
+        GoalType.SKILL: isinstance(goal.target, Skill),
+        GoalType.TOOL: isinstance(goal.target, Tool),
+        GoalType.WEAPON: goal.target in (Ability.STRENGTH, Ability.DEXTERITY),
+        GoalType.ARMOR: goal.target in (Ability.STRENGTH, Ability.DEXTERITY),
+    }.get(goal.goal_type, False)
+    if not valid:
+        raise ValueError(f'Invalid target for a {goal.goal_type.name.lower()} goal.')
+    if goal.expertise and goal.goal_type not in (GoalType.SKILL, GoalType.TOOL):
+        raise ValueError('Only skills and tools have expertise.')
+
+def _trained_proficiencies(character: Character, trained: Sequence[TrainingGoal]
+                           ) -> Tuple[FrozenSet[Union[Skill, Tool]], FrozenSet[Union[Skill, Tool]]]:
+    """Return the proficiencies and expertise of a character after training goals."""
+    proficiencies = set(character.proficiencies) | set(character.expertise)
+    expertise = set(character.expertise)
+    for goal in trained:
+        if goal.goal_type in (GoalType.SKILL, GoalType.TOOL):
+            proficiencies.add(goal.target)
+            if goal.expertise:
+                expertise.add(goal.target)
+    return frozenset(proficiencies), frozenset(expertise)
+
+def _goal_days(character: Character, goal: TrainingGoal,
+               proficiencies: FrozenSet[Union[Skill, Tool]],
+               expertise: FrozenSet[Union[Skill, Tool]]) -> int:
+    """Return the days to train a goal with a set of proficiencies and expertise."""
+    abilities = character.abilities
+    if goal.goal_type == GoalType.LANGUAGE:
+        return language_training_days(abilities[Ability.INTELLIGENCE], abilities[Ability.WISDOM],
+                                      abilities[Ability.CHARISMA])
+    if goal.goal_type == GoalType.SKILL:
+        return skill_training_days(abilities[goal.target.ability()])[goal.expertise]
+    if goal.goal_type == GoalType.TOOL:
+        # Expertise in a related skill doubles its proficiency bonus.
+        check_bonuses = [tool_check_bonus(abilities[skill.ability()], character.proficiency_bonus,
+                                          skill in proficiencies,
+                                          character.proficiency_bonus if skill in expertise else 0)
+                         for skill in goal.target.skills()]
+        return tool_training_days(check_bonuses)[goal.expertise]
+    return proficiency_training_days(abilities[goal.target])
+
+def _dependencies(goals: List[TrainingGoal]) -> Tuple[List[int], List[int]]:
+    """Return bitmasks of the goals each goal's days depend on, and of the goals it needs."""
+    dependencies = [0] * len(goals)
+    prerequisites = [0] * len(goals)
+    for index, goal in enumerate(goals):
+        for other_index, other in enumerate(goals):
+            if other_index == index:
+                continue
+            if other.target == goal.target and not other.expertise and goal.expertise:
+                prerequisites[index] |= 1 << other_index
+                dependencies[index] |= 1 << other_index
+            elif (goal.goal_type == GoalType.TOOL and other.goal_type == GoalType.SKILL
+                  and other.target in goal.target.skills()):
+                dependencies[index] |= 1 << other_index
+    return dependencies, prerequisites
+
+def _groups(dependencies: List[int]) -> List[List[int]]:
+    """Return the indexes of each group of goals connected by dependencies, in goal order."""
+    # Goals are connected whichever of the two depends on the other.
+    neighbours = list(dependencies)
+    for index, mask in enumerate(dependencies):
+        for other in range(len(dependencies)):
+            if mask & (1 << other):
+                neighbours[other] |= 1 << index
+    groups = []
+    grouped = 0
+    for index in range(len(dependencies)):
+        if grouped & (1 << index):
+            continue
+        group = 1 << index
+        added = group
+        while added:
+            reached = 0
+            for other in range(len(dependencies)):
+                if added & (1 << other):
+                    reached |= neighbours[other]
+            added = reached & ~group
+            group |= added
+        grouped |= group
+        groups.append([other for other in range(len(dependencies)) if group & (1 << other)])
+    return groups
+
+def _submask(mask: int, indexes: List[int]) -> int:
+    """Return a bitmask of goal indexes renumbered by their position in a list of indexes."""
+    return sum(1 << position for position, index in enumerate(indexes) if mask & (1 << index))
+
+def _dependency_order(dependencies: List[int]) -> List[int]:
+    """Return an order of goals that trains every goal after the goals its days depend on.
+
+    Goals are taken in their own order whenever their dependencies allow it. Dependencies run
+    from expertise to proficiency and from tools to skills, so they never form a cycle.
+    """
+    order = []
+    trained = 0
+    while len(order) < len(dependencies):
+        index = next(index for index, mask in enumerate(dependencies)
+                     if not trained & (1 << index) and not mask & ~trained)
+        order.append(index)
+        trained |= 1 << index
+    return order
+
+def _best_order(character: Character, goals: List[TrainingGoal], dependencies: List[int],
+                prerequisites: List[int]) -> List[int]:
+    """Return the order of goals with the fewest total days, as indexes of the goals."""
+    count = len(goals)
+    # best[mask] is the fewest days to train the goals in mask, reached by training last[mask].
+    best = [inf] * (1 << count)
+    last = [-1] * (1 << count)
+    best[0] = 0
+    # The days of a goal only depend on which of its dependencies are trained.
+    costs: Dict[Tuple[int, int], int] = {}
+    for mask in range(1 << count):
+        if best[mask] == inf:
+            continue
+        for index in range(count):
+            bit = 1 << index
+            if mask & bit or prerequisites[index] & ~mask:
+                continue
+            key = (index, mask & dependencies[index])
+            if key not in costs:
+                trained = [goals[other] for other in range(count) if key[1] & (1 << other)]
+                proficiencies, expertise = _trained_proficiencies(character, trained)
+                costs[key] = _goal_days(character, goals[index], proficiencies, expertise)
+            if best[mask] + costs[key] < best[mask | bit]:
+                best[mask | bit] = best[mask] + costs[key]
+                last[mask | bit] = index
+    order = []
+    mask = (1 << count) - 1
+    while mask:
+        order.append(last[mask])
+        mask &= ~(1 << last[mask])
+    return order[::-1]